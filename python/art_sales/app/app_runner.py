@@ -3,6 +3,12 @@ from flask import Flask
 from flask_cors import CORS
 from app.shared.config.db_config import DevConfig
 from app.shared.exceptions.global_error_handler import register_error_handlers
+from app.shared.utilities.compression import init_compression
+from app.shared.utilities.json_provider import FastJSONProvider
+from app.shared.utilities.jwt_utils import init_jwt_cache
+from app.shared.utilities.redis_client import init_redis
+from app.shared.jobs.outbox import init_outbox
+from app.shared.jobs.webhook_events import init_webhook_processor
 from app.extensions import mongo
 from app.auth.controllers.auth_controller import auth_bp, init_services
 from app.user.routes.artist_controller import artist_bp
@@ -13,6 +19,9 @@ from app.user.routes.buyer_controller import buyer_bp
 from app.user.routes.checkout_controller import checkout_bp
 from app.user.routes.cart_controller import cart_bp
 from app.wallet.controllers.wallet_controller import wallet_bp, init_wallet_service
+from app.user.routes.image_controller import image_bp
+from app.user.services.image_cache_service import init_image_cache
+from app.user.services.image_derivative_service import init_image_derivatives
 
 
 def create_app(config_class=DevConfig):
@@ -24,6 +33,7 @@ context.
 """
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = FastJSONProvider(app)
 
     # Configure CORS with specific settings to handle preflight requests properly
     CORS(app, resources={
@@ -37,6 +47,7 @@ context.
     
     # Extensions
     mongo.init_app(app)
+    init_redis(app.config)
     # Decide which mailer to use. We import mailer classes *inside* the app context
     # to avoid circular imports/app context issues.
     use_mock = app.config.get("USE_MOCK_MAILER", False)
@@ -54,7 +65,9 @@ context.
             "smtp_port": app.config.get("SMTP_PORT"),
             "username": app.config.get("SMTP_USERNAME"),
             "password": app.config.get("SMTP_PASSWORD"),
-            "from_addr": app.config.get("SMTP_FROM") or app.config.get("MAIL_DEFAULT_SENDER")
+            "from_addr": app.config.get("SMTP_FROM") or app.config.get("MAIL_DEFAULT_SENDER"),
+            "pool_size": app.config.get("SMTP_POOL_SIZE"),
+            "idle_timeout": app.config.get("SMTP_IDLE_TIMEOUT"),
         }
     # Remove None values so SMTPMailer will fall back to env vars if necessary
         smtp_kwargs = {k: v for k, v in smtp_kwargs.items() if v is not None}
@@ -62,13 +75,25 @@ context.
             mailer = SMTPMailer(**smtp_kwargs)
             init_services(mailer, async_email=app.config.get("ASYNC_EMAIL", False))
 
+    init_jwt_cache(app.config)
+
+    # Signed image URL cache (L1 size + optional shared Redis tier)
+    init_image_cache(app.config)
+    init_image_derivatives(app.config)
+
     # Initialize wallet service
     with app.app_context():
         init_wallet_service()
         
     # Initialize Paystack webhook service
     with app.app_context():
-        init_paystack_services(app.config.get("EMAIL_SERVICE"))
+        init_paystack_services(app.config.get("EMAIL_SERVICE"),
+                               async_email=not use_mock and app.config.get("ASYNC_EMAIL", False))
+
+    # Background delivery of outbox side effects (emails after payment)
+    init_outbox(app)
+    # Stored Paystack webhook events, processed off the request thread
+    init_webhook_processor(app)
 
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -78,10 +103,13 @@ context.
     app.register_blueprint(cart_bp, url_prefix='/api/cart')
     app.register_blueprint(wallet_bp, url_prefix='/api/wallet')
     app.register_blueprint(paystack_webhook_bp, url_prefix='/api/paystack')
+    if app.config.get("IMAGE_PROXY_ENABLED"):
+        app.register_blueprint(image_bp, url_prefix='/api/images')
 
 
     # Error handlers
     register_error_handlers(app)
+    init_compression(app)
     return app
 
 
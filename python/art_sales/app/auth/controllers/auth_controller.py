@@ -6,6 +6,7 @@ from app.auth.domain.user_signup_response import UserSignupResponse
 from app.auth.domain.user_login_response import UserLoginResponse
 from app.auth.persistence.user_repository import UserRepository
 from app.auth.persistence.verification_repository import VerificationRepository
+from app.auth.persistence.verification_store import create_verification_store
 from app.shared.utilities.password_hasher import PasswordHasher
 from app.auth.services.verification_service import VerificationService
 from app.auth.services.auth_services import AuthService
@@ -28,6 +29,7 @@ def init_services(email_service_instance, async_email: bool = False) -> None:
     global email_service, auth_service
     email_service = email_service_instance
     current_app.config["EMAIL_SERVICE"] = email_service
+    verification_service.verification_repo = create_verification_store(current_app.config)
     auth_service = AuthService(
         repo=user_repository,
         password_hasher=password_hasher,
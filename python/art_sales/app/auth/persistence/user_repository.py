@@ -32,6 +32,23 @@ class UserRepository:
             return None
         return UserRepository._get_user_collection().find_one({"_id": obj_id})
 
+    @staticmethod
+    def find_emails_by_ids(user_ids: list, session=None) -> dict:
+        """
+        {user_id: email} for many users in one $in query. Ids may be ObjectId
+        strings or legacy string ids.
+        """
+        ids = []
+        for user_id in set(user_ids):
+            ids.append(user_id)
+            if ObjectId.is_valid(user_id):
+                ids.append(ObjectId(user_id))
+        if not ids:
+            return {}
+        cursor = UserRepository._get_user_collection().find(
+            {"_id": {"$in": ids}}, {"email": 1}, session=session)
+        return {str(doc["_id"]): doc.get("email") for doc in cursor if doc.get("email")}
+
     @staticmethod
     def insert_user(user: User) -> str:
         """
@@ -1,5 +1,5 @@
 # app/persistence/verification_repository.py
-from pymongo import ASCENDING
+from pymongo import ASCENDING, ReturnDocument
 from flask import current_app
 from app.extensions import mongo
 from app.auth.domain.verification_model import Verification
@@ -29,6 +29,16 @@ class VerificationRepository:
             {"email": verification.email}, verification.to_dict(), upsert=True
         )
 
+    @staticmethod
+    def create_if_absent(verification: Verification) -> dict:
+        """Insert the record unless one already exists; return whichever is stored."""
+        return VerificationRepository._get_collection().find_one_and_update(
+            {"email": verification.email},
+            {"$setOnInsert": verification.to_dict()},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+
     @staticmethod
     def delete_by_email(email: str):
         """Delete verification record for a given email."""
@@ -0,0 +1,125 @@
+# app/auth/persistence/verification_store.py
+import json
+import time
+from datetime import datetime, UTC
+from threading import Lock
+from typing import Dict, Optional, Protocol, Tuple
+from app.auth.domain.verification_model import Verification
+
+# Signup codes live this long (the Mongo TTL index uses the same window)
+DEFAULT_TTL_SECONDS = 300
+
+
+class VerificationStore(Protocol):
+    """Where pending signup codes live until the user is created."""
+
+    def find_by_email(self, email: str) -> Optional[dict]: ...
+
+    def save(self, verification: Verification) -> None: ...
+
+    def create_if_absent(self, verification: Verification) -> dict: ...
+
+    def delete_by_email(self, email: str) -> None: ...
+
+
+class InMemoryVerificationStore:
+    """Process-local store for tests and single-process dev. Entries expire on read."""
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[dict, float]] = {}
+        self._lock = Lock()
+
+    def _live(self, email: str) -> Optional[dict]:
+        entry = self._entries.get(email)
+        if entry and time.time() >= entry[1]:
+            del self._entries[email]
+            return None
+        return entry[0] if entry else None
+
+    def find_by_email(self, email: str) -> Optional[dict]:
+        with self._lock:
+            row = self._live(email)
+            return dict(row) if row else None
+
+    def save(self, verification: Verification) -> None:
+        with self._lock:
+            self._entries[verification.email] = (verification.to_dict(), time.time() + self.ttl_seconds)
+
+    def create_if_absent(self, verification: Verification) -> dict:
+        with self._lock:
+            row = self._live(verification.email)
+            if row is None:
+                row = verification.to_dict()
+                self._entries[verification.email] = (row, time.time() + self.ttl_seconds)
+            return dict(row)
+
+    def delete_by_email(self, email: str) -> None:
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisVerificationStore:
+    """
+    Redis-backed store. Each code is one key with a native TTL, so it is gone the
+    moment it expires (no sweeper), and create-if-absent is a single SET NX EX.
+    """
+
+    KEY_PREFIX = "verification:"
+
+    def __init__(self, redis_client, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 key_prefix: str = KEY_PREFIX):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    @staticmethod
+    def _encode(verification: Verification) -> str:
+        return json.dumps({"email": verification.email, "code": verification.code,
+                           "created_at": verification.created_at.timestamp()})
+
+    @staticmethod
+    def _decode(raw) -> Optional[dict]:
+        if not raw:
+            return None
+        row = json.loads(raw)
+        row["created_at"] = datetime.fromtimestamp(row["created_at"], UTC)
+        return row
+
+    def find_by_email(self, email: str) -> Optional[dict]:
+        return self._decode(self.redis.get(self.key_prefix + email))
+
+    def save(self, verification: Verification) -> None:
+        self.redis.set(self.key_prefix + verification.email, self._encode(verification),
+                       ex=self.ttl_seconds)
+
+    def create_if_absent(self, verification: Verification) -> dict:
+        key = self.key_prefix + verification.email
+        value = self._encode(verification)
+        while True:
+            if self.redis.set(key, value, nx=True, ex=self.ttl_seconds):
+                return self._decode(value)
+            existing = self._decode(self.redis.get(key))
+            if existing is not None:
+                return existing
+            # Expired between SET NX and GET; try again
+
+    def delete_by_email(self, email: str) -> None:
+        self.redis.delete(self.key_prefix + email)
+
+
+def create_verification_store(config):
+    """Build the store named by VERIFICATION_STORE: "mongo" (default), "redis" or "memory"."""
+    kind = str(config.get("VERIFICATION_STORE", "mongo")).lower()
+    ttl = int(config.get("VERIFICATION_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    if kind == "redis":
+        from app.shared.utilities.redis_client import get_redis
+        return RedisVerificationStore(get_redis(), ttl_seconds=ttl)
+    if kind == "memory":
+        return InMemoryVerificationStore(ttl_seconds=ttl)
+    from app.auth.persistence.verification_repository import VerificationRepository
+    return VerificationRepository()
@@ -83,10 +83,22 @@ class AuthService:
 
         if not self.password_hasher.verify_password(req.password, user.get("password")):
             return UserLoginResponse(success=False, message="Invalid password")
+        self._rehash_if_needed(user, req.password)
         token = self._generate_token(user)
         return UserLoginResponse(success=True, message="Login successful",
                                  access_token=token, user_id=str(user.get("_id")), role=user.get("role"))
 
+    def _rehash_if_needed(self, user: dict, plain_password: str) -> None:
+        """Upgrade the stored hash to the configured bcrypt cost while we hold the plain password."""
+        if not self.password_hasher.needs_rehash(user.get("password")):
+            return
+        try:
+            new_hash = self.password_hasher.hash_password(plain_password)
+            self.repo.update_user(str(user.get("_id")), {"password": new_hash})
+        except Exception as e:
+            # The login itself succeeded; try again next time
+            print(f"Warning: Could not rehash password for {user.get('email')}: {e}")
+
     def _generate_token(self, user: dict) -> str:
         secret = current_app.config.get("SECRET_KEY", "dev-secret")
         expires = int(current_app.config.get("JWT_EXP_HOURS", 1))
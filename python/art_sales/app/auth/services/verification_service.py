@@ -5,13 +5,13 @@ import string
 from typing import Optional
 from app.auth.domain.user_signup_request import UserSignupRequest
 from app.auth.domain.verification_model import Verification
-from app.auth.persistence.verification_repository import VerificationRepository
+from app.auth.persistence.verification_store import VerificationStore
 from app.shared.utilities.password_hasher import PasswordHasher
 from app.shared.exceptions.custom_errors import ValidationError
 
 
 class VerificationService:
-    def __init__(self, verification_repo: VerificationRepository,
+    def __init__(self, verification_repo: VerificationStore,
                  password_hasher: PasswordHasher) -> None:
         self.verification_repo = verification_repo
         self.password_hasher = password_hasher
@@ -23,15 +23,9 @@ class VerificationService:
         if not signup_request.email:
             raise ValidationError("Email is required for verification")
             
-        existing = self.verification_repo.find_by_email(signup_request.email)
-        if existing:
-            # return same code if not expired
-            return Verification.from_dict(existing)
-
-        code = self._generate_code()
-        verification = Verification(email=signup_request.email, code=code)
-        self.verification_repo.save(verification)
-        return verification
+        # Atomic: concurrent signups for one email all get the same (unexpired) code
+        candidate = Verification(email=signup_request.email, code=self._generate_code())
+        return Verification.from_dict(self.verification_repo.create_if_absent(candidate))
 
     def validate_code(self, email: str, code: str) -> bool:
         row = self.verification_repo.find_by_email(email)
@@ -6,6 +6,8 @@ class BaseConfig:
     # Core Flask / JWT
     SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
     JWT_EXP_HOURS = int(os.getenv("JWT_EXP_HOURS", 3))
+    # Verified-token LRU used by token_required (0 disables)
+    JWT_CLAIMS_CACHE_SIZE = int(os.getenv("JWT_CLAIMS_CACHE_SIZE", 4096))
 
     # MongoDB
     MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
@@ -13,6 +15,36 @@ class BaseConfig:
 
     # Redis / RQ
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+
+    # Pending signup codes: "mongo" (TTL collection), "redis" (key TTL) or "memory"
+    VERIFICATION_STORE = os.getenv("VERIFICATION_STORE", "mongo")
+    VERIFICATION_TTL_SECONDS = int(os.getenv("VERIFICATION_TTL_SECONDS", 300))
+
+    # Signed image URL cache: bounded in-process L1, optional shared L2 ("redis" or "none")
+    IMAGE_CACHE_L1_SIZE = int(os.getenv("IMAGE_CACHE_L1_SIZE", 10000))
+    IMAGE_CACHE_L2 = os.getenv("IMAGE_CACHE_L2", "none")
+    IMAGE_CACHE_REDIS_URL = os.getenv("IMAGE_CACHE_REDIS_URL")
+
+    # Thumbnail/web-size derivatives generated in the background after upload
+    IMAGE_DERIVATIVES_ENABLED = os.getenv("IMAGE_DERIVATIVES_ENABLED", "False") == "True"
+    IMAGE_DERIVATIVE_WORKERS = int(os.getenv("IMAGE_DERIVATIVE_WORKERS", 2))
+    IMAGE_DERIVATIVE_FORMAT = os.getenv("IMAGE_DERIVATIVE_FORMAT", "webp")
+
+    # Re-key uploads by content hash on create_artwork and reuse identical images
+    CONTENT_ADDRESSED_UPLOADS = os.getenv("CONTENT_ADDRESSED_UPLOADS", "False") == "True"
+
+    # Serve images through GET /api/images/<key> instead of signed S3 URLs only
+    IMAGE_PROXY_ENABLED = os.getenv("IMAGE_PROXY_ENABLED", "False") == "True"
+    IMAGE_PROXY_CHUNK_SIZE = int(os.getenv("IMAGE_PROXY_CHUNK_SIZE", 64 * 1024))
+
+    # JSON datetimes: "http" (RFC 822, Flask's default format) or "iso" (ISO 8601, fastest)
+    JSON_DATETIME_FORMAT = os.getenv("JSON_DATETIME_FORMAT", "http")
+
+    # Response compression negotiated via Accept-Encoding (br/zstd only if installed)
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "True") == "True"
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_ALGORITHMS = os.getenv("COMPRESS_ALGORITHMS", "br,zstd,gzip")
 
     # Mail settings (SMTP or mock)
     SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
@@ -20,10 +52,32 @@ class BaseConfig:
     SMTP_USERNAME = os.getenv("SMTP_USERNAME")
     SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
     SMTP_FROM = os.getenv("SMTP_FROM", "Art Sales <noreply@artsales.com>")
+    # Authenticated sessions kept open per process, closed after this many idle seconds
+    SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 2))
+    SMTP_IDLE_TIMEOUT = int(os.getenv("SMTP_IDLE_TIMEOUT", 60))
 
     # Mailer & async job flags
     USE_MOCK_MAILER = os.getenv("USE_MOCK_MAILER", "False") == "True"
     ASYNC_EMAIL = os.getenv("ASYNC_EMAIL", "False") == "True"
+    # Transactional outbox: a background thread per process leases and delivers rows
+    OUTBOX_DISPATCHER_ENABLED = os.getenv("OUTBOX_DISPATCHER_ENABLED", "True") == "True"
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 50))
+    OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", 60))
+    OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 1.0))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 8))
+    # 0 = one sale email per artist per payment; e.g. 900 = one digest per artist every 15 minutes
+    ARTIST_DIGEST_WINDOW_SECONDS = int(os.getenv("ARTIST_DIGEST_WINDOW_SECONDS", 0))
+    # Paystack webhooks: HMAC-SHA512 signed with the secret key, stored, then handled by one
+    # worker thread per shard (events for one reference always land on the same shard)
+    PAYSTACK_SECRET_KEY = os.getenv("PAYSTACK_SECRET_KEY", "")
+    PAYSTACK_WEBHOOK_REQUIRE_SIGNATURE = os.getenv("PAYSTACK_WEBHOOK_REQUIRE_SIGNATURE", "True") == "True"
+    WEBHOOK_WORKERS_ENABLED = os.getenv("WEBHOOK_WORKERS_ENABLED", "True") == "True"
+    WEBHOOK_SHARDS = int(os.getenv("WEBHOOK_SHARDS", 4))
+    WEBHOOK_LEASE_SECONDS = int(os.getenv("WEBHOOK_LEASE_SECONDS", 60))
+    WEBHOOK_POLL_INTERVAL = float(os.getenv("WEBHOOK_POLL_INTERVAL", 1.0))
+    WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", 8))
+    # Shared secret for ops endpoints (X-Ops-Token header); unset = those endpoints are closed
+    OPS_METRICS_TOKEN = os.getenv("OPS_METRICS_TOKEN", "")
 
     # Misc
     TESTING = False
@@ -36,6 +90,8 @@ class DevConfig(BaseConfig):
     TESTING = False
     USE_MOCK_MAILER = os.getenv("USE_MOCK_MAILER", "True") == "True"
     ASYNC_EMAIL = os.getenv("ASYNC_EMAIL", "False") == "True"
+    # Unsigned webhooks are accepted locally when no secret key is set
+    PAYSTACK_WEBHOOK_REQUIRE_SIGNATURE = os.getenv("PAYSTACK_WEBHOOK_REQUIRE_SIGNATURE", "False") == "True"
 
 
 class ProdConfig(BaseConfig):
@@ -44,6 +100,8 @@ class ProdConfig(BaseConfig):
     TESTING = False
     USE_MOCK_MAILER = False
     ASYNC_EMAIL = True
+    IMAGE_CACHE_L2 = os.getenv("IMAGE_CACHE_L2", "redis")
+    VERIFICATION_STORE = os.getenv("VERIFICATION_STORE", "redis")
 
 
 class TestConfig(BaseConfig):
@@ -53,3 +111,14 @@ class TestConfig(BaseConfig):
     DB_NAME = os.getenv("DB_NAME", "art_sales_test")
     USE_MOCK_MAILER = True
     ASYNC_EMAIL = False
+    IMAGE_CACHE_L2 = "none"
+    VERIFICATION_STORE = "memory"
+    # Tests drain the outbox explicitly with outbox_dispatcher.drain()
+    OUTBOX_DISPATCHER_ENABLED = False
+    # Tests sign webhooks with this key and run webhook_processor.process_pending() themselves
+    PAYSTACK_SECRET_KEY = "sk_test_webhook_secret"
+    WEBHOOK_WORKERS_ENABLED = False
+    OPS_METRICS_TOKEN = "ops_test_token"
+    IMAGE_DERIVATIVES_ENABLED = False
+    CONTENT_ADDRESSED_UPLOADS = False
+    IMAGE_PROXY_ENABLED = True
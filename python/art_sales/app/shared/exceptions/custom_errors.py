@@ -83,6 +83,11 @@ class MailerSendError(AppError):
     pass
 
 
+class TooManyRequestsError(AppError):
+    """Server is at capacity for this operation; the client should retry later."""
+    pass
+
+
 class CartNotFoundError(NotFoundError):
     pass
 
@@ -7,6 +7,7 @@ from app.shared.exceptions.custom_errors import (
     ResourceExistsError,
     InvalidVerificationCodeError,
     MailerSendError, NotFoundError, UserAlreadyExistsError,
+    TooManyRequestsError,
 )
 
 
@@ -36,6 +37,12 @@ def register_error_handlers(app):
     def handle_mailer_error(e):
         return jsonify({"success": False, "message": str(e)}), 500
 
+    @app.errorhandler(TooManyRequestsError)
+    def handle_too_many_requests(e):
+        response = jsonify({"success": False, "message": str(e)})
+        response.headers["Retry-After"] = "1"
+        return response, 429
+
     @app.errorhandler(Exception)
     def handle_generic_exception(e):
         print("Unhandled Exception:", e)
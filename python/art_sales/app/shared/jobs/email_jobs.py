@@ -1,23 +1,182 @@
 # app/jobs/email_jobs.py
-from redis import Redis
-from rq import Queue
 import os
-from typing import Optional
+import time
+from datetime import datetime, UTC
+from redis import Redis
+from rq import Queue, Retry
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 from app.shared.utilities.email_service import SMTPMailer
+from app.shared.utilities.redis_client import get_pool, get_redis
+
+EMAIL_QUEUE = "emails"
+# Jobs that used up their retries land here; nothing consumes it, so they wait for
+# an operator (see requeue_dead_letters)
+DEAD_LETTER_QUEUE = "emails_dead"
+METRICS_KEY = "email_jobs:metrics"
+
+# Exponential backoff: EMAIL_RETRY_BASE_SECONDS * 2**attempt, EMAIL_RETRY_MAX times
+EMAIL_RETRY_MAX = int(os.getenv("EMAIL_RETRY_MAX", 5))
+EMAIL_RETRY_BASE_SECONDS = int(os.getenv("EMAIL_RETRY_BASE_SECONDS", 10))
+
+_JOB_PREFIX = __name__ + "."
+VERIFICATION_JOB = _JOB_PREFIX + "send_verification_email"
+ORDER_CONFIRMATION_JOB = _JOB_PREFIX + "send_order_confirmation_email"
+ARTIST_SALE_JOB = _JOB_PREFIX + "send_artist_sale_email"
+
+# Queues are cheap to keep and all share the process-wide Redis pool
+_queues: Dict[str, Queue] = {}
+# One mailer per worker process so its SMTP sessions are reused across jobs
+_mailer: Optional[SMTPMailer] = None
 
 
 def get_redis_connection() -> Redis:
-    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-    return Redis.from_url(redis_url)
+    return get_redis()
+
+
+def get_queue(name: str = EMAIL_QUEUE) -> Queue:
+    queue = _queues.get(name)
+    # Rebuild if init_redis() has since replaced the pool
+    if queue is None or queue.connection.connection_pool is not get_pool():
+        queue = _queues[name] = Queue(name, connection=get_redis_connection())
+    return queue
+
+
+def retry_policy() -> Optional[Retry]:
+    if EMAIL_RETRY_MAX <= 0:
+        return None
+    return Retry(max=EMAIL_RETRY_MAX,
+                 interval=[EMAIL_RETRY_BASE_SECONDS * 2 ** i for i in range(EMAIL_RETRY_MAX)])
+
+
+def job_options() -> Dict[str, Any]:
+    return {"retry": retry_policy(), "on_success": record_success, "on_failure": record_failure}
 
 
 def enqueue_email_job(email: str, verification_link: str) -> None:
-    q = Queue("emails", connection=get_redis_connection())
-    q.enqueue("app.jobs.email_jobs.send_verification_email", email,
-              verification_link)
+    get_queue().enqueue(VERIFICATION_JOB, email, verification_link, **job_options())
 
 
-def send_verification_email(email: str, verification_link: str) -> None:
+def enqueue_order_confirmation(buyer_email: str, reference: str) -> None:
+    get_queue().enqueue(ORDER_CONFIRMATION_JOB, buyer_email, reference, **job_options())
+
+
+def enqueue_artist_sale(artist_email: str, reference: str) -> None:
+    get_queue().enqueue(ARTIST_SALE_JOB, artist_email, reference, **job_options())
+
+
+def enqueue_many(jobs: Iterable[Tuple[str, Sequence[Any], Optional[Dict[str, Any]]]],
+                 queue_name: str = EMAIL_QUEUE) -> List:
+    """
+    Enqueue many (func, args, kwargs) jobs in one pipelined round trip,
+    for notification fan-out. Returns the created RQ jobs.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    options = job_options()
+    data = [Queue.prepare_data(func, args=tuple(args), kwargs=kwargs or {}, **options)
+            for func, args, kwargs in jobs]
+    return get_queue(queue_name).enqueue_many(data)
+
+
+# ─── Message templates (shared by the worker and in-process sending) ────────────
+def order_confirmation_message(reference: str, items: Optional[List[dict]] = None) -> Tuple[str, str]:
+    return "Order Confirmed", f"Your payment has been confirmed. Reference: {reference}"
+
+
+def artist_sale_message(reference: str, items: Optional[List[dict]] = None) -> Tuple[str, str]:
+    """One digest for all of an artist's items in a payment (or digest window)."""
+    if not items:
+        return "New sale", f"A new order has been placed. Reference: {reference}"
+    count = sum(int(item.get("quantity") or 1) for item in items)
+    lines = [f"- {item.get('title') or item.get('artwork_id')} x{item.get('quantity') or 1}"
+             f" @ {item.get('price', 0)}" for item in items]
+    subject = "New sale" if count == 1 else f"New sales: {count} items"
+    return subject, f"New orders have been placed. Reference: {reference}\n\n" + "\n".join(lines)
+
+
+# ─── Job bodies (run in the worker) ──────────────────────────────────────────────
+def _get_mailer() -> SMTPMailer:
     # Worker process instantiates SMTPMailer using environment variables (no Flask app needed)
-    smtp = SMTPMailer()
-    smtp.send_verification_email(email, verification_link)
+    global _mailer
+    if _mailer is None:
+        _mailer = SMTPMailer()
+    return _mailer
+
+
+def send_verification_email(email: str, verification_link: str) -> None:
+    _get_mailer().send_verification_email(email, verification_link)
+
+
+def send_order_confirmation_email(buyer_email: str, reference: str) -> None:
+    _get_mailer().send_email(buyer_email, *order_confirmation_message(reference))
+
+
+def send_artist_sale_email(artist_email: str, reference: str, items: Optional[List[dict]] = None) -> None:
+    _get_mailer().send_email(artist_email, *artist_sale_message(reference, items))
+
+
+# ─── Callbacks: metrics and dead-lettering ───────────────────────────────────────
+def _job_name(job) -> str:
+    return job.func_name.rsplit(".", 1)[-1]
+
+
+def _duration_ms(job) -> int:
+    if not job.started_at:
+        return 0
+    started = job.started_at if job.started_at.tzinfo else job.started_at.replace(tzinfo=UTC)
+    return max(int((datetime.now(UTC) - started).total_seconds() * 1000), 0)
+
+
+def record_success(job, connection, result, *args, **kwargs) -> None:
+    name = _job_name(job)
+    pipe = connection.pipeline(transaction=False)
+    pipe.hincrby(METRICS_KEY, f"{name}:succeeded", 1)
+    pipe.hincrby(METRICS_KEY, f"{name}:duration_ms", _duration_ms(job))
+    pipe.execute()
+
+
+def record_failure(job, connection, exc_type, exc_value, tb) -> None:
+    """
+    Runs after every failed attempt, before RQ decides whether to retry.
+    Once retries are exhausted the job is copied to the dead-letter queue.
+    """
+    name = _job_name(job)
+    pipe = connection.pipeline(transaction=False)
+    pipe.hincrby(METRICS_KEY, f"{name}:failed", 1)
+    pipe.hincrby(METRICS_KEY, f"{name}:duration_ms", _duration_ms(job))
+    if job.should_retry:
+        pipe.hincrby(METRICS_KEY, f"{name}:retried", 1)
+        pipe.execute()
+        return
+    pipe.hincrby(METRICS_KEY, f"{name}:dead_lettered", 1)
+    pipe.execute()
+    Queue(DEAD_LETTER_QUEUE, connection=connection).enqueue(
+        job.func_name, *job.args, **job.kwargs,
+        meta={"original_job_id": job.id, "error": f"{exc_type.__name__}: {exc_value}",
+              "failed_at": time.time()})
+
+
+def get_metrics(connection: Optional[Redis] = None) -> Dict[str, Dict[str, int]]:
+    """{"send_verification_email": {"succeeded": 3, "failed": 1, ...}, ...}"""
+    raw = (connection or get_redis_connection()).hgetall(METRICS_KEY)
+    metrics: Dict[str, Dict[str, int]] = {}
+    for field, value in raw.items():
+        field = field.decode() if isinstance(field, bytes) else field
+        name, _, counter = field.rpartition(":")
+        metrics.setdefault(name, {})[counter] = int(value)
+    return metrics
+
+
+def requeue_dead_letters(limit: Optional[int] = None) -> int:
+    """Move dead-lettered jobs back onto the emails queue (fresh retry budget)."""
+    dead = get_queue(DEAD_LETTER_QUEUE)
+    moved = 0
+    for job in dead.get_jobs():
+        if limit is not None and moved >= limit:
+            break
+        get_queue().enqueue(job.func_name, *job.args, **job.kwargs, **job_options())
+        dead.remove(job)
+        job.delete()
+        moved += 1
+    return moved
@@ -0,0 +1,48 @@
+# app/shared/jobs/email_worker.py
+"""
+Email worker: consumes the `emails` queue.
+
+    python -m app.shared.jobs.email_worker [--processes N] [--burst]
+
+With --processes > 1 an RQ WorkerPool forks N workers; each keeps its own
+pooled SMTP sessions. Every worker also runs the RQ scheduler so backoff
+retries are re-enqueued on time.
+"""
+import argparse
+import os
+
+from rq import Worker
+from rq.worker_pool import WorkerPool
+
+from app.shared.jobs.email_jobs import EMAIL_QUEUE, get_redis_connection
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the email job worker.")
+    parser.add_argument("--processes", type=int, default=int(os.getenv("EMAIL_WORKER_PROCESSES", 1)),
+                        help="worker processes (default: EMAIL_WORKER_PROCESSES or 1)")
+    parser.add_argument("--burst", action="store_true",
+                        help="exit once the queue is empty")
+    parser.add_argument("--queue", default=EMAIL_QUEUE)
+    parser.add_argument("--logging-level", default=os.getenv("EMAIL_WORKER_LOG_LEVEL", "INFO"))
+    return parser
+
+
+def run(processes: int = 1, burst: bool = False, queue: str = EMAIL_QUEUE,
+        logging_level: str = "INFO") -> None:
+    connection = get_redis_connection()
+    if processes > 1:
+        WorkerPool([queue], connection=connection, num_workers=processes).start(
+            burst=burst, logging_level=logging_level)
+    else:
+        Worker([queue], connection=connection).work(
+            burst=burst, with_scheduler=True, logging_level=logging_level)
+
+
+def main(argv=None) -> None:
+    args = build_parser().parse_args(argv)
+    run(args.processes, args.burst, args.queue, args.logging_level)
+
+
+if __name__ == "__main__":
+    main()
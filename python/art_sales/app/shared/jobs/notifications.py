@@ -0,0 +1,52 @@
+# app/shared/jobs/notifications.py
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.shared.jobs import email_jobs
+
+# Outbox topic for emails; payload: {"template", "to", "reference" or "references", "items"?}
+EMAIL_TOPIC = "email"
+
+# template -> (RQ job path, message builder(reference, items))
+TEMPLATES: Dict[str, Tuple[str, Callable[..., Tuple[str, str]]]] = {
+    "order_confirmation": (email_jobs.ORDER_CONFIRMATION_JOB, email_jobs.order_confirmation_message),
+    "artist_sale": (email_jobs.ARTIST_SALE_JOB, email_jobs.artist_sale_message),
+}
+
+
+def email_payload(template: str, to: str, reference: str, items: Optional[List[dict]] = None) -> dict:
+    """Outbox payload for one email (see NotificationDispatcher.deliver)."""
+    payload = {"template": template, "to": to, "reference": reference}
+    if items:
+        payload["items"] = items
+    return payload
+
+
+class NotificationDispatcher:
+    """
+    Delivers one notification email. Called by the outbox dispatcher, never
+    on a request thread.
+
+    With `use_queue` (ASYNC_EMAIL) the email becomes an RQ job and the email
+    worker sends it with its own retries. Otherwise it is sent right away
+    through the app's email service. Either way a failure raises, so the
+    outbox row is retried.
+    """
+
+    def __init__(self, email_service: Any = None, use_queue: bool = False):
+        self.email_service = email_service
+        self.use_queue = use_queue
+
+    def deliver(self, template: str, to: str, reference: str, items: Optional[List[dict]] = None) -> None:
+        job, message = TEMPLATES[template]
+        if self.use_queue:
+            extra = {"items": items} if items else {}
+            email_jobs.get_queue().enqueue(job, to, reference, **extra, **email_jobs.job_options())
+            return
+        if self.email_service is None:
+            return
+        subject, body = message(reference, items)
+        self.email_service.send_email(recipient_email=to, subject=subject, body=body)
+
+    def handle_outbox(self, payload: dict) -> None:
+        # Windowed digests collect several payment references
+        reference = payload.get("reference") or ", ".join(payload.get("references", []))
+        self.deliver(payload["template"], payload["to"], reference, payload.get("items"))
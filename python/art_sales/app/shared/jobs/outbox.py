@@ -0,0 +1,247 @@
+# app/shared/jobs/outbox.py
+import os
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta, UTC
+from typing import Any, Callable, Dict, Optional
+from flask import current_app
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.extensions import mongo
+
+
+class OutboxRepository:
+    """
+    Side effects recorded next to the business write that caused them.
+
+    Rows are inserted with the same session as the order/wallet update, so
+    either both commit or neither does. Dispatchers lease rows with
+    find_one_and_update, so several app processes can drain one outbox.
+    """
+
+    COLLECTION = "outbox"
+    # Delivered rows are kept this long for auditing, then removed by a TTL index
+    DONE_TTL_SECONDS = 7 * 24 * 3600
+
+    @staticmethod
+    def _col():
+        db_name = current_app.config["DB_NAME"]
+        return mongo.cx[db_name][OutboxRepository.COLLECTION]
+
+    @staticmethod
+    def ensure_indexes() -> None:
+        col = OutboxRepository._col()
+        col.create_index([("status", ASCENDING), ("available_at", ASCENDING)])
+        col.create_index("processed_at", expireAfterSeconds=OutboxRepository.DONE_TTL_SECONDS)
+        # At most one open digest per key
+        col.create_index("digest_key", unique=True,
+                         partialFilterExpression={"status": "pending", "digest_key": {"$exists": True}})
+        col.create_index("dedupe_key", unique=True, partialFilterExpression={"dedupe_key": {"$exists": True}})
+        col.create_index([("digest_of", ASCENDING), ("payload.references", ASCENDING)])
+
+    @staticmethod
+    def add(topic: str, payload: dict, session=None, dedupe_key: Optional[str] = None) -> Any:
+        """
+        Insert a row; with `dedupe_key`, a second add for the same key (e.g.
+        a retried webhook whose writes ran without a transaction) is skipped
+        and returns None.
+        """
+        col = OutboxRepository._col()
+        now = datetime.now(UTC)
+        row = {
+            "topic": topic,
+            "payload": payload,
+            "status": "pending",
+            "attempts": 0,
+            "available_at": now,
+            "created_at": now,
+        }
+        if dedupe_key:
+            if col.find_one({"dedupe_key": dedupe_key}, {"_id": 1}, session=session):
+                return None
+            row["dedupe_key"] = dedupe_key
+        try:
+            return col.insert_one(row, session=session).inserted_id
+        except DuplicateKeyError:
+            return None
+
+    @staticmethod
+    def add_to_digest(topic: str, digest_key: str, payload: dict, reference: str, items: list,
+                      deliver_at: datetime, session=None) -> None:
+        """
+        Append to the pending row for `digest_key`, creating it (due at
+        `deliver_at`) if this is the first entry of the window. A reference
+        already in a digest for this key (pending, in flight or sent) is not
+        added again.
+        """
+        col = OutboxRepository._col()
+        if col.find_one({"digest_of": digest_key, "payload.references": reference}, {"_id": 1}, session=session):
+            return
+        now = datetime.now(UTC)
+        col.update_one(
+            {"digest_key": digest_key, "status": "pending"},
+            {"$setOnInsert": {"topic": topic, "attempts": 0, "available_at": deliver_at, "created_at": now,
+                              "digest_of": digest_key,
+                              **{f"payload.{k}": v for k, v in payload.items()}},
+             "$addToSet": {"payload.references": reference},
+             "$push": {"payload.items": {"$each": items}}},
+            upsert=True, session=session,
+        )
+
+    @staticmethod
+    def claim(owner: str, lease_seconds: int) -> Optional[dict]:
+        """
+        Lease the oldest due row (or one whose previous lease ran out). A claimed
+        digest stops collecting: its digest_key is dropped, so sales arriving
+        during delivery open a new digest and a failed one can return to pending
+        next to it.
+        """
+        now = datetime.now(UTC)
+        return OutboxRepository._col().find_one_and_update(
+            {"$or": [
+                {"status": "pending", "available_at": {"$lte": now}},
+                {"status": "processing", "lease_until": {"$lt": now}},
+            ]},
+            {"$set": {"status": "processing", "owner": owner,
+                      "lease_until": now + timedelta(seconds=lease_seconds)},
+             "$unset": {"digest_key": ""},
+             "$inc": {"attempts": 1}},
+            sort=[("available_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    @staticmethod
+    def complete(row_id, owner: str) -> None:
+        OutboxRepository._col().update_one(
+            {"_id": row_id, "owner": owner},
+            {"$set": {"status": "done", "processed_at": datetime.now(UTC)},
+             "$unset": {"lease_until": ""}},
+        )
+
+    @staticmethod
+    def fail(row_id, owner: str, error: str, retry_in: Optional[float]) -> None:
+        """Release the lease: back to pending after `retry_in` seconds, or failed for good."""
+        update = {"last_error": error[-2000:]}
+        if retry_in is None:
+            update["status"] = "failed"
+        else:
+            update["status"] = "pending"
+            update["available_at"] = datetime.now(UTC) + timedelta(seconds=retry_in)
+        OutboxRepository._col().update_one(
+            {"_id": row_id, "owner": owner}, {"$set": update, "$unset": {"lease_until": ""}})
+
+    @staticmethod
+    def count(status: str) -> int:
+        return OutboxRepository._col().count_documents({"status": status})
+
+
+class OutboxDispatcher:
+    """
+    Drains the outbox: claims up to `batch_size` rows at a time and runs the
+    handler registered for each row's topic. A handler that raises leaves the
+    row to be retried with exponential backoff until `max_attempts`; a worker
+    that dies mid-row loses its lease after `lease_seconds` and another one
+    picks the row up. Handlers should therefore be idempotent.
+    """
+
+    def __init__(self, app=None, batch_size: int = 50, lease_seconds: int = 60,
+                 poll_interval: float = 1.0, max_attempts: int = 8, backoff_base: float = 2.0):
+        self.app = app
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.handlers: Dict[str, Callable[[dict], Any]] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, topic: str, handler: Callable[[dict], Any]) -> None:
+        self.handlers[topic] = handler
+
+    def wake(self) -> None:
+        """Called after a commit that added rows, so they go out without waiting for the poll."""
+        self._wake.set()
+
+    def run_once(self) -> int:
+        """Process one batch in the current app context; returns rows handled."""
+        handled = 0
+        for _ in range(self.batch_size):
+            row = OutboxRepository.claim(self.owner, self.lease_seconds)
+            if row is None:
+                break
+            self._handle(row)
+            handled += 1
+        return handled
+
+    def drain(self) -> int:
+        """Run batches until nothing is due (tests, shutdown)."""
+        total = 0
+        while True:
+            handled = self.run_once()
+            total += handled
+            if handled < self.batch_size:
+                return total
+
+    def _handle(self, row: dict) -> None:
+        handler = self.handlers.get(row["topic"])
+        try:
+            if handler is None:
+                raise LookupError(f"No outbox handler for topic '{row['topic']}'")
+            handler(row["payload"])
+        except Exception as e:
+            attempts = row.get("attempts", 1)
+            retry_in = None if attempts >= self.max_attempts else self.backoff_base ** attempts
+            print(f"Warning: Outbox {row['topic']} {row['_id']} failed (attempt {attempts}): {e}")
+            OutboxRepository.fail(row["_id"], self.owner, "".join(traceback.format_exception(e)), retry_in)
+            return
+        OutboxRepository.complete(row["_id"], self.owner)
+
+    # ─── Background thread ──────────────────────────────────────────────────────
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        with self.app.app_context():
+            OutboxRepository.ensure_indexes()
+            while not self._stop.is_set():
+                try:
+                    handled = self.run_once()
+                except Exception as e:
+                    # e.g. Mongo briefly unreachable; keep the thread alive
+                    print(f"Warning: Outbox dispatcher error: {e}")
+                    handled = 0
+                if handled < self.batch_size:
+                    self._wake.wait(self.poll_interval)
+                    self._wake.clear()
+
+
+# Global instance, configured by init_outbox
+outbox_dispatcher = OutboxDispatcher()
+
+
+def init_outbox(app) -> OutboxDispatcher:
+    """Apply config to the global dispatcher and start its thread when enabled."""
+    outbox_dispatcher.stop()
+    outbox_dispatcher.app = app
+    outbox_dispatcher.batch_size = int(app.config.get("OUTBOX_BATCH_SIZE", 50))
+    outbox_dispatcher.lease_seconds = int(app.config.get("OUTBOX_LEASE_SECONDS", 60))
+    outbox_dispatcher.poll_interval = float(app.config.get("OUTBOX_POLL_INTERVAL", 1.0))
+    outbox_dispatcher.max_attempts = int(app.config.get("OUTBOX_MAX_ATTEMPTS", 8))
+    if app.config.get("OUTBOX_DISPATCHER_ENABLED", True):
+        outbox_dispatcher.start()
+    return outbox_dispatcher
@@ -0,0 +1,337 @@
+# app/shared/jobs/webhook_events.py
+import hashlib
+import hmac
+import os
+import socket
+import threading
+import traceback
+import uuid
+import zlib
+from datetime import datetime, timedelta, UTC
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from flask import current_app, jsonify, request
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.extensions import mongo
+
+
+class LeaseLostError(RuntimeError):
+    """The event was taken over by another worker while this one was handling it."""
+
+
+# handler(data, done): does the work for one event; calls done(session) inside
+# its transaction so the event is marked processed with the business write
+WebhookHandler = Callable[[dict, Callable[[Any], None]], Any]
+
+
+class WebhookEventRepository:
+    """
+    Incoming webhook events: idempotency record and durable work queue in one.
+
+    One document per (source, event, reference), inserted against a unique
+    index when the delivery arrives, so a provider redelivery is acknowledged
+    without doing anything. Workers lease pending events by shard (a hash of
+    the reference), so all events for one reference go through one shard in
+    arrival order. A leased event whose worker died is picked up again when
+    the lease runs out. Where transactions are available the event is marked
+    done in the same transaction as the business write; on a standalone
+    server they commit separately, so handlers keep their own writes
+    idempotent per reference (one deposit per reference, deduplicated outbox
+    rows) and a retry after a crash or a lost lease finds them already applied.
+    """
+
+    COLLECTION = "webhook_events"
+    # Paystack retries for up to 72 hours; keep finished records well past that
+    DONE_TTL_SECONDS = 7 * 24 * 3600
+    # Per database: the unique index is what makes ingestion idempotent
+    _indexed = set()
+
+    @staticmethod
+    def _col():
+        db_name = current_app.config["DB_NAME"]
+        col = mongo.cx[db_name][WebhookEventRepository.COLLECTION]
+        if col.full_name not in WebhookEventRepository._indexed:
+            WebhookEventRepository.ensure_indexes(col)
+        return col
+
+    @staticmethod
+    def ensure_indexes(col) -> None:
+        col.create_index([("source", ASCENDING), ("event", ASCENDING), ("reference", ASCENDING)], unique=True)
+        col.create_index([("shard", ASCENDING), ("status", ASCENDING), ("received_at", ASCENDING)])
+        col.create_index([("source", ASCENDING), ("reference", ASCENDING), ("received_at", ASCENDING)])
+        col.create_index("processed_at", expireAfterSeconds=WebhookEventRepository.DONE_TTL_SECONDS)
+        WebhookEventRepository._indexed.add(col.full_name)
+
+    @staticmethod
+    def shard_for(reference: str, shards: int) -> int:
+        # crc32 rather than hash(): it must agree across processes
+        return zlib.crc32(reference.encode("utf-8")) % shards
+
+    @staticmethod
+    def enqueue(source: str, event: str, reference: str, data: dict, shards: int) -> Optional[int]:
+        """Store a delivery; returns its shard, or None if the event was already received."""
+        now = datetime.now(UTC)
+        shard = WebhookEventRepository.shard_for(reference, shards)
+        try:
+            WebhookEventRepository._col().insert_one({
+                "source": source, "event": event, "reference": reference, "data": data,
+                "shard": shard, "status": "pending", "attempts": 0,
+                "received_at": now, "available_at": now,
+            })
+        except DuplicateKeyError:
+            return None
+        return shard
+
+    @staticmethod
+    def claim(owner: str, shard: int, lease_seconds: int) -> Optional[dict]:
+        """Lease the oldest due event in `shard` (or one whose previous lease ran out)."""
+        now = datetime.now(UTC)
+        return WebhookEventRepository._col().find_one_and_update(
+            {"shard": shard, "$or": [
+                {"status": "pending", "available_at": {"$lte": now}},
+                {"status": "processing", "lease_until": {"$lt": now}},
+            ]},
+            {"$set": {"status": "processing", "owner": owner, "lease_id": uuid.uuid4().hex,
+                      "lease_until": now + timedelta(seconds=lease_seconds)},
+             "$inc": {"attempts": 1}},
+            sort=[("received_at", ASCENDING), ("_id", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    @staticmethod
+    def has_earlier_unfinished(row: dict) -> bool:
+        """True while an older event for the same reference is still pending, in flight or retrying."""
+        return WebhookEventRepository._col().find_one({
+            "source": row["source"], "reference": row["reference"],
+            "status": {"$in": ["pending", "processing"]},
+            "$or": [{"received_at": {"$lt": row["received_at"]}},
+                    {"received_at": row["received_at"], "_id": {"$lt": row["_id"]}}],
+        }, {"_id": 1}) is not None
+
+    @staticmethod
+    def defer(row: dict, seconds: float) -> None:
+        """Hand a leased event back untouched (its turn has not come yet)."""
+        WebhookEventRepository._col().update_one(
+            {"_id": row["_id"], "lease_id": row["lease_id"], "status": "processing"},
+            {"$set": {"status": "pending", "available_at": datetime.now(UTC) + timedelta(seconds=seconds)},
+             "$inc": {"attempts": -1}, "$unset": {"lease_until": ""}},
+        )
+
+    @staticmethod
+    def complete(row: dict, session=None) -> bool:
+        """Mark done; False if this lease is no longer current (already done, or taken over)."""
+        return WebhookEventRepository._col().update_one(
+            {"_id": row["_id"], "lease_id": row["lease_id"], "status": "processing"},
+            {"$set": {"status": "done", "processed_at": datetime.now(UTC)}, "$unset": {"lease_until": ""}},
+            session=session,
+        ).modified_count == 1
+
+    @staticmethod
+    def fail(row: dict, error: str, retry_in: Optional[float]) -> None:
+        """Release the lease: back to pending after `retry_in` seconds, or failed for good."""
+        update = {"last_error": error[-2000:]}
+        if retry_in is None:
+            update["status"] = "failed"
+        else:
+            update["status"] = "pending"
+            update["available_at"] = datetime.now(UTC) + timedelta(seconds=retry_in)
+        WebhookEventRepository._col().update_one(
+            {"_id": row["_id"], "lease_id": row["lease_id"], "status": "processing"},
+            {"$set": update, "$unset": {"lease_until": ""}})
+
+    @staticmethod
+    def find(source: str, event: str, reference: str) -> Optional[dict]:
+        return WebhookEventRepository._col().find_one({"source": source, "event": event, "reference": reference})
+
+    @staticmethod
+    def lag() -> Dict[str, Any]:
+        """Queue depth per status and how long the oldest unprocessed event has waited."""
+        col = WebhookEventRepository._col()
+        counts = {row["_id"]: row["count"] for row in col.aggregate([
+            {"$match": {"status": {"$in": ["pending", "processing", "failed"]}}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+        ])}
+        oldest = col.find_one({"status": {"$in": ["pending", "processing"]}}, {"received_at": 1},
+                              sort=[("received_at", ASCENDING)])
+        lag_seconds = 0.0
+        if oldest:
+            received = oldest["received_at"]
+            if received.tzinfo is None:
+                received = received.replace(tzinfo=UTC)
+            lag_seconds = round((datetime.now(UTC) - received).total_seconds(), 3)
+        return {
+            "pending": counts.get("pending", 0),
+            "processing": counts.get("processing", 0),
+            "failed": counts.get("failed", 0),
+            "oldest_pending_seconds": lag_seconds,
+        }
+
+
+class WebhookProcessor:
+    """
+    Worker pool for stored webhook events: one thread per shard, each handling
+    its shard's events oldest first. Since a reference always maps to the same
+    shard, its events run one at a time and in order; an event whose
+    predecessor is still retrying is deferred until that one finishes.
+    A handler that raises is retried with exponential backoff until
+    `max_attempts`, after which the event is left as failed for inspection.
+    """
+
+    def __init__(self, app=None, shards: int = 4, lease_seconds: int = 60, poll_interval: float = 1.0,
+                 max_attempts: int = 8, backoff_base: float = 2.0, defer_seconds: float = 1.0):
+        self.app = app
+        self.shards = shards
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.defer_seconds = defer_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.handlers: Dict[Tuple[str, str], WebhookHandler] = {}
+        self._wake: List[threading.Event] = []
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def register(self, source: str, event: str, handler: WebhookHandler) -> None:
+        self.handlers[(source, event)] = handler
+
+    def handles(self, source: str, event: str) -> bool:
+        return (source, event) in self.handlers
+
+    def wake(self, shard: int) -> None:
+        """Called after an event is stored, so its shard picks it up without waiting for the poll."""
+        if shard < len(self._wake):
+            self._wake[shard].set()
+
+    def run_once(self, shard: int) -> int:
+        """Handle due events in `shard` until none are left; returns how many were attempted."""
+        handled = 0
+        while True:
+            row = WebhookEventRepository.claim(self.owner, shard, self.lease_seconds)
+            if row is None:
+                return handled
+            if WebhookEventRepository.has_earlier_unfinished(row):
+                WebhookEventRepository.defer(row, self.defer_seconds)
+                continue
+            self._handle(row)
+            handled += 1
+
+    def process_pending(self) -> int:
+        """Run every shard until nothing is due (tests, shutdown)."""
+        total = 0
+        while True:
+            handled = sum(self.run_once(shard) for shard in range(self.shards))
+            total += handled
+            if not handled:
+                return total
+
+    def _handle(self, row: dict) -> None:
+        handler = self.handlers.get((row["source"], row["event"]))
+        try:
+            if handler is None:
+                raise LookupError(f"No webhook handler for {row['source']} {row['event']}")
+            handler(row["data"], lambda session: self._mark_done(row, session))
+        except Exception as e:
+            attempts = row.get("attempts", 1)
+            retry_in = None if attempts >= self.max_attempts else self.backoff_base ** attempts
+            print(f"Warning: Webhook {row['source']} {row['event']} {row['reference']} failed "
+                  f"(attempt {attempts}): {e}")
+            WebhookEventRepository.fail(row, "".join(traceback.format_exception(e)), retry_in)
+            return
+        # No-op if the handler already marked it done in its transaction
+        WebhookEventRepository.complete(row)
+
+    @staticmethod
+    def _mark_done(row: dict, session) -> None:
+        if not WebhookEventRepository.complete(row, session=session):
+            # Another worker took the event over; abort so the business write is not applied twice
+            raise LeaseLostError(f"Lease on webhook event {row['_id']} was lost")
+
+    # ─── Background threads ─────────────────────────────────────────────────────
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        self._wake = [threading.Event() for _ in range(self.shards)]
+        for shard in range(self.shards):
+            thread = threading.Thread(target=self._loop, args=(shard,), name=f"webhook-shard-{shard}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for event in self._wake:
+            event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._wake = []
+
+    def _loop(self, shard: int) -> None:
+        with self.app.app_context():
+            wake = self._wake[shard]
+            while not self._stop.is_set():
+                try:
+                    self.run_once(shard)
+                except Exception as e:
+                    # e.g. Mongo briefly unreachable; keep the thread alive
+                    print(f"Warning: Webhook shard {shard} error: {e}")
+                wake.wait(self.poll_interval)
+                wake.clear()
+
+
+# Global instance, configured by init_webhook_processor
+webhook_processor = WebhookProcessor()
+
+
+def init_webhook_processor(app) -> WebhookProcessor:
+    """Apply config to the global processor and start its workers when enabled."""
+    webhook_processor.stop()
+    webhook_processor.app = app
+    webhook_processor.shards = int(app.config.get("WEBHOOK_SHARDS", 4))
+    webhook_processor.lease_seconds = int(app.config.get("WEBHOOK_LEASE_SECONDS", 60))
+    webhook_processor.poll_interval = float(app.config.get("WEBHOOK_POLL_INTERVAL", 1.0))
+    webhook_processor.max_attempts = int(app.config.get("WEBHOOK_MAX_ATTEMPTS", 8))
+    if app.config.get("WEBHOOK_WORKERS_ENABLED", True):
+        webhook_processor.start()
+    return webhook_processor
+
+
+def paystack_signature_valid(raw_body: bytes, signature: Optional[str], secret: str) -> bool:
+    """Paystack signs the raw body with HMAC-SHA512 of the secret key (x-paystack-signature)."""
+    if not signature:
+        return False
+    expected = hmac.new(secret.encode("utf-8"), raw_body, hashlib.sha512).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def accept_paystack_webhook(source: str):
+    """
+    Shared fast-ack path for Paystack webhook routes: check the signature,
+    store the event for `webhook_processor` and answer 200 straight away.
+    Events nobody handles are acknowledged without being stored.
+    """
+    secret = current_app.config.get("PAYSTACK_SECRET_KEY")
+    raw_body = request.get_data(cache=True)
+    if secret:
+        if not paystack_signature_valid(raw_body, request.headers.get("x-paystack-signature"), secret):
+            return jsonify({"success": False, "message": "Invalid signature"}), 401
+    elif current_app.config.get("PAYSTACK_WEBHOOK_REQUIRE_SIGNATURE", True):
+        return jsonify({"success": False, "message": "Webhook signing secret not configured"}), 401
+
+    payload = request.get_json(silent=True)
+    if not payload:
+        return jsonify({"success": False, "message": "Invalid payload"}), 400
+
+    event = payload.get("event")
+    data = payload.get("data") or {}
+    reference = data.get("reference")
+    if not reference or not webhook_processor.handles(source, event):
+        return jsonify({"success": True, "message": "Webhook received"}), 200
+
+    shard = WebhookEventRepository.enqueue(source, event, str(reference), data, webhook_processor.shards)
+    if shard is None:
+        return jsonify({"success": True, "duplicate": True, "message": "Event already received"}), 200
+    webhook_processor.wake(shard)
+    return jsonify({"success": True, "queued": True, "message": "Webhook received"}), 200
@@ -0,0 +1,148 @@
+# app/shared/utilities/compression.py
+import zlib
+from flask import Flask, request
+
+try:  # optional codecs
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+}
+
+
+class GzipCodec:
+    name = "gzip"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def _compressobj(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        c = self._compressobj()
+        return c.compress(data) + c.flush()
+
+    def stream(self, chunks):
+        c = self._compressobj()
+        for chunk in chunks:
+            # Sync flush so the client can decode each chunk as it arrives
+            yield c.compress(chunk) + c.flush(zlib.Z_SYNC_FLUSH)
+        yield c.flush()
+
+
+class BrotliCodec:
+    name = "br"
+
+    def __init__(self, quality: int = 4):
+        # Low qualities are the sweet spot for dynamic responses; 11 is for static assets
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self, chunks):
+        c = brotli.Compressor(quality=self.quality)
+        for chunk in chunks:
+            yield c.process(chunk) + c.flush()
+        yield c.finish()
+
+
+class ZstdCodec:
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self, chunks):
+        c = zstandard.ZstdCompressor(level=self.level).compressobj()
+        for chunk in chunks:
+            yield c.compress(chunk) + c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        yield c.flush()
+
+
+def available_codecs(config) -> dict:
+    """Codecs in server preference order, skipping those whose library is not installed."""
+    factories = {
+        "br": (brotli, lambda: BrotliCodec(int(config.get("COMPRESS_BR_QUALITY", 4)))),
+        "zstd": (zstandard, lambda: ZstdCodec(int(config.get("COMPRESS_ZSTD_LEVEL", 3)))),
+        "gzip": (zlib, lambda: GzipCodec(int(config.get("COMPRESS_GZIP_LEVEL", 6)))),
+    }
+    codecs = {}
+    for name in str(config.get("COMPRESS_ALGORITHMS", "br,zstd,gzip")).split(","):
+        name = name.strip()
+        if name in factories and factories[name][0] is not None:
+            codecs[name] = factories[name][1]()
+    return codecs
+
+
+def _closing(chunks, source):
+    """Keep the wrapped body's close() (e.g. an S3 stream) reachable through the encoder."""
+    try:
+        yield from chunks
+    finally:
+        close = getattr(source, "close", None)
+        if close:
+            close()
+
+
+def _compressible(response) -> bool:
+    mimetype = response.mimetype or ""
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Compress JSON/text responses with the best codec the client accepts.
+    Responses below COMPRESS_MIN_SIZE, partial content and already-encoded
+    bodies are left alone; streamed bodies are compressed chunk by chunk.
+    """
+    if not app.config.get("COMPRESS_ENABLED", True):
+        return
+    codecs = available_codecs(app.config)
+    min_size = int(app.config.get("COMPRESS_MIN_SIZE", 1024))
+
+    @app.after_request
+    def compress_response(response):
+        if not codecs or not _compressible(response):
+            return response
+        response.vary.add("Accept-Encoding")
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or "Content-Encoding" in response.headers or request.method == "HEAD"):
+            return response
+
+        name = request.accept_encodings.best_match(list(codecs))
+        if not name:
+            return response
+        codec = codecs[name]
+
+        if response.is_streamed:
+            length = response.content_length
+            if length is not None and length < min_size:
+                return response
+            response.response = _closing(codec.stream(response.iter_encoded()), response.response)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(codec.compress(data))
+
+        response.headers["Content-Encoding"] = name
+        # The encoded bytes differ from the identity representation, so a strong ETag would lie
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
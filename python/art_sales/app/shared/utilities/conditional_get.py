@@ -0,0 +1,68 @@
+# app/shared/utilities/conditional_get.py
+import hashlib
+from datetime import datetime, UTC
+from typing import Callable, Iterable, Optional, Tuple
+from flask import Response, request
+
+# Clients may keep the body but must revalidate before reusing it
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def version_validators(docs: Iterable[dict],
+                       image_url: Optional[Callable[[dict], Optional[str]]] = None,
+                       variant: str = "") -> Tuple[str, Optional[datetime]]:
+    """
+    Build (ETag, Last-Modified) from version-projection documents.
+
+    The ETag covers id + version of every document in order, plus the image URL
+    the full response would carry, so it changes when a signed URL is reissued
+    even if the artwork itself did not. `variant` separates representations of
+    the same documents (e.g. different `fields=` selections).
+    """
+    digest = hashlib.sha1(variant.encode("utf-8"))
+    modified = None
+    for doc in docs:
+        url = image_url(doc) if image_url else None
+        digest.update(f"{doc['_id']}:{doc.get('version', 0)}:{url or ''};".encode("utf-8"))
+        changed = doc.get("updated_at") or doc.get("created_at")
+        if changed is not None:
+            if changed.tzinfo is None:
+                changed = changed.replace(tzinfo=UTC)
+            modified = changed if modified is None else max(modified, changed)
+    return digest.hexdigest(), modified
+
+
+def collection_validators(docs: Iterable[dict],
+                          image_url: Optional[Callable[[dict], Optional[str]]] = None,
+                          variant: str = "") -> Tuple[str, None]:
+    """
+    Validators for a list page: ETag only. A page's newest updated_at does not
+    change when an item is deleted or the page window shifts, so Last-Modified
+    would let If-Modified-Since answer 304 for a stale page.
+    """
+    etag, _ = version_validators(docs, image_url, variant)
+    return etag, None
+
+
+def is_not_modified(etag: str, modified: Optional[datetime]) -> bool:
+    """
+    Evaluate If-None-Match (weak comparison, so compressed variants still match),
+    falling back to If-Modified-Since only when no ETag was sent (RFC 9110 13.2.2).
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if modified is not None and request.if_modified_since is not None:
+        return modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def not_modified_response(etag: str, modified: Optional[datetime]) -> Response:
+    return add_validators(Response(status=304), etag, modified)
+
+
+def add_validators(response: Response, etag: str, modified: Optional[datetime]) -> Response:
+    response.set_etag(etag)
+    if modified is not None:
+        response.last_modified = modified
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+    return response
@@ -1,8 +1,10 @@
 # app/services/email_service.py
 import os
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
-from typing import Protocol, runtime_checkable
+from typing import Callable, Iterable, List, Optional, Protocol, Tuple, runtime_checkable
 
 @runtime_checkable
 class EmailService(Protocol):
@@ -12,25 +14,140 @@ class EmailService(Protocol):
         ...
 
 class SMTPMailer:
-    """SMTP implementation that supports verification + general email sending."""
+    """
+    SMTP implementation that supports verification + general email sending.
 
-    def __init__(self, smtp_host=None, smtp_port=None, username=None, password=None, from_addr=None):
+    Keeps up to `pool_size` authenticated sessions open and reuses them, so the
+    connect/STARTTLS/login handshake is paid once per session rather than once
+    per message. A session that drops is replaced and the message retried once;
+    sessions idle for longer than `idle_timeout` seconds are closed the next
+    time the pool is touched.
+    """
+
+    def __init__(self, smtp_host=None, smtp_port=None, username=None, password=None, from_addr=None,
+                 pool_size=None, idle_timeout=None, starttls=None, timeout=None,
+                 smtp_factory: Callable[..., smtplib.SMTP] = smtplib.SMTP):
         self.smtp_host = smtp_host or os.getenv("SMTP_HOST", "smtp.gmail.com")
         self.smtp_port = int(smtp_port or os.getenv("SMTP_PORT", 587))
         self.username = username or os.getenv("SMTP_USERNAME")
         self.password = password or os.getenv("SMTP_PASSWORD")
         self.from_addr = from_addr or os.getenv("SMTP_FROM") or self.username
+        self.pool_size = int(pool_size or os.getenv("SMTP_POOL_SIZE", 2))
+        self.idle_timeout = float(idle_timeout if idle_timeout is not None
+                                  else os.getenv("SMTP_IDLE_TIMEOUT", 60))
+        self.starttls = starttls if starttls is not None else os.getenv("SMTP_STARTTLS", "True") == "True"
+        self.timeout = float(timeout or os.getenv("SMTP_TIMEOUT", 30))
+        self.smtp_factory = smtp_factory
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []  # (session, returned_at), newest last
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
 
-    def _send(self, recipient_email: str, subject: str, body: str):
+    # ─── Session pool ───────────────────────────────────────────────────────────
+    def _connect(self) -> smtplib.SMTP:
+        server = self.smtp_factory(self.smtp_host, self.smtp_port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _take_idle(self) -> Optional[smtplib.SMTP]:
+        """Newest idle session, closing any that sat unused past idle_timeout."""
+        expired = []
+        with self._lock:
+            cutoff = time.monotonic() - self.idle_timeout
+            while self._idle and self._idle[0][1] < cutoff:
+                expired.append(self._idle.pop(0)[0])
+            server = self._idle.pop()[0] if self._idle else None
+        for stale in expired:
+            self._close(stale)
+        return server
+
+    def _borrow(self) -> smtplib.SMTP:
+        self._slots.acquire()
+        try:
+            return self._take_idle() or self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _give_back(self, server: Optional[smtplib.SMTP]) -> None:
+        if server is not None:
+            with self._lock:
+                self._idle.append((server, time.monotonic()))
+        self._slots.release()
+
+    def close(self) -> None:
+        """Close every idle session (sessions in use are returned and kept)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+    # ─── Sending ────────────────────────────────────────────────────────────────
+    def _message(self, recipient_email: str, subject: str, body: str) -> MIMEText:
         msg = MIMEText(body)
         msg["Subject"] = subject
         msg["From"] = self.from_addr
         msg["To"] = recipient_email
-        with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-            server.starttls()
-            if self.username and self.password:
-                server.login(self.username, self.password)
-            server.send_message(msg)
+        return msg
+
+    def _deliver(self, messages: Iterable[MIMEText]) -> List[str]:
+        """
+        Send messages over one borrowed session. Returns recipients the server
+        refused; connection failures are retried once on a fresh session.
+        """
+        refused: List[str] = []
+        server = self._borrow()
+        try:
+            for msg in messages:
+                try:
+                    server.send_message(msg)
+                except smtplib.SMTPRecipientsRefused:
+                    refused.append(msg["To"])
+                except OSError as e:  # smtplib errors are OSErrors too
+                    if not self._is_connection_error(e):
+                        raise
+                    self._close(server)
+                    server = None
+                    server = self._connect()
+                    server.send_message(msg)
+        except Exception:
+            if server is not None:
+                self._close(server)
+            self._give_back(None)
+            raise
+        self._give_back(server)
+        return refused
+
+    @staticmethod
+    def _is_connection_error(e: OSError) -> bool:
+        """Dropped/reset sessions and 421 "closing channel" are worth one reconnect."""
+        if isinstance(e, smtplib.SMTPServerDisconnected):
+            return True
+        if isinstance(e, smtplib.SMTPResponseException):
+            return e.smtp_code == 421
+        return not isinstance(e, smtplib.SMTPException)
+
+    def _send(self, recipient_email: str, subject: str, body: str):
+        refused = self._deliver([self._message(recipient_email, subject, body)])
+        if refused:
+            raise smtplib.SMTPRecipientsRefused({recipient_email: (550, b"Recipient refused")})
+
+    def send_batch(self, emails: Iterable[Tuple[str, str, str]]) -> List[str]:
+        """Send (recipient, subject, body) emails over one session; returns refused recipients."""
+        return self._deliver(self._message(*email) for email in emails)
 
     def send_verification_email(self, recipient_email: str, verification_link: str) -> None:
         body = f"Please verify your email by visiting: {verification_link}\n\nIf you did not request this, ignore."
@@ -50,3 +167,8 @@ class MockMailer:
 
     def send_email(self, recipient_email: str, subject: str, body: str):
         self.sent.append({"type": "generic", "to": recipient_email, "subject": subject, "body": body})
+
+    def send_batch(self, emails):
+        for recipient_email, subject, body in emails:
+            self.send_email(recipient_email, subject, body)
+        return []
@@ -0,0 +1,93 @@
+# app/shared/utilities/json_provider.py
+import decimal
+import enum
+from datetime import date, datetime, UTC
+from typing import Any
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:  # optional fast encoder
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _http_datetime(dt: datetime) -> str:
+    """Same output as werkzeug's http_date (naive = UTC), without going through email.utils."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(UTC)
+    return (f"{_DAYS[dt.weekday()]}, {dt.day:02d} {_MONTHS[dt.month]} {dt.year:04d} "
+            f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d} GMT")
+
+
+def _default(o: Any) -> Any:
+    """Types neither orjson nor the stdlib encoder know about."""
+    if type(o) is datetime:
+        return _http_datetime(o)
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, Decimal128):
+        return str(o.to_decimal())
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if isinstance(o, enum.Enum):
+        return o.value
+    if isinstance(o, date):
+        return http_date(o)
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, with native ObjectId/Decimal128/Enum support.
+
+    Output matches the default provider (sorted keys, HTTP-date datetimes) unless
+    JSON_DATETIME_FORMAT is "iso", in which case orjson encodes datetimes natively
+    as ISO 8601 (naive values as UTC). Falls back to the stdlib encoder when orjson
+    is not installed.
+    """
+
+    default = staticmethod(_default)
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.iso_datetimes = str(app.config.get("JSON_DATETIME_FORMAT", "http")).lower() == "iso"
+
+    def _options(self, indent: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if self.iso_datetimes:
+            option |= orjson.OPT_NAIVE_UTC
+        else:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        return option
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, default=_default, option=self._options(indent))
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs.get("cls") is not None:
+            kwargs.setdefault("default", _default)
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj, indent=bool(kwargs.get("indent"))).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self.dumps_bytes(obj, indent=indent), mimetype=self.mimetype)
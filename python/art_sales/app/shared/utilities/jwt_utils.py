@@ -1,10 +1,77 @@
 # app/utilities/jwt_utils.py
 import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
 from flask import request, jsonify, current_app, g
 import jwt
 from jwt import ExpiredSignatureError, InvalidTokenError
 
 
+class ClaimsCache:
+    """
+    Bounded LRU of verified token claims, keyed by sha256(secret + token).
+
+    Entries are only served until the token's `exp`, so an expired token always
+    goes back through jwt.decode and gets the usual "Token expired" response.
+    Keying on the secret as well means rotating SECRET_KEY invalidates every entry.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, max_size: int) -> None:
+        with self._lock:
+            self.max_size = max_size
+            while len(self._entries) > max(max_size, 0):
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def key(token: str, secret: str) -> bytes:
+        return hashlib.sha256(f"{secret}\0{token}".encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            claims, exp = entry
+            if time.time() >= exp:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, key: bytes, claims: dict, exp) -> None:
+        if self.max_size <= 0 or not isinstance(exp, (int, float)):
+            return  # tokens without a numeric exp are never cached
+        with self._lock:
+            self._entries[key] = (claims, exp)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global instance
+claims_cache = ClaimsCache()
+
+
+def init_jwt_cache(config) -> None:
+    claims_cache.configure(int(config.get("JWT_CLAIMS_CACHE_SIZE", 4096)))
+    claims_cache.clear()
+
+
 def token_required(fn):
     """
     Decorator to enforce JWT authentication.
@@ -18,16 +85,23 @@ def token_required(fn):
             return jsonify({"success": False, "message": "Missing or invalid Authorization header"}), 401
 
         token = auth.split(" ", 1)[1].strip()
+        secret = current_app.config['SECRET_KEY']
 
-        try:
-            payload = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
-        except ExpiredSignatureError:
-            return jsonify({"success": False, "message": "Token expired"}), 401
-        except (InvalidTokenError, Exception):
-            return jsonify({"success": False, "message": "Invalid token"}), 401
+        # Tokens seen recently skip signature verification until they expire
+        cache_key = ClaimsCache.key(token, secret)
+        user = claims_cache.get(cache_key)
+        if user is None:
+            try:
+                payload = jwt.decode(token, secret, algorithms=["HS256"])
+            except ExpiredSignatureError:
+                return jsonify({"success": False, "message": "Token expired"}), 401
+            except (InvalidTokenError, Exception):
+                return jsonify({"success": False, "message": "Invalid token"}), 401
+            user = {"user_id": payload.get("user_id"), "role": payload.get("role")}
+            claims_cache.put(cache_key, user, payload.get("exp"))
 
         # Attach payload to request context
-        g.user = {"user_id": payload.get("user_id"), "role": payload.get("role")}
+        g.user = dict(user)
         return fn(*args, **kwargs)
 
     return wrapper
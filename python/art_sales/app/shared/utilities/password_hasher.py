@@ -1,11 +1,90 @@
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
 import bcrypt
 
+from app.shared.exceptions.custom_errors import TooManyRequestsError
+
+DEFAULT_ROUNDS = 12  # bcrypt.gensalt() default
+
+
+def _hash(plain: bytes, rounds: int) -> bytes:
+    # Module-level so it can be pickled into worker processes
+    return bcrypt.hashpw(plain, bcrypt.gensalt(rounds=rounds))
+
+
+def _check(plain: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(plain, hashed)
+
+
 class PasswordHasher:
-    @staticmethod
-    def hash_password(plain_password: str) -> str:
-        hashed = bcrypt.hashpw(plain_password.encode('utf-8'), bcrypt.gensalt())
+    """
+    bcrypt hashing off the request thread.
+
+    Work runs on a dedicated pool ("process" by default, so hashes use every core
+    instead of contending for the GIL; "thread" or "inline" for tests and tiny
+    deployments). At most `max_concurrent` operations may be running or queued;
+    beyond that callers get TooManyRequestsError (HTTP 429) instead of piling up.
+    Settings come from the environment because the hasher is built at import time.
+    """
+
+    def __init__(self, rounds: Optional[int] = None, max_workers: Optional[int] = None,
+                 max_concurrent: Optional[int] = None, executor: Optional[str] = None,
+                 acquire_timeout: Optional[float] = None):
+        self.rounds = rounds or int(os.getenv("BCRYPT_ROUNDS", DEFAULT_ROUNDS))
+        self.max_workers = max_workers or int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+        self.max_concurrent = max_concurrent or int(
+            os.getenv("PASSWORD_HASH_MAX_CONCURRENT", self.max_workers * 2))
+        self.executor_kind = executor or os.getenv("PASSWORD_HASH_EXECUTOR", "process")
+        # How long to wait for a free slot before answering 429
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else float(
+            os.getenv("PASSWORD_HASH_ACQUIRE_TIMEOUT", 0.5))
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+
+    def _pool(self) -> Optional[Executor]:
+        if self.executor_kind == "inline":
+            return None
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    if self.executor_kind == "thread":
+                        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                            thread_name_prefix="password-hasher")
+                    else:
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TooManyRequestsError("Too many sign-in attempts in progress. Please retry shortly.")
+        try:
+            pool = self._pool()
+            if pool is None:
+                return fn(*args)
+            return pool.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash_password(self, plain_password: str) -> str:
+        hashed = self._run(_hash, plain_password.encode('utf-8'), self.rounds)
         return hashed.decode('utf-8')
 
-    @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(_check, plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """True when the stored hash was made with a different cost than the configured one."""
+        try:
+            # $2b$<cost>$<salt+hash>
+            return int(hashed_password.split("$")[2]) != self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return False
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
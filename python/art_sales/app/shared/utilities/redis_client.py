@@ -0,0 +1,42 @@
+# app/shared/utilities/redis_client.py
+import os
+from threading import Lock
+from typing import Optional
+
+from redis import ConnectionPool, Redis
+
+_pool: Optional[ConnectionPool] = None
+_lock = Lock()
+
+
+def init_redis(config) -> ConnectionPool:
+    """
+    Create the process-wide connection pool from app config. Every Redis user
+    (RQ queues, verification codes, the image URL tier) borrows sockets from it
+    instead of opening a TCP connection per request. Connections are opened
+    lazily, so this is safe when Redis is not running (e.g. under tests).
+    """
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.disconnect()
+        _pool = ConnectionPool.from_url(
+            config.get("REDIS_URL") or "redis://localhost:6379/0",
+            max_connections=int(config.get("REDIS_MAX_CONNECTIONS", 50)),
+            socket_timeout=float(config.get("REDIS_SOCKET_TIMEOUT", 5)),
+            health_check_interval=30,
+        )
+        return _pool
+
+
+def get_pool() -> ConnectionPool:
+    """The shared pool; RQ workers without a Flask app fall back to REDIS_URL."""
+    if _pool is None:
+        init_redis({"REDIS_URL": os.getenv("REDIS_URL"),
+                    "REDIS_MAX_CONNECTIONS": os.getenv("REDIS_MAX_CONNECTIONS", 50)})
+    return _pool
+
+
+def get_redis() -> Redis:
+    """A client borrowing connections from the shared pool."""
+    return Redis(connection_pool=get_pool())
@@ -0,0 +1,34 @@
+# app/shared/utilities/transactions.py
+from typing import Any, Callable, Optional
+from pymongo.errors import OperationFailure
+from app.extensions import mongo
+
+# IllegalOperation: "Transaction numbers are only allowed on a replica set member or mongos"
+_NO_TRANSACTIONS_CODE = 20
+
+# None until the first attempt tells us whether the deployment supports transactions
+_supported: Optional[bool] = None
+
+
+def run_in_transaction(fn: Callable[[Any], Any]) -> Any:
+    """
+    Run fn(session) inside a multi-document transaction and return its result.
+
+    Standalone servers (and mongomock) cannot run transactions; there fn(None)
+    runs the same writes without one. That is remembered, so later calls skip
+    the attempt. Errors raised by fn itself propagate unchanged.
+    """
+    global _supported
+    if _supported is not False:
+        try:
+            with mongo.cx.start_session() as session:
+                result = session.with_transaction(fn)
+            _supported = True
+            return result
+        except NotImplementedError:
+            _supported = False
+        except OperationFailure as e:
+            if e.code != _NO_TRANSACTIONS_CODE:
+                raise
+            _supported = False
+    return fn(None)
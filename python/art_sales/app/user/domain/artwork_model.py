@@ -13,7 +13,10 @@ class Artwork:
     variants: Optional[Dict] = field(default_factory=dict)
     artist_id: Optional[str] = None
     s3_key: Optional[str] = None
+    derivatives: Optional[Dict] = field(default_factory=dict)  # size name -> S3 key
     created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    updated_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    version: int = 1  # bumped on every change; feeds the HTTP ETag
 
     def to_dict(self):
         return asdict(self)
@@ -0,0 +1,66 @@
+# app/user/dtos/responses/shapes.py
+"""
+Response shapes for artwork and order endpoints.
+
+Each shape is the single definition of what an endpoint returns and of the
+Mongo projection used to fetch it. Computed image fields expect `ctx` to be a
+callable mapping an S3 key to a URL (or None).
+
+List pages used to return whole documents. Cards now leave out description,
+dimensions, variants, created_at and version, which only the detail shape
+returns. No shape returns internal fields such as derivatives or cart_id.
+"""
+from app.shared.utilities.serializer import Field, Serializer
+from app.user.services.image_derivative_service import listing_image_key
+
+
+def _image_url(key, ctx):
+    return ctx(key) if key and ctx else None
+
+
+ARTWORK_CARD = Serializer("artwork_card", [
+    Field("artwork_id", source="_id", transform=str),
+    Field("artist_id"),
+    Field("title"),
+    Field("price"),
+    Field("medium"),
+    Field("is_original"),
+    Field("s3_key"),
+    Field("image_url", compute=lambda doc, ctx: _image_url(listing_image_key(doc), ctx),
+          requires=("s3_key", "derivatives.thumbnail")),
+    Field("updated_at"),
+])
+
+ARTWORK_DETAIL = Serializer("artwork_detail", [
+    Field("artwork_id", source="_id", transform=str),
+    Field("artist_id"),
+    Field("title"),
+    Field("description"),
+    Field("price"),
+    Field("medium"),
+    Field("dimensions"),
+    Field("is_original"),
+    Field("variants"),
+    Field("s3_key"),
+    Field("image_url", compute=lambda doc, ctx: _image_url(doc.get("s3_key"), ctx), requires=("s3_key",)),
+    Field("thumbnail_url",
+          compute=lambda doc, ctx: _image_url((doc.get("derivatives") or {}).get("thumbnail"), ctx),
+          requires=("derivatives.thumbnail",)),
+    Field("created_at"),
+    Field("updated_at"),
+    Field("version"),
+])
+
+ORDER_ROW = Serializer("order_row", [
+    Field("order_id", source="_id", transform=str),
+    Field("buyer_id"),
+    Field("artist_id"),
+    Field("artwork_id"),
+    Field("title"),
+    Field("quantity"),
+    Field("price"),
+    Field("status"),
+    Field("reference"),
+    Field("shipping"),
+    Field("created_at"),
+])
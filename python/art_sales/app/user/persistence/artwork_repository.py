@@ -16,32 +16,88 @@ class ArtworkRepository:
         db_name = current_app.config["DB_NAME"]
         return mongo.cx[db_name][ArtworkRepository.COLLECTION]
 
+    # Fields needed to decide whether a cached response is still current
+    VERSION_PROJECTION = {"_id": 1, "version": 1, "updated_at": 1, "created_at": 1,
+                          "s3_key": 1, "derivatives.thumbnail": 1}
+    _indexes_ready = False
+
+    @staticmethod
+    def _ensure_indexes(coll) -> None:
+        if ArtworkRepository._indexes_ready:
+            return
+        try:
+            coll.create_index([("artist_id", 1), ("updated_at", -1)], name="artist_updated_index")
+        except Exception:
+            # ignore index creation errors (race or already exists)
+            pass
+        ArtworkRepository._indexes_ready = True
+
     @staticmethod
     def create(payload: dict) -> ObjectId:
         payload["created_at"] = __import__("datetime").datetime.utcnow()
+        payload["updated_at"] = payload["created_at"]
+        payload.setdefault("version", 1)
         result = ArtworkRepository._get_collection().insert_one(payload)
         return result.inserted_id
 
     @staticmethod
-    def find_by_artist(artist_id: str, limit: int = 50, skip: int = 0) -> List[dict]:
-        cursor = ArtworkRepository._get_collection().find({"artist_id": artist_id}).skip(skip).limit(limit)
+    def _touch(updates: dict) -> dict:
+        """Wrap a $set so every write also refreshes updated_at and bumps version."""
+        return {"$set": {**updates, "updated_at": __import__("datetime").datetime.utcnow()},
+                "$inc": {"version": 1}}
+
+    @staticmethod
+    def find_by_artist(artist_id: str, limit: int = 50, skip: int = 0,
+                       projection: Optional[dict] = None) -> List[dict]:
+        cursor = ArtworkRepository._get_collection().find({"artist_id": artist_id}, projection).skip(skip).limit(limit)
         return list(cursor)
 
     @staticmethod
-    def find_by_id(artwork_id: str) -> Optional[dict]:
+    def find_versions_by_artist(artist_id: str, limit: int = 50, skip: int = 0) -> List[dict]:
+        """Same page as find_by_artist, but only the fields that make up its ETag."""
+        coll = ArtworkRepository._get_collection()
+        ArtworkRepository._ensure_indexes(coll)
+        cursor = coll.find({"artist_id": artist_id}, ArtworkRepository.VERSION_PROJECTION).skip(skip).limit(limit)
+        return list(cursor)
+
+    @staticmethod
+    def find_version(artwork_id: str) -> Optional[dict]:
+        try:
+            _id = ObjectId(artwork_id)
+        except Exception:
+            return None
+        return ArtworkRepository._get_collection().find_one({"_id": _id}, ArtworkRepository.VERSION_PROJECTION)
+
+    @staticmethod
+    def find_by_id(artwork_id: str, projection: Optional[dict] = None) -> Optional[dict]:
         try:
             _id = ObjectId(artwork_id)
         except Exception:
             return None
-        return ArtworkRepository._get_collection().find_one({"_id": _id})
+        return ArtworkRepository._get_collection().find_one({"_id": _id}, projection)
 
     @staticmethod
-    def find_by_user_id_and_artwork_id(artist_id : str, artwork_id: str) -> Optional[dict]:
+    def find_artist_ids(artwork_ids: List[str]) -> dict:
+        """{artwork_id: artist_id} for many artworks in one $in query."""
+        ids = []
+        for artwork_id in set(artwork_ids):
+            try:
+                ids.append(ObjectId(artwork_id))
+            except Exception:
+                continue
+        if not ids:
+            return {}
+        cursor = ArtworkRepository._get_collection().find({"_id": {"$in": ids}}, {"artist_id": 1})
+        return {str(doc["_id"]): doc.get("artist_id") for doc in cursor}
+
+    @staticmethod
+    def find_by_user_id_and_artwork_id(artist_id : str, artwork_id: str,
+                                       projection: Optional[dict] = None) -> Optional[dict]:
         try:
             _id = ObjectId(artwork_id)
         except Exception:
             return None
-        return ArtworkRepository._get_collection().find_one({"artist_id": artist_id, "_id": _id})
+        return ArtworkRepository._get_collection().find_one({"artist_id": artist_id, "_id": _id}, projection)
 
     @staticmethod
     def update(artist_id : str, artwork_id: str, updates: dict) -> bool:
@@ -49,9 +105,41 @@ class ArtworkRepository:
             _id = ObjectId(artwork_id)
         except Exception:
             return False
-        res = ArtworkRepository._get_collection().update_one({"_id": _id, "artist_id": artist_id}, {"$set": updates})
+        res = ArtworkRepository._get_collection().update_one({"_id": _id, "artist_id": artist_id},
+                                                             ArtworkRepository._touch(updates))
         return res.modified_count > 0
 
+    @staticmethod
+    def set_derivatives(artwork_id: str, derivatives: dict, s3_key: Optional[str] = None) -> bool:
+        """
+        Record the S3 keys of generated image derivatives on the artwork. With
+        `s3_key`, only while the artwork still shows that image.
+        """
+        try:
+            _id = ObjectId(artwork_id)
+        except Exception:
+            return False
+        query = {"_id": _id}
+        if s3_key is not None:
+            query["s3_key"] = s3_key
+        res = ArtworkRepository._get_collection().update_one(query,
+                                                             ArtworkRepository._touch({"derivatives": derivatives}))
+        return res.matched_count > 0
+
+    @staticmethod
+    def find_derivatives_by_s3_key(s3_key: str) -> Optional[dict]:
+        """Derivatives already generated for this image by any artwork sharing it."""
+        doc = ArtworkRepository._get_collection().find_one(
+            {"s3_key": s3_key, "derivatives.thumbnail": {"$exists": True}},
+            {"derivatives": 1, "_id": 0},
+        )
+        return doc.get("derivatives") if doc else None
+
+    @staticmethod
+    def is_s3_key_referenced(s3_key: str) -> bool:
+        """Whether any artwork currently points at this object."""
+        return ArtworkRepository._get_collection().find_one({"s3_key": s3_key}, {"_id": 1}) is not None
+
     @staticmethod
     def delete(artwork_id: str) -> bool:
         try:
@@ -65,11 +153,13 @@ class ArtworkRepository:
                         min_price: float = 0.0,
                         max_price: float = 1_000_000.0,
                         limit: int = 50,
-                        skip: int = 0) -> List[dict]:
+                        skip: int = 0,
+                        projection: Optional[dict] = None) -> List[dict]:
         """
         Simple text + price range search.
         - Uses a text index on (title, description).
-        - Returns list of artwork dicts with artwork_id set.
+        - Returns raw artwork documents; `projection` limits the returned fields
+          (e.g. a response shape's projection or VERSION_PROJECTION).
         """
         # Validate price range
         try:
@@ -94,11 +184,8 @@ class ArtworkRepository:
         if query:
             filters["$text"] = {"$search": query}
 
-        cursor = coll.find(filters).skip(int(skip)).limit(int(limit))
-        results = list(cursor)
-        for r in results:
-            r["artwork_id"] = str(r.pop("_id"))
-        return results
+        cursor = coll.find(filters, projection).skip(int(skip)).limit(int(limit))
+        return list(cursor)
 
     @staticmethod
     def count_by_artist(artist_id: str) -> int:
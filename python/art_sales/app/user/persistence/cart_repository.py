@@ -51,10 +51,10 @@ class CartRepository:
         return result.modified_count > 0
 
     @staticmethod
-    def delete(cart_id: str):
+    def delete(cart_id: str, session=None):
         try:
             _id = ObjectId(cart_id)
         except Exception:
             return False
-        CartRepository._get_collection().delete_one({"_id": _id})
+        CartRepository._get_collection().delete_one({"_id": _id}, session=session)
         return True
\ No newline at end of file
@@ -20,13 +20,15 @@ class OrderRepository:
         return result.inserted_id
 
     @staticmethod
-    def find_by_buyer(buyer_id: str, limit: int = 50, skip: int = 0) -> List[dict]:
-        cursor = OrderRepository._col().find({"buyer_id": buyer_id}).skip(skip).limit(limit)
+    def find_by_buyer(buyer_id: str, limit: int = 50, skip: int = 0,
+                      projection: Optional[dict] = None) -> List[dict]:
+        cursor = OrderRepository._col().find({"buyer_id": buyer_id}, projection).skip(skip).limit(limit)
         return list(cursor)
 
     @staticmethod
-    def find_by_artist(artist_id: str, limit: int = 50, skip: int = 0) -> List[dict]:
-        cursor = OrderRepository._col().find({"artist_id": artist_id}).skip(skip).limit(limit)
+    def find_by_artist(artist_id: str, limit: int = 50, skip: int = 0,
+                       projection: Optional[dict] = None) -> List[dict]:
+        cursor = OrderRepository._col().find({"artist_id": artist_id}, projection).skip(skip).limit(limit)
         return list(cursor)
 
     @staticmethod
@@ -38,9 +40,9 @@ class OrderRepository:
         return OrderRepository._col().find_one({"_id": _id})
 
     @staticmethod
-    def find_by_reference(reference: str) -> List[dict]:
+    def find_by_reference(reference: str, session=None) -> List[dict]:
         """Find orders by Paystack reference."""
-        return list(OrderRepository._col().find({"reference": reference}))
+        return list(OrderRepository._col().find({"reference": reference}, session=session))
 
     @staticmethod
     def find_duplicate(buyer_id: str, artwork_id: str):
@@ -63,11 +65,12 @@ class OrderRepository:
         return result.modified_count > 0
 
     @staticmethod
-    def mark_paid_by_reference(reference: str) -> int:
+    def mark_paid_by_reference(reference: str, session=None) -> int:
         """Mark all orders with this reference as 'completed' after successful payment."""
         result = OrderRepository._col().update_many(
             {"reference": reference},
-            {"$set": {"status": "completed"}}
+            {"$set": {"status": "completed"}},
+            session=session,
         )
         return result.modified_count
 
@@ -0,0 +1,36 @@
+# app/artist/persistence/upload_repository.py
+from datetime import datetime, UTC
+from typing import Optional
+from flask import current_app
+from app.extensions import mongo
+
+
+class UploadRepository:
+    """Upload keys handed out to artists, and the result of finalizing each one."""
+    COLLECTION = "pending_uploads"
+
+    @staticmethod
+    def _get_collection():
+        db_name = current_app.config["DB_NAME"]
+        return mongo.cx[db_name][UploadRepository.COLLECTION]
+
+    @staticmethod
+    def record(artist_id: str, key: str, upload_id: Optional[str] = None) -> None:
+        """Remember that this server issued `key` (and multipart `upload_id`) to `artist_id`."""
+        UploadRepository._get_collection().update_one(
+            {"key": key},
+            {"$setOnInsert": {"key": key, "artist_id": artist_id, "upload_id": upload_id,
+                              "created_at": datetime.now(UTC)}},
+            upsert=True,
+        )
+
+    @staticmethod
+    def find(artist_id: str, key: str) -> Optional[dict]:
+        return UploadRepository._get_collection().find_one({"key": key, "artist_id": artist_id})
+
+    @staticmethod
+    def mark_finalized(artist_id: str, key: str, result: dict) -> None:
+        UploadRepository._get_collection().update_one(
+            {"key": key, "artist_id": artist_id},
+            {"$set": {"result": result, "finalized_at": datetime.now(UTC)}},
+        )
@@ -1,13 +1,16 @@
 # app/artist/routes/artist_controller.py
 from flask import Blueprint, request, jsonify, g
 from app.shared.utilities.jwt_utils import token_required, role_required
+from app.shared.utilities.conditional_get import is_not_modified, not_modified_response, add_validators
 from app.user.services.artist_service import ArtistService
 from app.user.persistence.artwork_repository import ArtworkRepository
+from app.user.persistence.upload_repository import UploadRepository
 from app.user.dtos.requests.artwork_request import ArtworkRequest
 from app.shared.exceptions.custom_errors import ValidationError, OrderNotFoundError, UnauthorizedOrderActionError
 from app.user.services.s3_service import S3Service
 from app.user.persistence.order_repository import OrderRepository
 from app.user.services.order_service import OrderService
+from app.user.dtos.responses.shapes import ARTWORK_CARD, ARTWORK_DETAIL, ORDER_ROW
 
 artist_bp = Blueprint("artist_bp", __name__, url_prefix="/artist")
 
@@ -44,10 +47,18 @@ def list_works():
         skip = int(request.args.get("skip", 0))
     except Exception:
         return jsonify({"success": False, "message": "Invalid pagination parameters."}), 400
+    try:
+        shape = ARTWORK_CARD.select(request.args.get("fields"))
+    except ValidationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
 
     service = ArtistService(ArtworkRepository())
-    docs = service.list_artworks(artist_id, limit=limit, skip=skip)
-    return jsonify({"success": True, "artworks": docs}), 200
+    etag, modified = service.list_artworks_validators(artist_id, limit=limit, skip=skip, shape=shape)
+    if is_not_modified(etag, modified):
+        return not_modified_response(etag, modified)
+
+    docs = service.list_artworks(artist_id, limit=limit, skip=skip, shape=shape)
+    return add_validators(jsonify({"success": True, "artworks": docs}), etag, modified), 200
 
 
 @artist_bp.route("/works", methods=["POST"])
@@ -81,9 +92,13 @@ def create_work():
 @role_required("artist")
 def get_work(artwork_id: str):
     artist_id = _get_artist_id()
+    try:
+        shape = ARTWORK_DETAIL.select(request.args.get("fields"))
+    except ValidationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     try:
         service = ArtistService(ArtworkRepository())
-        resp = service.get_artwork(artist_id, artwork_id)
+        resp = service.get_artwork(artist_id, artwork_id, shape=shape)
         resp["success"] = True
         return jsonify(resp), 200
     except ValidationError as e:
@@ -132,12 +147,148 @@ def generate_upload_url():
     s3_service = S3Service()
     try:
         result = s3_service.generate_upload_url(filename)
+        UploadRepository.record(_get_artist_id(), result["key"])
         return jsonify({"success": True, **result}), 200
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
+
+@artist_bp.route("/works/upload-complete", methods=["POST"])
+@token_required
+@role_required("artist")
+def complete_upload():
+    """
+    Finalize an upload: hash the stored object and move it to its content-addressed
+    key, reusing an identical existing image. Use the returned key as s3_key.
+    Only keys issued to the calling artist are accepted; a repeat call returns
+    the same result.
+    """
+    data = request.get_json(force=True) or {}
+    key = data.get("key")
+    if not key:
+        return jsonify({"success": False, "message": "Missing key"}), 400
+
+    s3_service = S3Service()
+    try:
+        result = ArtistService(ArtworkRepository(), s3_service).finalize_upload(_get_artist_id(), key)
+        result["final_url"] = s3_service.generate_get_url(result["key"], expires_in=86400)
+        return jsonify({"success": True, **result}), 200
+    except ValidationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
 ##can't upload happen in the backend?
 
+@artist_bp.route("/works/multipart", methods=["POST"])
+@token_required
+@role_required("artist")
+def start_multipart_upload():
+    """Start a multipart upload for a large original; parts are then PUT directly to S3."""
+    data = request.get_json(force=True) or {}
+    filename = data.get("filename")
+    if not filename:
+        return jsonify({"success": False, "message": "Missing filename"}), 400
+
+    s3_service = S3Service()
+    try:
+        result = s3_service.create_multipart_upload(filename, data.get("content_type", "image/jpeg"))
+        UploadRepository.record(_get_artist_id(), result["key"], upload_id=result["upload_id"])
+        return jsonify({"success": True, **result}), 201
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+def _owns_upload(key: str, upload_id: str) -> bool:
+    """Whether the calling artist started the multipart upload `upload_id` for `key`."""
+    S3Service._check_upload_key(key)
+    upload = UploadRepository.find(_get_artist_id(), key)
+    return bool(upload) and upload.get("upload_id") == upload_id
+
+
+def _upload_not_found():
+    return jsonify({"success": False, "message": "Upload not found"}), 404
+
+
+@artist_bp.route("/works/multipart/<upload_id>/part-urls", methods=["POST"])
+@token_required
+@role_required("artist")
+def multipart_part_urls(upload_id: str):
+    """
+    Body: key, and either part_numbers (list) or part_count (parts 1..N).
+    Returns one presigned PUT URL per part.
+    """
+    data = request.get_json(force=True) or {}
+    part_numbers = data.get("part_numbers")
+    if part_numbers is None:
+        try:
+            part_numbers = list(range(1, int(data.get("part_count", 0)) + 1))
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "message": "Invalid part_count."}), 400
+
+    s3_service = S3Service()
+    try:
+        if not _owns_upload(data.get("key"), upload_id):
+            return _upload_not_found()
+        urls = s3_service.generate_part_upload_urls(data.get("key"), upload_id, part_numbers)
+        return jsonify({"success": True, "upload_id": upload_id, "parts": urls}), 200
+    except ValidationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+@artist_bp.route("/works/multipart/<upload_id>/parts", methods=["GET"])
+@token_required
+@role_required("artist")
+def multipart_uploaded_parts(upload_id: str):
+    """List parts already uploaded, so an interrupted upload can resume."""
+    s3_service = S3Service()
+    try:
+        if not _owns_upload(request.args.get("key"), upload_id):
+            return _upload_not_found()
+        parts = s3_service.list_uploaded_parts(request.args.get("key"), upload_id)
+        return jsonify({"success": True, "upload_id": upload_id, "parts": parts}), 200
+    except ValidationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+@artist_bp.route("/works/multipart/<upload_id>/complete", methods=["POST"])
+@token_required
+@role_required("artist")
+def complete_multipart_upload(upload_id: str):
+    """Body: key, parts=[{part_number, etag}]. Returns the final key to use as s3_key."""
+    data = request.get_json(force=True) or {}
+    s3_service = S3Service()
+    try:
+        if not _owns_upload(data.get("key"), upload_id):
+            return _upload_not_found()
+        result = s3_service.complete_multipart_upload(data.get("key"), upload_id, data.get("parts") or [])
+        return jsonify({"success": True, **result}), 200
+    except ValidationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+@artist_bp.route("/works/multipart/<upload_id>", methods=["DELETE"])
+@token_required
+@role_required("artist")
+def abort_multipart_upload(upload_id: str):
+    s3_service = S3Service()
+    try:
+        if not _owns_upload(request.args.get("key"), upload_id):
+            return _upload_not_found()
+        s3_service.abort_multipart_upload(request.args.get("key"), upload_id)
+        return jsonify({"success": True, "message": "Upload aborted"}), 200
+    except ValidationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
 @artist_bp.route("/orders", methods=["GET"])
 @token_required
 @role_required("artist")
@@ -149,9 +300,13 @@ def list_orders():
         skip = int(request.args.get("skip", 0))
     except Exception:
         return jsonify({"success": False, "message": "Invalid pagination parameters."}), 400
+    try:
+        shape = ORDER_ROW.select(request.args.get("fields"))
+    except ValidationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
 
     service = OrderService(OrderRepository())
-    docs = service.list_orders_by_artist(artist_id, limit=limit, skip=skip)
+    docs = service.list_orders_by_artist(artist_id, limit=limit, skip=skip, shape=shape)
     return jsonify({"success": True, "orders": docs}), 200
 
 
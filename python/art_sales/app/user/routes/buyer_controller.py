@@ -1,6 +1,12 @@
 # app/buyer/routes/buyer_controller.py
 from flask import Blueprint, request, jsonify, g
 from app.shared.utilities.jwt_utils import token_required, role_required
+from app.shared.utilities.conditional_get import (
+    version_validators,
+    is_not_modified,
+    not_modified_response,
+    add_validators,
+)
 from app.user.services.order_service import OrderService
 from app.user.persistence.order_repository import OrderRepository
 from app.user.dtos.requests.create_order_request import CreateOrderRequest
@@ -14,6 +20,7 @@ from app.shared.exceptions.custom_errors import (
 from app.user.persistence.artwork_repository import ArtworkRepository
 from app.user.services.buyer_service import BuyerService
 from app.user.services.s3_service import S3Service
+from app.user.dtos.responses.shapes import ARTWORK_CARD, ARTWORK_DETAIL, ORDER_ROW
 
 
 buyer_bp = Blueprint("buyer_bp", __name__, url_prefix="/buyer")
@@ -69,8 +76,12 @@ def list_orders():
         skip = int(request.args.get("skip", 0))
     except Exception:
         return jsonify({"success": False, "message": "Invalid pagination params."}), 400
+    try:
+        shape = ORDER_ROW.select(request.args.get("fields"))
+    except ValidationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     service = OrderService(OrderRepository())
-    docs = service.list_orders_by_buyer(buyer_id, limit=limit, skip=skip)
+    docs = service.list_orders_by_buyer(buyer_id, limit=limit, skip=skip, shape=shape)
     return jsonify({"success": True, "orders": docs}), 200
 
 
@@ -101,6 +112,7 @@ def search_artworks():
       max_price - max price filter (optional)
       limit - page size (optional)
       skip - offset (optional)
+      fields - comma-separated subset of the artwork card fields (optional)
     """
     q = request.args.get("q")
     min_price = request.args.get("min_price", 0.0)
@@ -109,9 +121,16 @@ def search_artworks():
     skip = request.args.get("skip", 0)
 
     try:
+        shape = ARTWORK_CARD.select(request.args.get("fields"))
         service = BuyerService(OrderRepository(), ArtworkRepository())
-        results = service.search_artworks(query=q, min_price=min_price, max_price=max_price, limit=limit, skip=skip)
-        return jsonify({"success": True, "results": results}), 200
+        etag, modified = service.search_validators(query=q, min_price=min_price, max_price=max_price,
+                                                   limit=limit, skip=skip, shape=shape)
+        if is_not_modified(etag, modified):
+            return not_modified_response(etag, modified)
+
+        results = service.search_artworks(query=q, min_price=min_price, max_price=max_price, limit=limit, skip=skip,
+                                          shape=shape)
+        return add_validators(jsonify({"success": True, "results": results}), etag, modified), 200
     except ValidationError as e:
         return jsonify({"success": False, "message": str(e)}), 400
     except Exception as e:
@@ -124,26 +143,35 @@ def search_artworks():
 def view_artwork(artwork_id):
     """Public endpoint to view an artwork with image URL."""
     try:
-        # Get artwork from repository
+        shape = ARTWORK_DETAIL.select(request.args.get("fields"))
+    except ValidationError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    try:
         repo = ArtworkRepository()
-        artwork = repo.find_by_id(artwork_id)
+        image_url = S3Service().get_url_or_none
+
+        # Cheap projection lookup first; a repeat view ends here with a 304
+        version = repo.find_version(artwork_id)
+        if not version:
+            return jsonify({"success": False, "message": "Artwork not found"}), 404
+        # Only sign URLs the selected fields will actually return
+        keys = []
+        if "image_url" in shape.field_names:
+            keys.append(version.get("s3_key"))
+        if "thumbnail_url" in shape.field_names:
+            keys.append((version.get("derivatives") or {}).get("thumbnail"))
+        urls = "|".join(image_url(k) or "" for k in keys if k)
+        etag, modified = version_validators([version], lambda doc: urls, variant=shape.name)
+        if is_not_modified(etag, modified):
+            return not_modified_response(etag, modified)
+
+        # Get artwork from repository
+        artwork = shape.dump(repo.find_by_id(artwork_id, projection=shape.projection), image_url)
         
         if not artwork:
             return jsonify({"success": False, "message": "Artwork not found"}), 404
             
-        # Add image URL if S3 key exists
-        s3_key = artwork.get("s3_key")
-        if s3_key:
-            s3_service = S3Service()
-            try:
-                artwork["image_url"] = s3_service.generate_get_url(s3_key, expires_in=3600)
-            except Exception as e:
-                # Log error but don't fail the request
-                print(f"Failed to generate image URL: {e}")
-        
-        # Format response
-        artwork["artwork_id"] = str(artwork.pop("_id"))
-        return jsonify({"success": True, "artwork": artwork}), 200
+        return add_validators(jsonify({"success": True, "artwork": artwork}), etag, modified), 200
         
     except Exception as e:
         return jsonify({"success": False, "message": "Failed to retrieve artwork"}), 500
\ No newline at end of file
@@ -0,0 +1,95 @@
+# app/user/routes/image_controller.py
+from flask import Blueprint, Response, current_app, jsonify, request
+from werkzeug.http import http_date
+from app.shared.exceptions.custom_errors import ValidationError
+from app.user.services.s3_service import S3Service, CONTENT_ADDRESSED_PREFIX
+from app.user.services.image_derivative_service import DERIVATIVE_CACHE_CONTROL
+
+image_bp = Blueprint("image_bp", __name__)
+
+# Only artwork originals and their derivatives are exposed through the proxy
+SERVABLE_PREFIXES = ("artworks/", "derived/")
+MUTABLE_CACHE_CONTROL = "public, max-age=300"
+
+
+def _immutable_etag(key: str):
+    """
+    A content-addressed original is named after its SHA-256, so its ETag can be
+    computed from the key alone, without asking S3. Derivatives are cached as
+    immutable too, but their bytes depend on the renderer, so they are
+    validated against the object's own ETag.
+    """
+    if key.startswith(CONTENT_ADDRESSED_PREFIX):
+        return key[len(CONTENT_ADDRESSED_PREFIX):].split(".")[0]
+    return None
+
+
+def _stream(body, chunk_size: int):
+    try:
+        for chunk in iter(lambda: body.read(chunk_size), b""):
+            yield chunk
+    finally:
+        body.close()
+
+
+def _not_modified(etag, cache_control: str) -> Response:
+    response = Response(status=304)
+    if etag:
+        response.set_etag(etag.strip('"'))
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+@image_bp.route("/<path:key>", methods=["GET"])
+def get_image(key):
+    """
+    Stream an image from S3 in fixed-size chunks.
+    Public like the signed URLs it replaces (an <img> tag cannot send a bearer token).
+    """
+    if not key.startswith(SERVABLE_PREFIXES):
+        return jsonify({"success": False, "message": "Image not found"}), 404
+
+    etag = _immutable_etag(key)
+    cache_control = DERIVATIVE_CACHE_CONTROL if etag or key.startswith("derived/") else MUTABLE_CACHE_CONTROL
+    if etag and request.if_none_match.contains(etag):
+        return _not_modified(etag, cache_control)
+
+    byte_range = None
+    if request.range and len(request.range.ranges) == 1:
+        # If-Range can only be checked up front when the ETag is known; otherwise send the whole object
+        if_range = request.if_range
+        if not (if_range.etag or if_range.date) or (etag and if_range.etag == etag):
+            byte_range = request.range.to_header()
+
+    try:
+        obj = S3Service().open_object(
+            key,
+            byte_range=byte_range,
+            if_none_match=None if etag else request.headers.get("If-None-Match"),
+        )
+    except FileNotFoundError:
+        return jsonify({"success": False, "message": "Image not found"}), 404
+    except ValidationError as e:
+        return jsonify({"success": False, "message": str(e)}), 416
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
+    if obj.get("NotModified"):
+        # Echo the object's ETag, not whichever tag (or `*`) the client sent
+        return _not_modified(obj.get("ETag"), cache_control)
+
+    response = Response(
+        _stream(obj["Body"], current_app.config.get("IMAGE_PROXY_CHUNK_SIZE", 64 * 1024)),
+        status=206 if obj.get("ContentRange") else 200,
+        mimetype=obj.get("ContentType") or "application/octet-stream",
+    )
+    response.set_etag(etag or obj.get("ETag", "").strip('"'))
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Accept-Ranges"] = "bytes"
+    if obj.get("ContentLength") is not None:
+        response.headers["Content-Length"] = str(obj["ContentLength"])
+    if obj.get("ContentRange"):
+        response.headers["Content-Range"] = obj["ContentRange"]
+    if obj.get("LastModified"):
+        response.headers["Last-Modified"] = http_date(obj["LastModified"])
+    return response
@@ -1,51 +1,61 @@
 # app/buyer/routes/paystack_webhook_controller.py
+import hmac
 from flask import Blueprint, request, jsonify, current_app
 from app.user.services.paystack_checkout_service import PaystackCheckoutService
 from app.user.persistence.cart_repository import CartRepository
 from app.user.persistence.order_repository import OrderRepository
 from app.shared.exceptions.custom_errors import ValidationError
+from app.shared.jobs.notifications import EMAIL_TOPIC, NotificationDispatcher
+from app.shared.jobs.outbox import outbox_dispatcher
+from app.shared.jobs.webhook_events import WebhookEventRepository, accept_paystack_webhook, webhook_processor
 from typing import Any
 
 paystack_webhook_bp = Blueprint("paystack_webhook_bp", __name__, url_prefix="/paystack")
 
+WEBHOOK_SOURCE = "paystack.checkout"
+
 # Global service instance
 webhook_service: Any = None
 email_service: Any = None
+notifier: NotificationDispatcher | None = None
 
-def init_services(email_service_instance=None) -> None:
-    """Initialize the webhook service."""
-    global webhook_service, email_service
+def init_services(email_service_instance=None, async_email: bool = False) -> None:
+    """Initialize the webhook service and the outbox handler that sends its emails."""
+    global webhook_service, email_service, notifier
     email_service = email_service_instance
+    notifier = NotificationDispatcher(email_service, use_queue=async_email)
+    outbox_dispatcher.register(EMAIL_TOPIC, notifier.handle_outbox)
     webhook_service = PaystackCheckoutService(CartRepository(), OrderRepository())
+    webhook_processor.register(WEBHOOK_SOURCE, "charge.success", handle_charge_success)
 
 
 @paystack_webhook_bp.route("/webhook", methods=["POST"])
 def paystack_webhook():
     """
-    Handle Paystack webhook events.
+    Receive a Paystack webhook: check the signature, store the event and
+    acknowledge at once. Verification and order updates run on webhook_processor.
     """
     try:
-        payload = request.get_json()
-        
-        if not payload:
-            return jsonify({"success": False, "message": "Invalid payload"}), 400
-            
-        # Extract event data
-        event = payload.get("event")
-        data = payload.get("data", {})
-        
-        if event == "charge.success":
-            # Payment was successful
-            reference = data.get("reference")
-            if reference:
-                try:
-                    result = webhook_service.verify_payment(reference, email_service)
-                    return jsonify(result), 200
-                except Exception as e:
-                    return jsonify({"success": False, "message": str(e)}), 400
-        
-        # For other events, just acknowledge receipt
-        return jsonify({"success": True, "message": "Webhook received"}), 200
-        
+        return accept_paystack_webhook(WEBHOOK_SOURCE)
     except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
\ No newline at end of file
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+@paystack_webhook_bp.route("/webhook/metrics", methods=["GET"])
+def webhook_metrics():
+    """
+    Queue depth and lag of stored webhook events (counts only). For ops tooling:
+    needs the OPS_METRICS_TOKEN shared secret in X-Ops-Token.
+    """
+    expected = current_app.config.get("OPS_METRICS_TOKEN")
+    supplied = request.headers.get("X-Ops-Token")
+    if not supplied:
+        return jsonify({"success": False, "message": "Ops token is missing"}), 401
+    if not expected or not hmac.compare_digest(supplied.encode("utf-8"), expected.encode("utf-8")):
+        return jsonify({"success": False, "message": "Invalid ops token"}), 403
+    return jsonify({"success": True, "data": WebhookEventRepository.lag()}), 200
+
+
+def handle_charge_success(data: dict, done) -> None:
+    """Verify the payment and complete its orders; runs on a webhook worker, once per reference."""
+    webhook_service.verify_payment(data["reference"], notify=email_service is not None, extra_writes=done)
@@ -1,12 +1,17 @@
 # app/artist/services/artist_service.py
 from bson import ObjectId
 from typing import List
+from flask import current_app
 from app.user.persistence.artwork_repository import ArtworkRepository
 from app.user.persistence.order_repository import OrderRepository
+from app.user.persistence.upload_repository import UploadRepository
 from app.user.dtos.requests.artwork_request import ArtworkRequest
 from app.user.dtos.responses.artwork_response import ArtworkResponse
 from app.user.mappers.artist_mapper import Mapper
 from app.user.services.s3_service import S3Service
+from app.user.services.image_derivative_service import image_derivatives, listing_image_key
+from app.shared.utilities.conditional_get import collection_validators
+from app.user.dtos.responses.shapes import ARTWORK_CARD, ARTWORK_DETAIL
 from app.shared.exceptions.custom_errors import (
     ArtworkNotFoundError,
     ValidationError,
@@ -15,9 +20,11 @@ from app.user.exceptions.custom_errors import StorageServiceError
 
 
 class ArtistService:
-    def __init__(self, artwork_repo: ArtworkRepository, s3_service: S3Service = None):
+    def __init__(self, artwork_repo: ArtworkRepository, s3_service: S3Service = None,
+                 upload_repo: UploadRepository = None):
         self.artwork_repo = artwork_repo
         self.s3_service = s3_service or S3Service()
+        self.upload_repo = upload_repo or UploadRepository()
 
     def artist_summary(self, artist_id: str) -> dict:
         """Get summary statistics for artist dashboard."""
@@ -55,44 +62,97 @@ class ArtistService:
     def create_artwork(self, artist_id: str, req: ArtworkRequest) -> ArtworkResponse:
         req.validate()
         model = Mapper.from_request(req, artist_id= artist_id)
+        if model.s3_key and current_app.config.get("CONTENT_ADDRESSED_UPLOADS"):
+            self._use_content_addressed_image(artist_id, model)
         try:
             inserted_id: ObjectId = self.artwork_repo.create(model.to_dict())
         except Exception as exc:
             raise ValidationError(f"Failed to create artwork: {exc}")
+        if model.s3_key and not model.derivatives and current_app.config.get("IMAGE_DERIVATIVES_ENABLED"):
+            image_derivatives.schedule(current_app._get_current_object(), str(inserted_id), model.s3_key)
         return ArtworkResponse(success=True, message="Artwork created", artwork_id=str(inserted_id))
 
 
-    def list_artworks(self, artist_id: str, limit=50, skip=0) -> list:
-        docs = self.artwork_repo.find_by_artist(artist_id, limit=limit, skip=skip)
-        for d in docs:
-            key = d.get("s3_key")
-            if key:
-                try:
-                    d["image_url"] = self.s3_service.generate_get_url(key, expires_in=3600)
-                except Exception as e:
-                    raise StorageServiceError(f"Could not generate signed image URL: {e}")
-            d["artwork_id"] = str(d.pop("_id"))
-        return docs
+    def finalize_upload(self, artist_id: str, key: str) -> dict:
+        """
+        Move an upload to its content-addressed key. Only keys issued to this
+        artist and not yet used by an artwork are accepted; finalizing the same
+        key again returns the first result.
+        """
+        if self.s3_service.is_content_addressed(key):
+            return self.s3_service.finalize_upload(key)
+        upload = self.upload_repo.find(artist_id, key)
+        if not upload:
+            raise ValidationError("Invalid upload key.")
+        if upload.get("result"):
+            return dict(upload["result"])
+        if self.artwork_repo.is_s3_key_referenced(key):
+            raise ValidationError("Upload is already in use by an artwork.")
 
+        try:
+            result = self.s3_service.finalize_upload(key, delete_source=False)
+        except Exception as e:
+            raise StorageServiceError(f"Could not finalize image upload: {e}")
+        self.upload_repo.mark_finalized(artist_id, key, result)
+        try:
+            self.s3_service.delete_object(key)
+        except Exception as e:
+            # The copy is recorded; a leftover source only costs storage
+            print(f"DEBUG: Could not delete finalized upload {key}: {e}")
+        return dict(result)
+
+    def _use_content_addressed_image(self, artist_id: str, model) -> None:
+        """Point the artwork at the deduplicated object and reuse its derivatives if any."""
+        result = self.finalize_upload(artist_id, model.s3_key)
+        model.s3_key = result["key"]
+        model.derivatives = self.artwork_repo.find_derivatives_by_s3_key(model.s3_key) or {}
+
+    def list_artworks(self, artist_id: str, limit=50, skip=0, shape=ARTWORK_CARD) -> list:
+        docs = self.artwork_repo.find_by_artist(artist_id, limit=limit, skip=skip,
+                                                projection=shape.projection)
+        return shape.dump_many(docs, self._signed_url)
 
-    def get_artwork(self, artist_id : str, artwork_id: str) -> dict:
-        doc = self.artwork_repo.find_by_user_id_and_artwork_id(artist_id, artwork_id)
+    def list_artworks_validators(self, artist_id: str, limit=50, skip=0, shape=ARTWORK_CARD):
+        """(ETag, None) of the list_artworks page, from a projection query only."""
+        docs = self.artwork_repo.find_versions_by_artist(artist_id, limit=limit, skip=skip)
+        # Only sign URLs the selected fields will actually return
+        image_url = self._listing_url if "image_url" in shape.field_names else None
+        return collection_validators(docs, image_url, variant=shape.name)
+
+    def _signed_url(self, key: str) -> str:
+        try:
+            return self.s3_service.generate_get_url(key, expires_in=3600)
+        except Exception as e:
+            raise StorageServiceError(f"Could not generate signed image URL: {e}")
+
+    def _listing_url(self, doc: dict):
+        return self.s3_service.get_url_or_none(listing_image_key(doc))
+
+    def get_artwork(self, artist_id : str, artwork_id: str, shape=ARTWORK_DETAIL) -> dict:
+        doc = self.artwork_repo.find_by_user_id_and_artwork_id(artist_id, artwork_id,
+                                                               projection=shape.projection)
         if not doc:
             raise ArtworkNotFoundError("Artwork not found.")
-        key = doc.get("s3_key")
-        if key:
-            doc["image_url"] = self.s3_service.generate_get_url(key, expires_in=3600)
-        doc["artwork_id"] = str(doc.pop("_id"))
-        return doc
+        return shape.dump(doc, self._signed_url)
 
 
     def update_artwork(self,artist_id : str, artwork_id: str, updates: dict) -> ArtworkResponse:
         if not updates:
             raise ValidationError("No updates provided.")
 
+        s3_key = updates.get("s3_key")
+        if s3_key:
+            updates = dict(updates)
+            if current_app.config.get("CONTENT_ADDRESSED_UPLOADS"):
+                s3_key = updates["s3_key"] = self.finalize_upload(artist_id, s3_key)["key"]
+            # Derivatives of the previous image no longer apply
+            updates["derivatives"] = self.artwork_repo.find_derivatives_by_s3_key(s3_key) or {}
+
         ok = self.artwork_repo.update(artist_id, artwork_id, updates)
         if not ok:
             raise ArtworkNotFoundError("Artwork not found or update failed.")
+        if s3_key and not updates["derivatives"] and current_app.config.get("IMAGE_DERIVATIVES_ENABLED"):
+            image_derivatives.schedule(current_app._get_current_object(), artwork_id, s3_key)
         return ArtworkResponse(success=True, message="Artwork updated successfully")
 
     def delete_artwork(self, artwork_id: str) -> ArtworkResponse:
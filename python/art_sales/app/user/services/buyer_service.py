@@ -3,6 +3,9 @@ from app.user.persistence.artwork_repository import ArtworkRepository
 from app.shared.exceptions.custom_errors import ValidationError
 from app.user.persistence.order_repository import OrderRepository
 from app.user.services.s3_service import S3Service
+from app.user.services.image_derivative_service import listing_image_key
+from app.shared.utilities.conditional_get import collection_validators
+from app.user.dtos.responses.shapes import ARTWORK_CARD
 
 
 class BuyerService:
@@ -13,7 +16,7 @@ class BuyerService:
     def buyer_summary(self, buyer_id: str) -> dict:
         if not buyer_id:
             raise ValidationError("Buyer email required.")
-        orders = self.order_repo.find_by_buyer(buyer_id)
+        orders = self.order_repo.find_by_buyer(buyer_id, projection={"status": 1, "price": 1, "_id": 0})
         total_orders = len(orders)
         completed = sum(1 for o in orders if o.get("status") == "completed")
         pending = sum(1 for o in orders if o.get("status") == "processing")
@@ -49,11 +52,39 @@ class BuyerService:
                         min_price: float = 0.0,
                         max_price: float = 1_000_000.0,
                         limit: int = 50,
-                        skip: int = 0) -> list:
+                        skip: int = 0,
+                        shape=ARTWORK_CARD) -> list:
         """
         Validate and delegate search to ArtworkRepository.
         """
-        # pagination validation
+        limit, skip = self._pagination(limit, skip)
+
+        # delegate to repository (it performs price validation)
+        results = self.artwork_repo.search_artworks(query=query, min_price=min_price, max_price=max_price, limit=limit,
+                                                 skip=skip, projection=shape.projection)
+
+        # Image URLs (thumbnail when available) for artworks with S3 keys
+        return shape.dump_many(results, S3Service().get_url_or_none)
+
+    def search_validators(self,
+                          query: str | None = None,
+                          min_price: float = 0.0,
+                          max_price: float = 1_000_000.0,
+                          limit: int = 50,
+                          skip: int = 0,
+                          shape=ARTWORK_CARD):
+        """(ETag, None) of a search page, from a projection query only."""
+        limit, skip = self._pagination(limit, skip)
+        docs = self.artwork_repo.search_artworks(query=query, min_price=min_price, max_price=max_price,
+                                                 limit=limit, skip=skip,
+                                                 projection=ArtworkRepository.VERSION_PROJECTION)
+        if "image_url" not in shape.field_names:
+            return collection_validators(docs, variant=shape.name)
+        image_url = S3Service().get_url_or_none
+        return collection_validators(docs, lambda doc: image_url(listing_image_key(doc)), variant=shape.name)
+
+    @staticmethod
+    def _pagination(limit, skip):
         try:
             limit = int(limit)
             skip = int(skip)
@@ -62,20 +93,4 @@ class BuyerService:
 
         if limit <= 0 or skip < 0:
             raise ValidationError("Invalid pagination parameters.")
-
-        # delegate to repository (it performs price validation)
-        results = self.artwork_repo.search_artworks(query=query, min_price=min_price, max_price=max_price, limit=limit,
-                                                 skip=skip)
-        
-        # Add image URLs for artworks with S3 keys
-        s3_service = S3Service()
-        for artwork in results:
-            s3_key = artwork.get("s3_key")
-            if s3_key:
-                try:
-                    artwork["image_url"] = s3_service.generate_get_url(s3_key, expires_in=3600)
-                except Exception:
-                    # If we can't generate URL, just skip it
-                    pass
-                    
-        return results
\ No newline at end of file
+        return limit, skip
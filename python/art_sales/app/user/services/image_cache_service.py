@@ -1,64 +1,159 @@
 # app/user/services/image_cache_service.py
 import time
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Any
 from threading import Lock
 
 
-class ImageCacheService:
-    """Simple in-memory cache for signed image URLs."""
-    
+# Entries are treated as stale this many seconds before they actually expire,
+# so a URL handed to a client is never about to die in flight.
+EXPIRY_BUFFER_SECONDS = 60
+
+
+class _Shard:
+    """One stripe of the cache: its own dict, its own lock, its own cleanup clock."""
+
+    __slots__ = ("entries", "lock", "last_cleanup")
+
     def __init__(self):
-        self._cache: Dict[str, tuple] = {}  # key: (url, expiration_time)
-        self._lock = Lock()
-        self._cleanup_interval = 300  # Clean up every 5 minutes
-        self._last_cleanup = time.time()
+        self.entries: Dict[str, tuple] = {}  # key: (url, expiration_time)
+        self.lock = Lock()
+        self.last_cleanup = time.time()
+
+
+class ImageCacheService:
+    """
+    In-memory cache for signed image URLs, optionally backed by a shared tier.
+
+    Keys are hashed onto independent shards. Reads are lock-free: a hit is a
+    single dict lookup (atomic under the GIL), so concurrent requests never
+    serialize on a global lock. Writers and expiry removal only lock the shard
+    that owns the key.
+
+    The in-process L1 can be bounded with `max_entries`. When an `l2` tier is
+    configured (see image_cache_tiers), L1 misses fall through to it and new
+    URLs are written to both, so every worker process shares one warm cache.
+    The shared tier is best-effort: if it is unreachable we simply presign.
+    """
+
+    def __init__(self, shards: int = 16, cleanup_interval: int = 300,
+                 max_entries: Optional[int] = None, l2: Any = None):
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        self._shards: List[_Shard] = [_Shard() for _ in range(shards)]
+        self._cleanup_interval = cleanup_interval  # Clean up every 5 minutes
+        self._shard_capacity: Optional[int] = None
+        self.l2 = None
+        self.configure(max_entries=max_entries, l2=l2)
+
+    def configure(self, max_entries: Optional[int] = None, l2: Any = None) -> None:
+        """Set the L1 size bound (None = unbounded) and the optional shared tier."""
+        if max_entries:
+            # Round up so the total capacity is never below max_entries
+            self._shard_capacity = -(-int(max_entries) // len(self._shards))
+        else:
+            self._shard_capacity = None
+        self.l2 = l2
+
+    def _shard_for(self, s3_key: str) -> _Shard:
+        return self._shards[hash(s3_key) % len(self._shards)]
 
     def get(self, s3_key: str) -> Optional[str]:
         """Get cached signed URL if it exists and hasn't expired."""
-        with self._lock:
-            self._cleanup_expired()
-            
-            if s3_key in self._cache:
-                url, expiration_time = self._cache[s3_key]
-                # Check if URL is still valid (with 60 second buffer)
-                if time.time() < expiration_time - 60:
-                    return url
-                else:
-                    # Remove expired entry
-                    del self._cache[s3_key]
-        return None
+        shard = self._shard_for(s3_key)
+        entry = shard.entries.get(s3_key)
+        if entry is not None:
+            url, expiration_time = entry
+            if time.time() < expiration_time - EXPIRY_BUFFER_SECONDS:
+                return url
+
+            # Remove expired entry, unless a writer already replaced it
+            with shard.lock:
+                if shard.entries.get(s3_key) is entry:
+                    del shard.entries[s3_key]
+
+        return self._get_from_l2(s3_key)
+
+    def _get_from_l2(self, s3_key: str) -> Optional[str]:
+        """Look the key up in the shared tier and promote a hit into L1."""
+        if self.l2 is None:
+            return None
+        try:
+            hit = self.l2.get(s3_key)
+        except Exception:
+            return None
+        if not hit:
+            return None
+
+        url, expiration_time = hit
+        if time.time() >= expiration_time - EXPIRY_BUFFER_SECONDS:
+            return None
+        self._store(s3_key, url, expiration_time)
+        return url
 
     def set(self, s3_key: str, url: str, expires_in: int = 3600) -> None:
         """Cache a signed URL with its expiration time."""
-        with self._lock:
-            self._cleanup_expired()
-            
-            expiration_time = time.time() + expires_in
-            self._cache[s3_key] = (url, expiration_time)
-
-    def _cleanup_expired(self) -> None:
-        """Remove expired entries from cache."""
+        expiration_time = time.time() + expires_in
+        self._store(s3_key, url, expiration_time)
+
+        if self.l2 is not None:
+            try:
+                self.l2.set(s3_key, url, expiration_time)
+            except Exception:
+                pass
+
+    def _store(self, s3_key: str, url: str, expiration_time: float) -> None:
+        """Write an entry into L1, evicting the shard's oldest entry when full."""
+        shard = self._shard_for(s3_key)
+        with shard.lock:
+            self._cleanup_expired(shard)
+            entries = shard.entries
+            if (self._shard_capacity is not None
+                    and s3_key not in entries
+                    and len(entries) >= self._shard_capacity):
+                # dicts keep insertion order, so the first key is the oldest
+                del entries[next(iter(entries))]
+            entries[s3_key] = (url, expiration_time)
+
+    def _cleanup_expired(self, shard: _Shard) -> None:
+        """Remove expired entries from a shard. Caller must hold the shard lock."""
         current_time = time.time()
-        
+
         # Only cleanup periodically to avoid overhead
-        if current_time - self._last_cleanup < self._cleanup_interval:
+        if current_time - shard.last_cleanup < self._cleanup_interval:
             return
-            
+
         expired_keys = [
-            key for key, (_, expiration_time) in self._cache.items()
+            key for key, (_, expiration_time) in shard.entries.items()
             if current_time >= expiration_time
         ]
-        
+
         for key in expired_keys:
-            del self._cache[key]
-            
-        self._last_cleanup = current_time
+            del shard.entries[key]
+
+        shard.last_cleanup = current_time
 
     def clear(self) -> None:
-        """Clear all cached entries."""
-        with self._lock:
-            self._cache.clear()
+        """Clear all L1 entries (the shared tier expires on its own)."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
 
 
 # Global instance
-image_cache = ImageCacheService()
\ No newline at end of file
+image_cache = ImageCacheService()
+
+
+def init_image_cache(config) -> None:
+    """Apply app config to the global cache: L1 size and the optional Redis L2."""
+    l2 = None
+    if str(config.get("IMAGE_CACHE_L2", "none")).lower() == "redis":
+        from redis import Redis
+        from app.shared.utilities.redis_client import get_redis
+        from app.user.services.image_cache_tiers import RedisImageCacheTier
+        redis_url = config.get("IMAGE_CACHE_REDIS_URL")
+        # A dedicated cache Redis gets its own client; otherwise share the app pool
+        l2 = RedisImageCacheTier(Redis.from_url(redis_url) if redis_url else get_redis())
+    image_cache.configure(max_entries=config.get("IMAGE_CACHE_L1_SIZE"), l2=l2)
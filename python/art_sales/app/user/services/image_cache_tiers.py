@@ -0,0 +1,60 @@
+# app/user/services/image_cache_tiers.py
+import time
+from threading import Lock
+from typing import Optional, Dict, Tuple
+
+
+class InMemoryImageCacheTier:
+    """
+    Shared-tier stand-in for tests and single-process dev.
+    Several ImageCacheService instances can point at one of these to behave
+    like workers sharing a Redis.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = Lock()
+
+    def get(self, s3_key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            entry = self._entries.get(s3_key)
+            if entry and time.time() >= entry[1]:
+                del self._entries[s3_key]
+                return None
+            return entry
+
+    def set(self, s3_key: str, url: str, expiration_time: float) -> None:
+        with self._lock:
+            self._entries[s3_key] = (url, expiration_time)
+
+
+class RedisImageCacheTier:
+    """
+    Redis-backed shared tier. Each entry is stored as "<expiration>|<url>" with a
+    Redis TTL matching the presigned URL's own expiry, so Redis drops it exactly
+    when the URL stops being usable.
+    """
+
+    KEY_PREFIX = "image-url:"
+
+    def __init__(self, redis_client, key_prefix: str = KEY_PREFIX):
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+
+    def get(self, s3_key: str) -> Optional[Tuple[str, float]]:
+        raw = self.redis.get(self.key_prefix + s3_key)
+        if not raw:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        expiration, _, url = raw.partition("|")
+        try:
+            return url, float(expiration)
+        except ValueError:
+            return None
+
+    def set(self, s3_key: str, url: str, expiration_time: float) -> None:
+        ttl = int(expiration_time - time.time())
+        if ttl <= 0:
+            return
+        self.redis.set(self.key_prefix + s3_key, f"{expiration_time:.3f}|{url}", ex=ttl)
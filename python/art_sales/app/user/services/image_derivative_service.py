@@ -0,0 +1,143 @@
+# app/user/services/image_derivative_service.py
+import io
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional, Any
+
+# name -> longest edge in pixels
+DERIVATIVE_SIZES = {
+    "thumbnail": 320,
+    "medium": 960,
+    "large": 1920,
+}
+
+_FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+}
+
+# Derivative keys never change content, so clients may cache them for a year
+DERIVATIVE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def derivative_key(s3_key: str, name: str, fmt: str = "webp") -> str:
+    """
+    artworks/20250101_x.jpg -> derived/thumbnail/artworks/20250101_x.jpg.webp
+    The original's extension is kept so x.jpg and x.png get separate derivatives.
+    """
+    ext = "jpg" if fmt == "jpeg" else fmt
+    return f"derived/{name}/{s3_key}.{ext}"
+
+
+def listing_image_key(doc: dict) -> Optional[str]:
+    """The key list/search pages should show: the thumbnail once it exists, else the original."""
+    return (doc.get("derivatives") or {}).get("thumbnail") or doc.get("s3_key")
+
+
+def render_derivatives(data: bytes, fmt: str = "webp", quality: int = 80) -> Dict[str, bytes]:
+    """
+    Decode the original once and encode every configured size.
+    Runs inside a worker process, so it only takes and returns plain bytes.
+    """
+    from PIL import Image, ImageOps
+
+    pil_format, _ = _FORMATS[fmt]
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGBA")
+
+        results = {}
+        # Largest first, so each smaller size is resampled from the previous one
+        for name, edge in sorted(DERIVATIVE_SIZES.items(), key=lambda kv: -kv[1]):
+            if max(image.size) > edge:
+                image = image.resize(_fit(image.size, edge), Image.Resampling.LANCZOS)
+            out = io.BytesIO()
+            image.save(out, format=pil_format, quality=quality, optimize=pil_format == "JPEG")
+            results[name] = out.getvalue()
+    return results
+
+
+def _fit(size, edge):
+    width, height = size
+    scale = edge / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class ImageDerivativeService:
+    """
+    Background pipeline that turns an uploaded original into thumbnail/medium/large
+    derivatives, stores them next to the original in S3 and records their keys on
+    the artwork.
+
+    Pillow work runs in a process pool (it is CPU bound and would otherwise hold
+    the GIL against request threads); the S3/Mongo I/O around it runs on a small
+    thread pool so `schedule` returns immediately.
+    """
+
+    def __init__(self, s3_service: Any = None, artwork_repo: Any = None,
+                 max_workers: int = 2, fmt: str = "webp"):
+        self.s3_service = s3_service
+        self.artwork_repo = artwork_repo
+        self.configure(max_workers=max_workers, fmt=fmt)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._scheduler = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image-derivatives")
+
+    def configure(self, max_workers: int = 2, fmt: str = "webp") -> None:
+        if fmt not in _FORMATS:
+            raise ValueError(f"Unsupported derivative format: {fmt}")
+        self.max_workers = max_workers
+        self.fmt = fmt
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._process_pool
+
+    def _services(self):
+        # Resolved lazily so the global instance can be created at import time
+        from app.user.services.s3_service import S3Service
+        from app.user.persistence.artwork_repository import ArtworkRepository
+        return self.s3_service or S3Service(), self.artwork_repo or ArtworkRepository()
+
+    def process(self, artwork_id: str, s3_key: str) -> Dict[str, str]:
+        """Generate, upload and record derivatives for one artwork. Returns name -> key."""
+        s3_service, artwork_repo = self._services()
+        original = s3_service.get_object_bytes(s3_key)
+        rendered = self._pool().submit(render_derivatives, original, self.fmt).result()
+
+        _, content_type = _FORMATS[self.fmt]
+        keys = {}
+        for name, body in rendered.items():
+            key = derivative_key(s3_key, name, self.fmt)
+            s3_service.put_object(key, body, content_type, cache_control=DERIVATIVE_CACHE_CONTROL)
+            keys[name] = key
+
+        # Ignored if the artwork has since moved to another image
+        artwork_repo.set_derivatives(artwork_id, keys, s3_key=s3_key)
+        return keys
+
+    def schedule(self, app, artwork_id: str, s3_key: str):
+        """Run `process` in the background inside an app context; returns the Future."""
+        def run():
+            with app.app_context():
+                try:
+                    return self.process(artwork_id, s3_key)
+                except Exception as e:
+                    # The original is still served; log and move on
+                    print(f"Warning: Failed to generate derivatives for {s3_key}: {e}")
+                    return None
+
+        return self._scheduler.submit(run)
+
+
+# Global instance
+image_derivatives = ImageDerivativeService()
+
+
+def init_image_derivatives(config) -> None:
+    image_derivatives.configure(
+        max_workers=int(config.get("IMAGE_DERIVATIVE_WORKERS", 2)),
+        fmt=str(config.get("IMAGE_DERIVATIVE_FORMAT", "webp")).lower(),
+    )
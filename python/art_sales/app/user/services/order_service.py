@@ -5,6 +5,7 @@ from app.user.persistence.artwork_repository import ArtworkRepository
 from app.user.dtos.requests.create_order_request import CreateOrderRequest
 from app.user.dtos.responses.order_response import OrderResponse
 from app.user.mappers.buyer_mapper import Mapper
+from app.user.dtos.responses.shapes import ORDER_ROW
 from app.shared.exceptions.custom_errors import (
     ArtworkNotFoundError,
     InvalidQuantityError,
@@ -39,19 +40,15 @@ class OrderService:
         order_id = self.order_repo.create(order_dict)
         return OrderResponse(success=True, message="Order created", order_id=order_id)
 
-    def list_orders_by_buyer(self, buyer_id: str, limit: int = 50, skip: int = 0) -> list:
+    def list_orders_by_buyer(self, buyer_id: str, limit: int = 50, skip: int = 0, shape=ORDER_ROW) -> list:
         """List orders for a specific buyer."""
-        docs = self.order_repo.find_by_buyer(buyer_id, limit=limit, skip=skip)
-        for doc in docs:
-            doc["order_id"] = str(doc.pop("_id"))
-        return docs
+        docs = self.order_repo.find_by_buyer(buyer_id, limit=limit, skip=skip, projection=shape.projection)
+        return shape.dump_many(docs)
 
-    def list_orders_by_artist(self, artist_id: str, limit: int = 50, skip: int = 0) -> list:
+    def list_orders_by_artist(self, artist_id: str, limit: int = 50, skip: int = 0, shape=ORDER_ROW) -> list:
         """List orders for a specific artist."""
-        docs = self.order_repo.find_by_artist(artist_id, limit=limit, skip=skip)
-        for doc in docs:
-            doc["order_id"] = str(doc.pop("_id"))
-        return docs
+        docs = self.order_repo.find_by_artist(artist_id, limit=limit, skip=skip, projection=shape.projection)
+        return shape.dump_many(docs)
 
     def ship_order(self, order_id: str, artist_id: str) -> dict:
         """Artist marks order as shipped."""
@@ -1,17 +1,27 @@
 # app/buyer/services/paystack_checkout_service.py
 from app.user.persistence.cart_repository import CartRepository
 from app.user.persistence.order_repository import OrderRepository
+from app.user.persistence.artwork_repository import ArtworkRepository
+from app.auth.persistence.user_repository import UserRepository
 from app.shared.exceptions.custom_errors import ValidationError
 from app.wallet.services.paystack_service import PaystackService
-from typing import Dict, Any, Optional
+from app.shared.jobs.notifications import EMAIL_TOPIC, email_payload
+from app.shared.jobs.outbox import OutboxRepository, outbox_dispatcher
+from app.shared.utilities.transactions import run_in_transaction
+from datetime import datetime, UTC
+from flask import current_app
+from typing import Callable, Dict, Any, List, Optional
 
 
 class PaystackCheckoutService:
     """Service for handling Paystack checkout operations."""
     
-    def __init__(self, cart_repo: CartRepository, order_repo: OrderRepository = None):
+    def __init__(self, cart_repo: CartRepository, order_repo: OrderRepository = None,
+                 artwork_repo: ArtworkRepository = None, user_repo: UserRepository = None):
         self.cart_repo = cart_repo
         self.order_repo = order_repo or OrderRepository()
+        self.artwork_repo = artwork_repo or ArtworkRepository()
+        self.user_repo = user_repo or UserRepository()
         self.paystack_service = PaystackService()
 
     def create_checkout_session(self, buyer_id: str, cart_id: str) -> Dict[str, Any]:
@@ -65,12 +75,15 @@ class PaystackCheckoutService:
             
         data = response.get("data", {})
         
-        # Create pending orders for each item in cart
+        # Create pending orders for each item in cart; artists resolved in one query
+        artist_ids = self.artwork_repo.find_artist_ids([item.get("artwork_id") for item in items])
         order_ids = []
         for item in items:
             order_data = {
                 "buyer_id": buyer_id,
+                "artist_id": artist_ids.get(item.get("artwork_id")),
                 "artwork_id": item.get("artwork_id"),
+                "title": item.get("title"),
                 "quantity": item.get("quantity", 1),
                 "price": item.get("price", 0),
                 "status": "pending",
@@ -87,9 +100,15 @@ class PaystackCheckoutService:
             "order_ids": order_ids
         }
 
-    def verify_payment(self, reference: str, email_service: Optional[Any] = None) -> Dict[str, Any]:
+    def verify_payment(self, reference: str, notify: bool = True,
+                       extra_writes: Optional[Callable[[Any], None]] = None) -> Dict[str, Any]:
         """
         Verify a Paystack payment and update order statuses.
+
+        The order update, cart deletion and outbox rows for the notification
+        emails commit in one transaction; the outbox dispatcher sends the
+        emails afterwards, off the request thread. `extra_writes(session)`
+        joins that transaction (e.g. marking the webhook event processed).
         """
         # Verify the transaction with Paystack
         response = self.paystack_service.verify_transaction(reference)
@@ -105,45 +124,77 @@ class PaystackCheckoutService:
         metadata = data.get("metadata", {})
         cart_id = metadata.get("cart_id")
         
-        # Update orders to completed status
-        updated_count = self.order_repo.mark_paid_by_reference(reference)
-        
-        # Delete the cart if we have a cart ID
-        if cart_id:
-            try:
-                self.cart_repo.delete(cart_id)
-            except Exception as e:
-                # Log the error but don't fail the payment verification
-                print(f"Warning: Failed to delete cart {cart_id}: {e}")
-        
-        # Send emails if email service is provided
-        if email_service and cart_id:
-            try:
-                # Get the orders that were just updated
-                orders = self.order_repo.find_by_reference(reference)
-                if orders:
-                    # Send confirmation email to buyer
-                    buyer_email = data.get("customer", {}).get("email", "buyer@example.com")
-                    email_service.send_email(
-                        recipient_email=buyer_email,
-                        subject="Order Confirmed",
-                        body=f"Your payment has been confirmed. Reference: {reference}"
-                    )
-                    
-                    # Send notification to artists
-                    for order in orders:
-                        artist_email = "artist@example.com"  # This should be looked up from the artwork
-                        email_service.send_email(
-                            recipient_email=artist_email,
-                            subject="New sale",
-                            body=f"A new order has been placed. Reference: {reference}"
-                        )
-            except Exception as e:
-                # Log the error but don't fail the payment verification
-                print(f"Warning: Failed to send emails: {e}")
+        buyer_email = data.get("customer", {}).get("email", "buyer@example.com")
+
+        def apply(session) -> int:
+            # Update orders to completed status
+            updated = self.order_repo.mark_paid_by_reference(reference, session=session)
+            if cart_id:
+                self.cart_repo.delete(cart_id, session=session)
+                if notify:
+                    self._record_notifications(reference, buyer_email, session)
+            if extra_writes:
+                extra_writes(session)
+            return updated
+
+        updated_count = run_in_transaction(apply)
+        outbox_dispatcher.wake()
                 
         return {
             "success": True,
             "message": f"Payment verified and {updated_count} orders updated",
             "reference": reference
-        }
\ No newline at end of file
+        }
+
+    def _record_notifications(self, reference: str, buyer_email: str, session) -> None:
+        """
+        Outbox rows for the buyer confirmation and one sale digest per artist.
+        With ARTIST_DIGEST_WINDOW_SECONDS set, an artist's digests are further
+        merged into one email per window.
+        """
+        orders = self.order_repo.find_by_reference(reference, session=session)
+        if not orders:
+            return
+        # Dedupe keys keep a retried webhook from queueing the same email twice
+        OutboxRepository.add(EMAIL_TOPIC, email_payload("order_confirmation", buyer_email, reference),
+                             session=session, dedupe_key=f"order_confirmation:{reference}")
+
+        items_by_artist = self._items_by_artist(orders)
+        emails = self.user_repo.find_emails_by_ids(list(items_by_artist), session=session)
+        window = int(current_app.config.get("ARTIST_DIGEST_WINDOW_SECONDS", 0) or 0)
+        for artist_id, items in items_by_artist.items():
+            # Legacy accounts use the email address as their id
+            artist_email = emails.get(artist_id) or (artist_id if "@" in artist_id else None)
+            if not artist_email:
+                print(f"Warning: No email for artist {artist_id}; skipping sale notification")
+                continue
+            if window:
+                OutboxRepository.add_to_digest(
+                    EMAIL_TOPIC, f"artist_sale:{artist_email}",
+                    {"template": "artist_sale", "to": artist_email},
+                    reference, items, self._window_end(window), session=session)
+            else:
+                OutboxRepository.add(EMAIL_TOPIC, email_payload("artist_sale", artist_email, reference, items),
+                                     session=session, dedupe_key=f"artist_sale:{artist_email}:{reference}")
+
+    def _items_by_artist(self, orders: List[dict]) -> Dict[str, List[dict]]:
+        """Group order lines by artist; orders from before artist_id was stored are resolved in one query."""
+        missing = [o.get("artwork_id") for o in orders if not o.get("artist_id")]
+        resolved = self.artwork_repo.find_artist_ids(missing) if missing else {}
+        grouped: Dict[str, List[dict]] = {}
+        for order in orders:
+            artist_id = order.get("artist_id") or resolved.get(order.get("artwork_id"))
+            if not artist_id:
+                continue
+            grouped.setdefault(str(artist_id), []).append({
+                "artwork_id": order.get("artwork_id"),
+                "title": order.get("title"),
+                "quantity": order.get("quantity", 1),
+                "price": order.get("price", 0),
+            })
+        return grouped
+
+    @staticmethod
+    def _window_end(window_seconds: int) -> datetime:
+        now = datetime.now(UTC).timestamp()
+        return datetime.fromtimestamp((now // window_seconds + 1) * window_seconds, UTC)
\ No newline at end of file
@@ -1,9 +1,21 @@
 # app/artist/services/s3_service.py
 import boto3
 from botocore.exceptions import ClientError
+import hashlib
 import os
+import time
 from datetime import datetime, UTC
-from app.user.services.image_cache_service import image_cache
+from app.user.services.image_cache_service import image_cache, EXPIRY_BUFFER_SECONDS
+from app.user.services.s3_url_signer import presign_get_url
+from app.shared.exceptions.custom_errors import ValidationError
+
+# S3 multipart limits
+MAX_PART_NUMBER = 10000
+MAX_PART_URLS_PER_CALL = 1000
+
+# Uploaded images are re-keyed by the SHA-256 of their bytes
+CONTENT_ADDRESSED_PREFIX = "artworks/sha256/"
+HASH_CHUNK_SIZE = 1024 * 1024
 
 
 class S3Service:
@@ -12,11 +24,17 @@ class S3Service:
     def __init__(self):
         self.bucket = os.getenv("AWS_S3_BUCKET", "test-bucket")
         self.region = os.getenv("AWS_S3_REGION", "us-east-1")
+        self.access_key = os.getenv("AWS_ACCESS_KEY_ID", "test-key")
+        self.secret_key = os.getenv("AWS_SECRET_ACCESS_KEY", "test-secret")
+        self.session_token = os.getenv("AWS_SESSION_TOKEN")
+        # When > 0, GET URLs are signed as of the start of a fixed time window
+        # (e.g. 3600 = hourly) so every worker emits the same URL per key.
+        self.presign_window = int(os.getenv("AWS_S3_PRESIGN_WINDOW", 0))
         self.s3_client = boto3.client(
             "s3",
             region_name=self.region,
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "test-key"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "test-secret"),
+            aws_access_key_id=self.access_key,
+            aws_secret_access_key=self.secret_key,
         )
 
     def generate_upload_url(self, filename: str, content_type: str = "image/jpeg") -> dict:
@@ -24,7 +42,7 @@ class S3Service:
         Generate a presigned PUT URL for direct upload to S3.
         Returns both the upload URL and the key (used to retrieve later).
         """
-        key = f"artworks/{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}_{filename}"
+        key = self._new_upload_key(filename)
         try:
             presigned_url = self.s3_client.generate_presigned_url(
                 "put_object",
@@ -43,6 +61,220 @@ class S3Service:
         
         return {"upload_url": presigned_url, "key": key, "final_url": final_url}
 
+    @staticmethod
+    def _new_upload_key(filename: str) -> str:
+        return f"artworks/{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}_{filename}"
+
+    @staticmethod
+    def _check_upload_key(key: str) -> None:
+        if not key or not key.startswith("artworks/"):
+            raise ValidationError("Invalid upload key.")
+
+    # ─── Multipart uploads ──────────────────────────────────────────────────────
+    def create_multipart_upload(self, filename: str, content_type: str = "image/jpeg") -> dict:
+        """Start a multipart upload for a large original. Returns the upload id and key."""
+        key = self._new_upload_key(filename)
+        try:
+            response = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket, Key=key, ContentType=content_type
+            )
+        except ClientError as e:
+            raise RuntimeError(f"Failed to start multipart upload: {e}")
+        return {"upload_id": response["UploadId"], "key": key}
+
+    def generate_part_upload_urls(self, key: str, upload_id: str, part_numbers: list,
+                                  expires_in: int = 3600) -> list:
+        """Presign one PUT URL per requested part number, in a single call."""
+        self._check_upload_key(key)
+        if not part_numbers:
+            raise ValidationError("At least one part number is required.")
+        if len(part_numbers) > MAX_PART_URLS_PER_CALL:
+            raise ValidationError(f"At most {MAX_PART_URLS_PER_CALL} part URLs per request.")
+        # bool is an int subclass; True would otherwise be accepted as part 1
+        if any(not isinstance(n, int) or isinstance(n, bool) or n < 1 or n > MAX_PART_NUMBER
+               for n in part_numbers):
+            raise ValidationError(f"Part numbers must be integers between 1 and {MAX_PART_NUMBER}.")
+
+        urls = []
+        try:
+            for part_number in part_numbers:
+                url = self.s3_client.generate_presigned_url(
+                    "upload_part",
+                    Params={
+                        "Bucket": self.bucket,
+                        "Key": key,
+                        "UploadId": upload_id,
+                        "PartNumber": part_number,
+                    },
+                    ExpiresIn=expires_in,
+                )
+                urls.append({"part_number": part_number, "url": url})
+        except ClientError as e:
+            raise RuntimeError(f"Failed to generate signed part URLs: {e}")
+        return urls
+
+    def list_uploaded_parts(self, key: str, upload_id: str) -> list:
+        """Parts S3 already has for this upload, so a client can resume where it stopped."""
+        self._check_upload_key(key)
+        parts = []
+        marker = 0
+        try:
+            while True:
+                response = self.s3_client.list_parts(
+                    Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumberMarker=marker
+                )
+                for part in response.get("Parts", []):
+                    parts.append({
+                        "part_number": part["PartNumber"],
+                        "etag": part["ETag"],
+                        "size": part.get("Size"),
+                    })
+                if not response.get("IsTruncated"):
+                    break
+                marker = response["NextPartNumberMarker"]
+        except ClientError as e:
+            raise RuntimeError(f"Failed to list uploaded parts: {e}")
+        return parts
+
+    def complete_multipart_upload(self, key: str, upload_id: str, parts: list) -> dict:
+        """Stitch the uploaded parts into the final object."""
+        self._check_upload_key(key)
+        if not parts:
+            raise ValidationError("At least one uploaded part is required.")
+        try:
+            ordered = sorted(
+                ({"PartNumber": int(p["part_number"]), "ETag": p["etag"]} for p in parts),
+                key=lambda p: p["PartNumber"],
+            )
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError("Each part needs a part_number and etag.")
+
+        try:
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                MultipartUpload={"Parts": ordered},
+            )
+        except ClientError as e:
+            raise RuntimeError(f"Failed to complete multipart upload: {e}")
+
+        final_url = self.generate_get_url(key, expires_in=86400)  # 24 hours
+        return {"key": key, "final_url": final_url}
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        """Discard an unfinished upload so S3 frees the stored parts."""
+        self._check_upload_key(key)
+        try:
+            self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+        except ClientError as e:
+            raise RuntimeError(f"Failed to abort multipart upload: {e}")
+
+    # ─── Content-addressed storage ─────────────────────────────────────────────
+    @staticmethod
+    def is_content_addressed(key: str) -> bool:
+        return bool(key) and key.startswith(CONTENT_ADDRESSED_PREFIX)
+
+    @staticmethod
+    def content_addressed_key(digest: str, source_key: str) -> str:
+        ext = os.path.splitext(source_key)[1].lower()
+        return f"{CONTENT_ADDRESSED_PREFIX}{digest}{ext}"
+
+    def hash_object(self, key: str) -> str:
+        """SHA-256 of an object, streamed in fixed-size chunks (constant memory)."""
+        digest = hashlib.sha256()
+        try:
+            body = self.s3_client.get_object(Bucket=self.bucket, Key=key)["Body"]
+            for chunk in iter(lambda: body.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        except ClientError as e:
+            raise RuntimeError(f"Failed to read object {key}: {e}")
+        return digest.hexdigest()
+
+    def object_exists(self, key: str) -> bool:
+        try:
+            self.s3_client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise RuntimeError(f"Failed to check object {key}: {e}")
+
+    def finalize_upload(self, key: str, delete_source: bool = True) -> dict:
+        """
+        Move a freshly uploaded object to its content-addressed key.
+        If identical bytes are already stored, the new upload is dropped and the
+        existing object is reused, so relistings and variants share one object
+        (and one cached signed URL). Callers that must record the result first
+        pass delete_source=False and call delete_object afterwards.
+        """
+        if self.is_content_addressed(key):
+            return {"key": key, "sha256": key[len(CONTENT_ADDRESSED_PREFIX):].split(".")[0],
+                    "deduplicated": False}
+        self._check_upload_key(key)
+
+        digest = self.hash_object(key)
+        target = self.content_addressed_key(digest, key)
+        deduplicated = self.object_exists(target)
+        try:
+            if not deduplicated:
+                # Managed copy: falls back to multipart copy for objects over 5 GB
+                self.s3_client.copy({"Bucket": self.bucket, "Key": key}, self.bucket, target)
+            if delete_source:
+                self.s3_client.delete_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            raise RuntimeError(f"Failed to finalize upload {key}: {e}")
+        return {"key": target, "sha256": digest, "deduplicated": deduplicated}
+
+    def delete_object(self, key: str) -> None:
+        try:
+            self.s3_client.delete_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            raise RuntimeError(f"Failed to delete object {key}: {e}")
+
+    def get_object_bytes(self, key: str) -> bytes:
+        """Download an object into memory (used for server-side image processing)."""
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+            return response["Body"].read()
+        except ClientError as e:
+            raise RuntimeError(f"Failed to download object {key}: {e}")
+
+    def open_object(self, key: str, byte_range: str | None = None,
+                    if_none_match: str | None = None) -> dict | None:
+        """
+        Start a streaming GET. Returns the raw get_object response (whose Body is
+        read incrementally by the caller). When S3 answers 304 to
+        `if_none_match` it returns {"NotModified": True, "ETag": ...} with the
+        object's own ETag. An unsatisfiable `byte_range` raises ValidationError.
+        """
+        params = {"Bucket": self.bucket, "Key": key}
+        if byte_range:
+            params["Range"] = byte_range
+        if if_none_match:
+            params["IfNoneMatch"] = if_none_match
+        try:
+            return self.s3_client.get_object(**params)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code == "304":
+                headers = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+                return {"NotModified": True, "ETag": headers.get("etag")}
+            if code == "InvalidRange":
+                raise ValidationError("Requested range not satisfiable.")
+            if code in ("404", "NoSuchKey", "NotFound"):
+                raise FileNotFoundError(key)
+            raise RuntimeError(f"Failed to read object {key}: {e}")
+
+    def put_object(self, key: str, body: bytes, content_type: str,
+                   cache_control: str | None = None) -> None:
+        """Upload an object generated on the server (e.g. an image derivative)."""
+        params = {"Bucket": self.bucket, "Key": key, "Body": body, "ContentType": content_type}
+        if cache_control:
+            params["CacheControl"] = cache_control
+        try:
+            self.s3_client.put_object(**params)
+        except ClientError as e:
+            raise RuntimeError(f"Failed to upload object {key}: {e}")
+
     def generate_get_url(self, key: str, expires_in: int = 3600) -> str:
         """
         Generate a presigned GET URL for temporary access to a private object.
@@ -52,7 +284,10 @@ class S3Service:
         cached_url = image_cache.get(key)
         if cached_url:
             return cached_url
-            
+
+        if self.presign_window > 0:
+            return self._generate_windowed_get_url(key, expires_in)
+
         # Generate new URL
         try:
             url = self.s3_client.generate_presigned_url(
@@ -65,4 +300,39 @@ class S3Service:
             
         # Cache the URL
         image_cache.set(key, url, expires_in)
-        return url
\ No newline at end of file
+        return url
+
+    def get_url_or_none(self, key: str | None, expires_in: int = 3600) -> str | None:
+        """generate_get_url for response bodies: a missing key or a signing error gives None."""
+        if not key:
+            return None
+        try:
+            return self.generate_get_url(key, expires_in=expires_in)
+        except Exception as e:
+            print(f"Failed to generate image URL: {e}")
+            return None
+
+    def _generate_windowed_get_url(self, key: str, expires_in: int) -> str:
+        """
+        Sign as of the start of the current window instead of "now".
+        Within a window every process produces a byte-identical URL for the same
+        key, so browsers and CDNs can cache the image. X-Amz-Expires runs from the
+        window start, so the URL still has at least `expires_in` seconds left
+        when it is handed out at the very end of the window.
+        """
+        now = time.time()
+        window_start = int(now // self.presign_window) * self.presign_window
+        window_end = window_start + self.presign_window
+        url = presign_get_url(
+            bucket=self.bucket,
+            key=key,
+            region=self.region,
+            access_key=self.access_key,
+            secret_key=self.secret_key,
+            signed_at=datetime.fromtimestamp(window_start, UTC),
+            expires_in=self.presign_window + expires_in,
+            session_token=self.session_token,
+        )
+        # Keep it cached only until the window rolls over
+        image_cache.set(key, url, int(window_end - now) + EXPIRY_BUFFER_SECONDS)
+        return url
@@ -0,0 +1,78 @@
+# app/user/services/s3_url_signer.py
+import hashlib
+import hmac
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import quote
+
+# SigV4 presigned URLs cannot be valid for longer than 7 days
+MAX_PRESIGN_EXPIRES = 7 * 24 * 3600
+
+
+def _quote(value: str, safe: str = "~") -> str:
+    return quote(value, safe=safe)
+
+
+@lru_cache(maxsize=64)
+def _signing_key(secret_key: str, datestamp: str, region: str) -> bytes:
+    """Derive the SigV4 signing key; it only changes per day/region, so cache it."""
+    k_date = hmac.new(f"AWS4{secret_key}".encode("utf-8"), datestamp.encode("utf-8"), hashlib.sha256).digest()
+    k_region = hmac.new(k_date, region.encode("utf-8"), hashlib.sha256).digest()
+    k_service = hmac.new(k_region, b"s3", hashlib.sha256).digest()
+    return hmac.new(k_service, b"aws4_request", hashlib.sha256).digest()
+
+
+def default_host(bucket: str, region: str) -> str:
+    if region == "us-east-1":
+        return f"{bucket}.s3.amazonaws.com"
+    return f"{bucket}.s3.{region}.amazonaws.com"
+
+
+def presign_get_url(bucket: str, key: str, region: str,
+                    access_key: str, secret_key: str,
+                    signed_at: datetime, expires_in: int,
+                    session_token: Optional[str] = None,
+                    host: Optional[str] = None) -> str:
+    """
+    Build a SigV4 query-string presigned GET URL for `key`, signed as of `signed_at`.
+
+    Unlike boto3, the signing time is an input rather than "now", so callers can
+    pin it to a time window and get byte-identical URLs from every process.
+    """
+    host = host or default_host(bucket, region)
+    expires_in = min(int(expires_in), MAX_PRESIGN_EXPIRES)
+    amz_date = signed_at.strftime("%Y%m%dT%H%M%SZ")
+    datestamp = amz_date[:8]
+    scope = f"{datestamp}/{region}/s3/aws4_request"
+
+    params = {
+        "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+        "X-Amz-Credential": f"{access_key}/{scope}",
+        "X-Amz-Date": amz_date,
+        "X-Amz-Expires": str(expires_in),
+        "X-Amz-SignedHeaders": "host",
+    }
+    if session_token:
+        params["X-Amz-Security-Token"] = session_token
+
+    canonical_uri = "/" + _quote(key, safe="/~")
+    canonical_query = "&".join(f"{_quote(k)}={_quote(v)}" for k, v in sorted(params.items()))
+    canonical_request = "\n".join([
+        "GET",
+        canonical_uri,
+        canonical_query,
+        f"host:{host}\n",
+        "host",
+        "UNSIGNED-PAYLOAD",
+    ])
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256",
+        amz_date,
+        scope,
+        hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+    ])
+    signature = hmac.new(_signing_key(secret_key, datestamp, region),
+                         string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    return f"https://{host}{canonical_uri}?{canonical_query}&X-Amz-Signature={signature}"
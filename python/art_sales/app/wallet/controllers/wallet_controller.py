@@ -4,6 +4,9 @@ from app.wallet.persistence.repository import WalletRepository
 from app.wallet.services.paystack_service import PaystackService
 from app.wallet.services.mock_paystack_service import MockPaystackService
 from app.shared.exceptions.custom_errors import ValidationError
+from app.wallet.domain.shapes import WALLET
+from app.shared.utilities.transactions import run_in_transaction
+from app.shared.jobs.webhook_events import accept_paystack_webhook, webhook_processor
 from typing import Any
 import os
 
@@ -14,6 +17,9 @@ use_mock_paystack: bool = False
 
 wallet_bp = Blueprint("wallet", __name__, url_prefix="/wallet")
 
+# Idempotency records from this webhook are kept apart from checkout's
+WEBHOOK_SOURCE = "paystack.wallet"
+
 
 def init_wallet_service() -> None:
     """Initialize the wallet service."""
@@ -27,6 +33,7 @@ def init_wallet_service() -> None:
         paystack_service = MockPaystackService()
     else:
         paystack_service = PaystackService()
+    webhook_processor.register(WEBHOOK_SOURCE, "charge.success", handle_charge_success)
 
 
 @wallet_bp.route("/balance", methods=["GET"])
@@ -41,11 +48,7 @@ def get_balance():
         if not wallet:
             return jsonify({"success": False, "message": "Wallet not found"}), 404
             
-        return jsonify({
-            "success": True,
-            "balance": wallet.balance,
-            "currency": wallet.currency
-        }), 200
+        return jsonify({"success": True, **WALLET.dump(wallet.to_dict())}), 200
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
@@ -147,43 +150,35 @@ def initialize_paystack_payment():
 
 @wallet_bp.route("/paystack/webhook", methods=["POST"])
 def paystack_webhook():
-    """Handle Paystack webhook for payment verification."""
+    """
+    Receive a Paystack webhook: check the signature, store the event and
+    acknowledge at once. The wallet is credited by webhook_processor.
+    """
     try:
-        # In a real implementation, you would verify the webhook signature
-        # For now, we'll just process the payload
-        payload = request.get_json()
-        
-        if not payload:
-            return jsonify({"success": False, "message": "Invalid payload"}), 400
-            
-        # Extract relevant data
-        event = payload.get("event")
-        data = payload.get("data", {})
-        
-        if event == "charge.success":
-            # Payment was successful
-            reference = data.get("reference")
-            amount = data.get("amount")  # in kobo
-            metadata = data.get("metadata", {})
-            user_id = metadata.get("user_id")
-            
-            if user_id and amount:
-                # Convert kobo to NGN
-                amount_ngn = amount / 100
-                
-                # Deposit funds into user's wallet
-                wallet = wallet_service.deposit(user_id, amount_ngn, reference)
-                
-                return jsonify({
-                    "success": True,
-                    "message": "Payment processed and wallet updated"
-                }), 200
-        
-        return jsonify({"success": True, "message": "Webhook received"}), 200
+        return accept_paystack_webhook(WEBHOOK_SOURCE)
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+def handle_charge_success(data: dict, done) -> None:
+    """Credit a wallet top-up; runs on a webhook worker, once per reference."""
+    reference = data.get("reference")
+    amount = data.get("amount")  # in kobo
+    user_id = (data.get("metadata") or {}).get("user_id")
+    if not (user_id and amount):
+        return
+
+    # Convert kobo to NGN
+    amount_ngn = amount / 100
+
+    def apply(session):
+        # Balance, transaction record and the processed marker commit together
+        wallet_service.deposit(user_id, amount_ngn, reference, session=session)
+        done(session)
+
+    run_in_transaction(apply)
+
+
 @wallet_bp.route("/paystack/verify/<reference>", methods=["POST"])
 def verify_paystack_payment(reference):
     """Verify a Paystack payment (for testing)."""
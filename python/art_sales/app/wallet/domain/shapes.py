@@ -0,0 +1,8 @@
+# app/wallet/domain/shapes.py
+from app.shared.utilities.serializer import Field, Serializer
+
+WALLET = Serializer("wallet", [
+    Field("balance"),
+    Field("currency"),
+    Field("updated_at"),
+])
@@ -1,7 +1,7 @@
 from typing import Optional
 from bson import ObjectId
 from app.extensions import mongo
-from app.wallet.domain.models import Wallet, WalletTransaction
+from app.wallet.domain.models import Wallet, WalletTransaction, TransactionStatus, TransactionType
 import os
 
 
@@ -10,6 +10,8 @@ class WalletRepository:
     
     COLLECTION_NAME = "wallets"
     TRANSACTION_COLLECTION_NAME = "wallet_transactions"
+    # Full names of transaction collections whose indexes exist (one per DB, e.g. tests)
+    _indexed = set()
 
     @staticmethod
     def _get_collection():
@@ -21,11 +23,18 @@ class WalletRepository:
     def _get_transaction_collection():
         """Get the wallet transactions collection."""
         db_name = os.getenv("DB_NAME", "art_sales_db")
-        return mongo.cx[db_name][WalletRepository.TRANSACTION_COLLECTION_NAME]
+        col = mongo.cx[db_name][WalletRepository.TRANSACTION_COLLECTION_NAME]
+        if col.full_name not in WalletRepository._indexed:
+            # One deposit per payment reference, even when the writes run without a transaction
+            col.create_index([("transaction_type", 1), ("reference", 1)], unique=True,
+                             partialFilterExpression={"transaction_type": TransactionType.DEPOSIT.value,
+                                                      "reference": {"$gt": ""}})
+            WalletRepository._indexed.add(col.full_name)
+        return col
 
-    def find_by_user_id(self, user_id: str) -> Optional[Wallet]:
+    def find_by_user_id(self, user_id: str, session=None) -> Optional[Wallet]:
         """Find wallet by user ID."""
-        data = self._get_collection().find_one({"user_id": user_id})
+        data = self._get_collection().find_one({"user_id": user_id}, session=session)
         return Wallet.from_dict(data) if data else None
 
     def find_by_id(self, wallet_id: str) -> Optional[Wallet]:
@@ -33,20 +42,21 @@ class WalletRepository:
         data = self._get_collection().find_one({"_id": ObjectId(wallet_id)})
         return Wallet.from_dict(data) if data else None
 
-    def create(self, wallet: Wallet) -> str:
+    def create(self, wallet: Wallet, session=None) -> str:
         """Create a new wallet."""
         data = wallet.to_dict()
-        result = self._get_collection().insert_one(data)
+        result = self._get_collection().insert_one(data, session=session)
         return str(result.inserted_id)
 
-    def update(self, wallet: Wallet) -> bool:
+    def update(self, wallet: Wallet, session=None) -> bool:
         """Update an existing wallet."""
         if not wallet._id:
             return False
         data = wallet.to_dict()
         result = self._get_collection().update_one(
             {"_id": wallet._id}, 
-            {"$set": data}
+            {"$set": data},
+            session=session,
         )
         return result.modified_count > 0
 
@@ -56,12 +66,23 @@ class WalletRepository:
         return result.deleted_count > 0
 
     # Transaction methods
-    def create_transaction(self, transaction: WalletTransaction) -> str:
+    def create_transaction(self, transaction: WalletTransaction, session=None) -> str:
         """Create a new wallet transaction."""
         data = transaction.to_dict()
-        result = self._get_transaction_collection().insert_one(data)
+        result = self._get_transaction_collection().insert_one(data, session=session)
         return str(result.inserted_id)
 
+    def find_deposit_by_reference(self, reference: str, session=None) -> Optional[WalletTransaction]:
+        """The deposit recorded for this payment reference, if any."""
+        data = self._get_transaction_collection().find_one(
+            {"transaction_type": TransactionType.DEPOSIT.value, "reference": reference}, session=session)
+        return WalletTransaction.from_dict(data) if data else None
+
+    def set_transaction_status(self, transaction_id: str, status: TransactionStatus, session=None) -> bool:
+        result = self._get_transaction_collection().update_one(
+            {"_id": ObjectId(transaction_id)}, {"$set": {"status": status.value}}, session=session)
+        return result.modified_count > 0
+
     def update_transaction(self, transaction: WalletTransaction) -> bool:
         """Update an existing wallet transaction."""
         if not transaction._id:
@@ -0,0 +1,172 @@
+import asyncio
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+from app.shared.exceptions.custom_errors import ValidationError
+from app.wallet.services.paystack_service import PAYSTACK_BASE_URL
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class AsyncPaystackService:
+    """
+    PaystackService's calls as coroutines over one pooled httpx.AsyncClient.
+
+    verify_many / transfer_many fan out with at most `max_concurrency` requests
+    in flight, so reconciling a backlog of references takes roughly
+    len / max_concurrency round trips instead of len. Retry rules match
+    PaystackService: connection failures for every call, 429/5xx only for GET.
+    Use as `async with AsyncPaystackService() as paystack:`, or through the
+    blocking verify_many / transfer_many helpers from sync code such as RQ jobs.
+    """
+
+    def __init__(self, secret_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_concurrency: Optional[int] = None, max_retries: Optional[int] = None,
+                 backoff_factor: Optional[float] = None, timeout: Optional[httpx.Timeout] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.secret_key = secret_key if secret_key is not None else os.getenv("PAYSTACK_SECRET_KEY", "")
+        self.base_url = (base_url or os.getenv("PAYSTACK_BASE_URL", PAYSTACK_BASE_URL)).rstrip("/")
+        self.max_concurrency = max_concurrency or int(os.getenv("PAYSTACK_MAX_CONCURRENCY", 10))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("PAYSTACK_MAX_RETRIES", 3))
+        self.backoff_factor = backoff_factor if backoff_factor is not None else float(
+            os.getenv("PAYSTACK_RETRY_BACKOFF", 0.3))
+        self.timeout = timeout or httpx.Timeout(float(os.getenv("PAYSTACK_READ_TIMEOUT", 10)),
+                                                connect=float(os.getenv("PAYSTACK_CONNECT_TIMEOUT", 3.05)))
+        self.headers = {
+            "Authorization": f"Bearer {self.secret_key}",
+            "Content-Type": "application/json"
+        }
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            transport = self._transport or httpx.AsyncHTTPTransport(retries=self.max_retries)
+            limits = httpx.Limits(max_connections=self.max_concurrency,
+                                  max_keepalive_connections=self.max_concurrency)
+            self._client = httpx.AsyncClient(base_url=self.base_url, headers=self.headers, timeout=self.timeout,
+                                             limits=limits, transport=transport)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncPaystackService":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def _request(self, method: str, path: str, action: str, payload: Dict = None) -> Dict[str, Any]:
+        if not self.secret_key:
+            raise ValidationError("Paystack secret key not configured")
+        client = self._get_client()
+        attempt = 0
+        try:
+            while True:
+                response = await client.request(method, path, json=payload)
+                if method != "GET" or response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    break
+                attempt += 1
+                await asyncio.sleep(self.backoff_factor * (2 ** (attempt - 1)))
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            raise ValidationError(f"Failed to {action}: {str(e)}")
+        except ValueError as e:
+            # e.g. an HTML error page from a proxy in front of the API
+            raise ValidationError(f"Failed to {action}: invalid JSON response ({e})")
+
+    async def initialize_transaction(self, email: str, amount: int, reference: str = None,
+                                     callback_url: str = None, metadata: Dict = None) -> Dict[str, Any]:
+        """Initialize a Paystack transaction."""
+        payload = {
+            "email": email,
+            "amount": amount,
+            "reference": reference,
+            "callback_url": callback_url,
+            "metadata": metadata or {}
+        }
+        payload = {k: v for k, v in payload.items() if v is not None}
+        return await self._request("POST", "/transaction/initialize", "initialize Paystack transaction", payload)
+
+    async def verify_transaction(self, reference: str) -> Dict[str, Any]:
+        """Verify a Paystack transaction."""
+        return await self._request("GET", f"/transaction/verify/{reference}", "verify Paystack transaction")
+
+    async def create_transfer_recipient(self, name: str, account_number: str, bank_code: str,
+                                        currency: str = "NGN") -> Dict[str, Any]:
+        """Create a transfer recipient."""
+        payload = {
+            "type": "nuban",
+            "name": name,
+            "account_number": account_number,
+            "bank_code": bank_code,
+            "currency": currency
+        }
+        return await self._request("POST", "/transferrecipient", "create transfer recipient", payload)
+
+    async def initiate_transfer(self, amount: int, recipient_code: str, reason: str = None,
+                                reference: str = None) -> Dict[str, Any]:
+        """Initiate a transfer."""
+        payload = {
+            "source": "balance",
+            "amount": amount,
+            "recipient": recipient_code,
+            "reason": reason,
+            "reference": reference
+        }
+        payload = {k: v for k, v in payload.items() if v is not None}
+        return await self._request("POST", "/transfer", "initiate transfer", payload)
+
+    async def _bounded(self, calls) -> List[Dict[str, Any]]:
+        """
+        Run zero-arg coroutine factories with at most max_concurrency in flight.
+        One failure does not sink the batch: it becomes a Paystack-style
+        {"status": False, "message": ...} entry in its slot.
+        """
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(call) -> Dict[str, Any]:
+            async with slots:
+                try:
+                    return await call()
+                except ValidationError as e:
+                    return {"status": False, "message": str(e)}
+
+        return await asyncio.gather(*(run(call) for call in calls))
+
+    async def verify_many(self, references: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Verify references concurrently; returns {reference: Paystack response}."""
+        references = list(dict.fromkeys(references))
+        results = await self._bounded([lambda r=r: self.verify_transaction(r) for r in references])
+        return dict(zip(references, results))
+
+    async def transfer_many(self, transfers: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Initiate transfers concurrently. Each item holds initiate_transfer's
+        keyword arguments; results come back in input order. Give every
+        transfer a reference so a failed batch can be retried without paying twice.
+        """
+        transfers = list(transfers)
+        return await self._bounded([lambda t=t: self.initiate_transfer(**t) for t in transfers])
+
+
+def verify_many(references: Iterable[str], **options) -> Dict[str, Dict[str, Any]]:
+    """Blocking AsyncPaystackService.verify_many for sync callers (RQ jobs, scripts)."""
+    async def run():
+        async with AsyncPaystackService(**options) as paystack:
+            return await paystack.verify_many(references)
+    return asyncio.run(run())
+
+
+def transfer_many(transfers: Iterable[Dict[str, Any]], **options) -> List[Dict[str, Any]]:
+    """Blocking AsyncPaystackService.transfer_many for sync callers (RQ jobs, scripts)."""
+    async def run():
+        async with AsyncPaystackService(**options) as paystack:
+            return await paystack.transfer_many(transfers)
+    return asyncio.run(run())
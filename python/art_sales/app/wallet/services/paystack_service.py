@@ -1,19 +1,70 @@
 import requests
 import os
-from typing import Dict, Any, Optional
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Optional, Tuple
 from app.shared.exceptions.custom_errors import ValidationError
 
+PAYSTACK_BASE_URL = "https://api.paystack.co"
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def build_session(pool_maxsize: Optional[int] = None, max_retries: Optional[int] = None,
+                  backoff_factor: Optional[float] = None) -> requests.Session:
+    """
+    A keep-alive session for the Paystack API.
+
+    Connections are reused across calls (and threads) instead of paying
+    DNS + TCP + TLS setup every time. Connection failures are retried for any
+    method, since the request never reached Paystack; 429/5xx answers and read
+    errors are retried only for GET, so a payment or transfer POST is never sent twice.
+    """
+    pool_maxsize = pool_maxsize or int(os.getenv("PAYSTACK_POOL_MAXSIZE", 20))
+    max_retries = max_retries if max_retries is not None else int(os.getenv("PAYSTACK_MAX_RETRIES", 3))
+    backoff_factor = backoff_factor if backoff_factor is not None else float(
+        os.getenv("PAYSTACK_RETRY_BACKOFF", 0.3))
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,  # hand the last response back so raise_for_status reports it
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """The process-wide Paystack session, created on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
 
 class PaystackService:
     """Service for Paystack payment integration."""
     
-    def __init__(self):
-        self.secret_key = os.getenv("PAYSTACK_SECRET_KEY", "")
-        self.base_url = "https://api.paystack.co"
+    def __init__(self, secret_key: Optional[str] = None, base_url: Optional[str] = None,
+                 session: Optional[requests.Session] = None, timeout: Optional[Tuple[float, float]] = None):
+        self.secret_key = secret_key if secret_key is not None else os.getenv("PAYSTACK_SECRET_KEY", "")
+        self.base_url = (base_url or os.getenv("PAYSTACK_BASE_URL", PAYSTACK_BASE_URL)).rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {self.secret_key}",
             "Content-Type": "application/json"
         }
+        self.session = session or get_session()
+        # (connect, read): a hung Paystack call must not hold a worker forever
+        self.timeout = timeout or (float(os.getenv("PAYSTACK_CONNECT_TIMEOUT", 3.05)),
+                                   float(os.getenv("PAYSTACK_READ_TIMEOUT", 10)))
 
     def initialize_transaction(self, email: str, amount: int, reference: str = None, 
                              callback_url: str = None, metadata: Dict = None) -> Dict[str, Any]:
@@ -33,10 +84,11 @@ class PaystackService:
         payload = {k: v for k, v in payload.items() if v is not None}
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/transaction/initialize",
                 headers=self.headers,
-                json=payload
+                json=payload,
+                timeout=self.timeout
             )
             response.raise_for_status()
             return response.json()
@@ -49,9 +101,10 @@ class PaystackService:
             raise ValidationError("Paystack secret key not configured")
             
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/transaction/verify/{reference}",
-                headers=self.headers
+                headers=self.headers,
+                timeout=self.timeout
             )
             response.raise_for_status()
             return response.json()
@@ -73,10 +126,11 @@ class PaystackService:
         }
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/transferrecipient",
                 headers=self.headers,
-                json=payload
+                json=payload,
+                timeout=self.timeout
             )
             response.raise_for_status()
             return response.json()
@@ -101,10 +155,11 @@ class PaystackService:
         payload = {k: v for k, v in payload.items() if v is not None}
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/transfer",
                 headers=self.headers,
-                json=payload
+                json=payload,
+                timeout=self.timeout
             )
             response.raise_for_status()
             return response.json()
@@ -1,6 +1,7 @@
 from typing import Optional
 from datetime import datetime, UTC
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from app.wallet.domain.models import Wallet, WalletTransaction, TransactionType, TransactionStatus
 from app.wallet.persistence.repository import WalletRepository
 from app.shared.exceptions.custom_errors import ValidationError
@@ -12,15 +13,15 @@ class WalletService:
     def __init__(self, wallet_repository: WalletRepository):
         self.wallet_repository = wallet_repository
 
-    def create_wallet(self, user_id: str) -> Wallet:
+    def create_wallet(self, user_id: str, session=None) -> Wallet:
         """Create a new wallet for a user."""
         # Check if wallet already exists
-        existing_wallet = self.wallet_repository.find_by_user_id(user_id)
+        existing_wallet = self.wallet_repository.find_by_user_id(user_id, session=session)
         if existing_wallet:
             return existing_wallet
             
         wallet = Wallet(user_id=user_id)
-        wallet_id = self.wallet_repository.create(wallet)
+        wallet_id = self.wallet_repository.create(wallet, session=session)
         wallet._id = ObjectId(wallet_id)
         return wallet
 
@@ -28,29 +29,45 @@ class WalletService:
         """Get wallet for a user."""
         return self.wallet_repository.find_by_user_id(user_id)
 
-    def deposit(self, user_id: str, amount: float, reference: str = "") -> Wallet:
-        """Deposit funds into user's wallet."""
+    def deposit(self, user_id: str, amount: float, reference: str = "", session=None) -> Wallet:
+        """
+        Deposit funds into user's wallet. Pass a session to make the balance
+        update and its transaction record part of one Mongo transaction.
+
+        A deposit with a reference is applied at most once, with or without a
+        transaction: the transaction record is claimed (unique per reference)
+        before the balance moves, and a repeat returns the wallet unchanged. A
+        record left pending means the process died before crediting; it is
+        never credited twice, but needs reconciling.
+        """
         if amount <= 0:
             raise ValidationError("Deposit amount must be positive")
             
-        wallet = self.get_wallet(user_id)
+        wallet = self.wallet_repository.find_by_user_id(user_id, session=session)
         if not wallet:
-            wallet = self.create_wallet(user_id)
-            
-        wallet.balance += amount
-        wallet.updated_at = datetime.now(UTC)
-        self.wallet_repository.update(wallet)
-        
+            wallet = self.create_wallet(user_id, session=session)
+        if reference and self.wallet_repository.find_deposit_by_reference(reference, session=session):
+            return wallet
+
         # Record transaction
         transaction = WalletTransaction(
             wallet_id=str(wallet._id),
             amount=amount,
             transaction_type=TransactionType.DEPOSIT,
-            status=TransactionStatus.COMPLETED,
+            status=TransactionStatus.PENDING,
             description=f"Deposit of {amount} NGN",
             reference=reference
         )
-        self.wallet_repository.create_transaction(transaction)
+        try:
+            transaction_id = self.wallet_repository.create_transaction(transaction, session=session)
+        except DuplicateKeyError:
+            # A concurrent delivery of the same payment got there first
+            return wallet
+
+        wallet.balance += amount
+        wallet.updated_at = datetime.now(UTC)
+        self.wallet_repository.update(wallet, session=session)
+        self.wallet_repository.set_transaction_status(transaction_id, TransactionStatus.COMPLETED, session=session)
         
         return wallet
 
@@ -0,0 +1,65 @@
+# benchmarks/bench_compression.py
+"""
+Bytes on the wire and CPU per request for a typical search page.
+
+Builds a 50-artwork search response (long descriptions, signed image URLs)
+and encodes it with every codec available in this environment at a few
+levels. Codecs whose library is missing (brotli, zstandard) are skipped.
+
+Run from python/art_sales:
+    python -m benchmarks.bench_compression
+"""
+import json
+import secrets
+import time
+
+from app.shared.utilities.compression import GzipCodec, BrotliCodec, ZstdCodec, brotli, zstandard
+
+
+def search_page(n: int = 50) -> bytes:
+    results = []
+    for i in range(n):
+        key = f"derived/thumbnail/artworks/sha256/{secrets.token_hex(32)}.webp"
+        results.append({
+            "artwork_id": secrets.token_hex(12),
+            "title": f"Untitled study no. {i}",
+            "description": "Layered oil and cold wax on birch panel, exploring the coastline at dusk. " * 6,
+            "price": 250.0 + i,
+            "medium": "oil",
+            "dimensions": "60x80cm",
+            "is_original": True,
+            "artist_id": "artist@example.com",
+            "s3_key": key,
+            "image_url": (f"https://art-bucket.s3.eu-west-2.amazonaws.com/{key}?X-Amz-Algorithm=AWS4-HMAC-SHA256"
+                          f"&X-Amz-Credential=AKIA{secrets.token_hex(8).upper()}%2F20261019%2Feu-west-2%2Fs3"
+                          f"%2Faws4_request&X-Amz-Date=20261019T130000Z&X-Amz-Expires=3600"
+                          f"&X-Amz-SignedHeaders=host&X-Amz-Signature={secrets.token_hex(32)}"),
+        })
+    return json.dumps({"success": True, "results": results}).encode("utf-8")
+
+
+def measure(codec, body: bytes, rounds: int = 200):
+    start = time.process_time()
+    for _ in range(rounds):
+        out = codec.compress(body)
+    return len(out), (time.process_time() - start) / rounds * 1e6
+
+
+def main():
+    body = search_page()
+    codecs = [GzipCodec(1), GzipCodec(6), GzipCodec(9)]
+    if brotli is not None:
+        codecs += [BrotliCodec(4), BrotliCodec(6)]
+    if zstandard is not None:
+        codecs += [ZstdCodec(1), ZstdCodec(3)]
+
+    print(f"identity: {len(body):,} bytes")
+    print(f"{'codec':>10} {'bytes':>10} {'ratio':>7} {'cpu us/request':>15}")
+    for codec in codecs:
+        size, cpu_us = measure(codec, body)
+        level = getattr(codec, "level", getattr(codec, "quality", ""))
+        print(f"{codec.name + '-' + str(level):>10} {size:>10,} {len(body) / size:>6.1f}x {cpu_us:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
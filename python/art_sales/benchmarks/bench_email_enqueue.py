@@ -0,0 +1,69 @@
+# benchmarks/bench_email_enqueue.py
+"""
+Enqueue cost for email jobs: a new Redis connection + Queue per job (the old
+enqueue_email_job), the shared pool with one round trip per job, and
+enqueue_many pipelining the whole batch.
+
+Needs a real Redis (default redis://localhost:6379/0, override with REDIS_URL),
+e.g. `docker run --rm -p 6379:6379 redis:7`. The benchmark flushes that DB.
+
+Run from python/art_sales:
+    python -m benchmarks.bench_email_enqueue
+"""
+import os
+import sys
+import time
+
+from redis import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rq import Queue
+
+from app.shared.jobs import email_jobs
+from app.shared.utilities.redis_client import init_redis
+
+JOB = "app.shared.jobs.email_jobs.send_verification_email"
+
+
+def redis_url() -> str:
+    url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    try:
+        Redis.from_url(url, socket_connect_timeout=0.5).ping()
+    except RedisConnectionError:
+        sys.exit(f"No Redis reachable at {url}; start one or set REDIS_URL.")
+    return url
+
+
+def timed(label: str, jobs: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>32}: {elapsed * 1e3:8.1f} ms total, {elapsed / jobs * 1e6:7.1f} us/job")
+
+
+def main(jobs: int = 500):
+    url = redis_url()
+    init_redis({"REDIS_URL": url})
+    email_jobs.get_queue().connection.flushdb()
+    args = [(f"user{i}@example.com", "https://example.com/verify") for i in range(jobs)]
+
+    def fresh_connection_per_job():
+        for a in args:
+            Queue("emails", connection=Redis.from_url(url)).enqueue(JOB, *a)
+
+    def pooled_one_by_one():
+        queue = email_jobs.get_queue()
+        for a in args:
+            queue.enqueue(JOB, *a)
+
+    def pipelined():
+        email_jobs.enqueue_many((JOB, a, None) for a in args)
+
+    print(f"Enqueueing {jobs} email jobs")
+    timed("new connection per job", jobs, fresh_connection_per_job)
+    timed("shared pool, one by one", jobs, pooled_one_by_one)
+    timed("shared pool, enqueue_many", jobs, pipelined)
+    email_jobs.get_queue().connection.flushdb()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_image_cache.py
+"""
+Contention benchmark for the signed-URL cache.
+
+Compares the sharded, lock-free-read ImageCacheService with the previous
+single-global-lock design under an increasing number of reader threads.
+
+Run from python/art_sales:
+    python -m benchmarks.bench_image_cache
+"""
+import threading
+import time
+from threading import Lock
+
+from app.user.services.image_cache_service import ImageCacheService
+
+
+class GlobalLockImageCache:
+    """The previous design: every get/set takes one process-wide lock."""
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = Lock()
+
+    def get(self, s3_key):
+        with self._lock:
+            entry = self._cache.get(s3_key)
+            if entry and time.time() < entry[1] - 60:
+                return entry[0]
+        return None
+
+    def set(self, s3_key, url, expires_in=3600):
+        with self._lock:
+            self._cache[s3_key] = (url, time.time() + expires_in)
+
+
+def run(cache, threads: int, duration: float = 1.0, keys: int = 500) -> float:
+    key_names = [f"artworks/{i}.jpg" for i in range(keys)]
+    for k in key_names:
+        cache.set(k, f"https://signed/{k}")
+
+    counts = [0] * threads
+    stop = threading.Event()
+    start = threading.Barrier(threads + 1)
+
+    def reader(idx):
+        n = 0
+        get = cache.get
+        start.wait()
+        while not stop.is_set():
+            for k in key_names:
+                get(k)
+            n += len(key_names)
+        counts[idx] = n
+
+    workers = [threading.Thread(target=reader, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    start.wait()
+    time.sleep(duration)
+    stop.set()
+    for w in workers:
+        w.join()
+    return sum(counts) / duration
+
+
+def main():
+    print(f"{'threads':>8} {'global lock ops/s':>20} {'sharded ops/s':>16} {'speedup':>8}")
+    for threads in (1, 2, 4, 8, 16, 32):
+        baseline = run(GlobalLockImageCache(), threads)
+        sharded = run(ImageCacheService(), threads)
+        print(f"{threads:>8} {baseline:>20,.0f} {sharded:>16,.0f} {sharded / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
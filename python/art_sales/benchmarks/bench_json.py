@@ -0,0 +1,63 @@
+# benchmarks/bench_json.py
+"""
+Serialization cost of list responses: Flask's default provider vs FastJSONProvider.
+
+Documents look like what the artwork/order endpoints return straight from
+Mongo (ObjectId, datetimes, nested variants, signed URL). The default provider
+needs ObjectIds converted by hand, so it gets a pre-converted copy; the fast
+provider encodes them itself.
+
+Run from python/art_sales:
+    python -m benchmarks.bench_json
+"""
+import time
+from datetime import datetime
+
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.shared.utilities.json_provider import FastJSONProvider
+
+
+def documents(n: int) -> list:
+    return [{
+        "_id": ObjectId(),
+        "artist_id": "artist@example.com",
+        "title": f"Study in blue no. {i}",
+        "description": "Oil and cold wax on birch panel. " * 8,
+        "price": 250.0 + i,
+        "variants": {"print_a3": {"price": 45.0, "stock": 20}, "print_a2": {"price": 70.0, "stock": 5}},
+        "created_at": datetime(2026, 10, 19, 13, 0, i % 60),
+        "updated_at": datetime(2026, 10, 19, 14, 0, i % 60),
+        "version": 3,
+        "image_url": f"https://art-bucket.s3.amazonaws.com/artworks/{i}.jpg?X-Amz-Signature={'a' * 64}",
+    } for i in range(n)]
+
+
+def per_call_us(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    app = Flask(__name__)
+    default, fast = DefaultJSONProvider(app), FastJSONProvider(app)
+    fast_iso = FastJSONProvider(Flask(__name__))
+    fast_iso.iso_datetimes = True
+
+    print(f"{'docs':>6} {'default us':>12} {'fast us':>10} {'fast+iso us':>12} {'speedup':>8}")
+    for n, rounds in ((50, 500), (500, 50)):
+        docs = documents(n)
+        converted = [{**d, "_id": str(d["_id"])} for d in docs]
+        payload = {"success": True, "artworks": docs}
+        base = per_call_us(lambda: default.dumps({"success": True, "artworks": converted}), rounds)
+        ours = per_call_us(lambda: fast.dumps(payload), rounds)
+        iso = per_call_us(lambda: fast_iso.dumps(payload), rounds)
+        print(f"{n:>6} {base:>12,.0f} {ours:>10,.0f} {iso:>12,.0f} {base / ours:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
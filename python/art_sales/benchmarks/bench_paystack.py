@@ -0,0 +1,65 @@
+# benchmarks/bench_paystack.py
+"""
+verify_transaction latency (p50/p99): bare requests.get per call (the old
+PaystackService) against the pooled keep-alive session, on a local Paystack
+stand-in server.
+
+Localhost plain HTTP has no DNS, no network RTT and no TLS, so this
+understates the gain: against api.paystack.co every new connection also pays
+DNS + TCP + TLS handshake round trips, which keep-alive skips entirely.
+
+Run from python/art_sales:
+    python -m benchmarks.bench_paystack
+"""
+import statistics
+import time
+
+import requests
+
+from app.wallet.services.paystack_service import PaystackService, build_session
+from tests.utils.local_paystack import LocalPaystack
+
+
+class _NewConnectionPerCall:
+    """Quacks like a Session but opens a fresh one per call, as bare requests.get does."""
+
+    def get(self, *args, **kwargs):
+        return requests.get(*args, **kwargs)
+
+    def post(self, *args, **kwargs):
+        return requests.post(*args, **kwargs)
+
+
+def measure(service: PaystackService, references) -> list:
+    latencies = []
+    for reference in references:
+        start = time.perf_counter()
+        service.verify_transaction(reference)
+        latencies.append((time.perf_counter() - start) * 1e3)
+    return latencies
+
+
+def main(calls: int = 2000):
+    server = LocalPaystack().start()
+    references = [f"bench_{i}" for i in range(calls)]
+    try:
+        setup = PaystackService(secret_key=server.secret_key, base_url=server.url, session=build_session())
+        for reference in references:
+            setup.initialize_transaction("buyer@example.com", 5000, reference=reference)
+
+        print(f"{calls} verify_transaction calls against a local Paystack stand-in")
+        for label, session in (("new connection per call", _NewConnectionPerCall()),
+                               ("pooled keep-alive session", build_session())):
+            service = PaystackService(secret_key=server.secret_key, base_url=server.url, session=session)
+            before = server.connections
+            latencies = sorted(measure(service, references))
+            p50 = statistics.median(latencies)
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            print(f"{label:>26}: p50 {p50:5.2f} ms  p99 {p99:5.2f} ms  "
+                  f"({server.connections - before} connections)")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
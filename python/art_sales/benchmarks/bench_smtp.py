@@ -0,0 +1,60 @@
+# benchmarks/bench_smtp.py
+"""
+SMTP throughput: a new connection per message (the old SMTPMailer), pooled
+sessions, and send_batch over one session, against a local aiosmtpd server.
+
+Localhost has no network latency and no TLS/AUTH, so this understates the
+gain: against a real provider every new connection also pays TCP + STARTTLS
++ AUTH round trips.
+
+Run from python/art_sales:
+    python -m benchmarks.bench_smtp
+"""
+import smtplib
+import time
+
+from app.shared.utilities.email_service import SMTPMailer
+from tests.utils.local_smtp import LocalSMTP
+
+
+def per_message_connection(server: LocalSMTP, emails) -> None:
+    mailer = SMTPMailer(smtp_host="127.0.0.1", smtp_port=server.port, from_addr="noreply@artsales.com",
+                        starttls=False)
+    for to, subject, body in emails:
+        with smtplib.SMTP(mailer.smtp_host, mailer.smtp_port) as smtp:
+            smtp.send_message(mailer._message(to, subject, body))
+
+
+def pooled(server: LocalSMTP, emails) -> None:
+    mailer = SMTPMailer(smtp_host="127.0.0.1", smtp_port=server.port, from_addr="noreply@artsales.com",
+                        starttls=False)
+    for email in emails:
+        mailer.send_email(*email)
+    mailer.close()
+
+
+def batched(server: LocalSMTP, emails) -> None:
+    mailer = SMTPMailer(smtp_host="127.0.0.1", smtp_port=server.port, from_addr="noreply@artsales.com",
+                        starttls=False)
+    mailer.send_batch(emails)
+    mailer.close()
+
+
+def main(messages: int = 300):
+    server = LocalSMTP().start()
+    emails = [(f"buyer{i}@example.com", "Order confirmed", "Thanks for your purchase.") for i in range(messages)]
+    try:
+        print(f"Sending {messages} messages to a local SMTP server")
+        for label, fn in (("new connection per message", per_message_connection),
+                          ("pooled sessions", pooled),
+                          ("send_batch", batched)):
+            start = time.perf_counter()
+            fn(server, emails)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>28}: {messages / elapsed:7.0f} msg/s ({elapsed / messages * 1e3:5.2f} ms/msg)")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
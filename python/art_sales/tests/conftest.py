@@ -5,6 +5,7 @@ from bson import ObjectId
 from flask import Flask
 from app.app_runner import create_app
 from app.extensions import mongo
+from app.auth.controllers.auth_controller import verification_service
 
 
 @pytest.fixture(scope="session")
@@ -38,9 +39,11 @@ def clear_test_db(app):
         db = mongo.cx[app.config["DB_NAME"]]
         for coll in db.list_collection_names():
             db[coll].delete_many({})
+        verification_service.verification_repo.clear()
         yield
         for coll in db.list_collection_names():
             db[coll].delete_many({})
+        verification_service.verification_repo.clear()
 
 
 @pytest.fixture(scope="function")
@@ -226,5 +229,8 @@ def mock_paystack(monkeypatch):
     print("DEBUG: Applying mock_paystack fixture")
     monkeypatch.setattr("requests.post", mock_post)
     monkeypatch.setattr("requests.get", mock_get)
+    # PaystackService goes through a pooled requests.Session
+    monkeypatch.setattr("requests.Session.post", lambda self, *args, **kwargs: mock_post(*args, **kwargs))
+    monkeypatch.setattr("requests.Session.get", lambda self, *args, **kwargs: mock_get(*args, **kwargs))
     print("DEBUG: mock_paystack fixture applied")
     return "mock_paystack_applied"
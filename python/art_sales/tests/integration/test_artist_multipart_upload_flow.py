@@ -0,0 +1,145 @@
+# tests/integration/test_artist_multipart_upload_flow.py
+import json
+import pytest
+from app.shared.utilities.token_manager import TokenManager
+
+
+class MultipartS3:
+    """Fake boto3 S3 client that tracks multipart uploads in memory."""
+
+    def __init__(self):
+        self.uploads = {}
+        self.completed = {}
+        self.aborted = []
+
+    def generate_presigned_url(self, operation_name, Params=None, ExpiresIn=None):
+        suffix = f"?partNumber={Params['PartNumber']}&uploadId={Params['UploadId']}" if "PartNumber" in Params else ""
+        return f"https://mock-s3.amazonaws.com/{Params['Bucket']}/{Params['Key']}{suffix}"
+
+    def create_multipart_upload(self, Bucket, Key, ContentType=None):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {"key": Key, "parts": {}}
+        return {"UploadId": upload_id, "Key": Key}
+
+    def list_parts(self, Bucket, Key, UploadId, PartNumberMarker=0):
+        parts = sorted(n for n in self.uploads[UploadId]["parts"] if n > PartNumberMarker)
+        page = parts[:2]  # small pages to exercise pagination
+        return {
+            "Parts": [{"PartNumber": n, "ETag": self.uploads[UploadId]["parts"][n], "Size": 5 * 1024 * 1024}
+                      for n in page],
+            "IsTruncated": len(parts) > 2,
+            "NextPartNumberMarker": page[-1] if page else 0,
+        }
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.completed[UploadId] = MultipartUpload["Parts"]
+        return {"Key": Key}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted.append(UploadId)
+
+
+@pytest.fixture()
+def multipart_s3(monkeypatch):
+    fake = MultipartS3()
+    monkeypatch.setattr("app.user.services.s3_service.boto3.client", lambda *_a, **_kw: fake)
+    return fake
+
+
+@pytest.fixture()
+def artist_jwt(app):
+    return f"Bearer {TokenManager.generate_access_token('artist@example.com', 'artist', app.config['SECRET_KEY'])}"
+
+
+def post_json(client, url, data, jwt):
+    return client.post(url, data=json.dumps(data),
+                       headers={"Content-Type": "application/json", "Authorization": jwt})
+
+
+def test_multipart_upload_with_resume(client, artist_jwt, multipart_s3):
+    start = post_json(client, "/api/artist/works/multipart",
+                      {"filename": "scan.tif", "content_type": "image/tiff"}, artist_jwt)
+    assert start.status_code == 201
+    upload_id = start.get_json()["upload_id"]
+    key = start.get_json()["key"]
+    assert key.startswith("artworks/")
+
+    urls = post_json(client, f"/api/artist/works/multipart/{upload_id}/part-urls",
+                     {"key": key, "part_count": 4}, artist_jwt)
+    assert urls.status_code == 200
+    parts = urls.get_json()["parts"]
+    assert [p["part_number"] for p in parts] == [1, 2, 3, 4]
+    assert all(f"uploadId={upload_id}" in p["url"] for p in parts)
+
+    # Client uploaded parts 1-3 before the connection dropped
+    for n in (1, 2, 3):
+        multipart_s3.uploads[upload_id]["parts"][n] = f'"etag-{n}"'
+
+    listed = client.get(f"/api/artist/works/multipart/{upload_id}/parts?key={key}",
+                        headers={"Authorization": artist_jwt})
+    assert listed.status_code == 200
+    assert [p["part_number"] for p in listed.get_json()["parts"]] == [1, 2, 3]
+
+    # Resume: only ask for the missing part
+    retry = post_json(client, f"/api/artist/works/multipart/{upload_id}/part-urls",
+                      {"key": key, "part_numbers": [4]}, artist_jwt)
+    assert [p["part_number"] for p in retry.get_json()["parts"]] == [4]
+    multipart_s3.uploads[upload_id]["parts"][4] = '"etag-4"'
+
+    done = post_json(client, f"/api/artist/works/multipart/{upload_id}/complete",
+                     {"key": key, "parts": [{"part_number": n, "etag": f'"etag-{n}"'} for n in (4, 2, 1, 3)]},
+                     artist_jwt)
+    assert done.status_code == 200
+    assert done.get_json()["key"] == key
+    assert [p["PartNumber"] for p in multipart_s3.completed[upload_id]] == [1, 2, 3, 4]
+
+
+def test_abort_multipart_upload(client, artist_jwt, multipart_s3):
+    start = post_json(client, "/api/artist/works/multipart", {"filename": "scan.tif"}, artist_jwt)
+    upload_id, key = start.get_json()["upload_id"], start.get_json()["key"]
+
+    resp = client.delete(f"/api/artist/works/multipart/{upload_id}?key={key}",
+                         headers={"Authorization": artist_jwt})
+    assert resp.status_code == 200
+    assert multipart_s3.aborted == [upload_id]
+
+
+def test_part_urls_reject_bad_input(client, artist_jwt, multipart_s3):
+    start = post_json(client, "/api/artist/works/multipart", {"filename": "scan.tif"}, artist_jwt)
+    upload_id, key = start.get_json()["upload_id"], start.get_json()["key"]
+
+    too_many = post_json(client, f"/api/artist/works/multipart/{upload_id}/part-urls",
+                         {"key": key, "part_count": 1001}, artist_jwt)
+    assert too_many.status_code == 400
+
+    foreign_key = post_json(client, f"/api/artist/works/multipart/{upload_id}/part-urls",
+                            {"key": "private/other.jpg", "part_count": 1}, artist_jwt)
+    assert foreign_key.status_code == 400
+
+    flags = post_json(client, f"/api/artist/works/multipart/{upload_id}/part-urls",
+                      {"key": key, "part_numbers": [True]}, artist_jwt)
+    assert flags.status_code == 400
+
+
+def test_artist_cannot_touch_another_artists_upload(client, app, artist_jwt, multipart_s3):
+    start = post_json(client, "/api/artist/works/multipart", {"filename": "scan.tif"}, artist_jwt)
+    upload_id, key = start.get_json()["upload_id"], start.get_json()["key"]
+    other = f"Bearer {TokenManager.generate_access_token('other@example.com', 'artist', app.config['SECRET_KEY'])}"
+    multipart_s3.uploads[upload_id]["parts"][1] = '"etag-1"'
+
+    urls = post_json(client, f"/api/artist/works/multipart/{upload_id}/part-urls",
+                     {"key": key, "part_count": 1}, other)
+    listed = client.get(f"/api/artist/works/multipart/{upload_id}/parts?key={key}",
+                        headers={"Authorization": other})
+    done = post_json(client, f"/api/artist/works/multipart/{upload_id}/complete",
+                     {"key": key, "parts": [{"part_number": 1, "etag": '"etag-1"'}]}, other)
+    aborted = client.delete(f"/api/artist/works/multipart/{upload_id}?key={key}",
+                            headers={"Authorization": other})
+
+    assert [r.status_code for r in (urls, listed, done, aborted)] == [404, 404, 404, 404]
+    assert multipart_s3.completed == {} and multipart_s3.aborted == []
+
+    # The key with a different upload id is not the caller's upload either
+    wrong_id = client.get(f"/api/artist/works/multipart/upload-999/parts?key={key}",
+                          headers={"Authorization": artist_jwt})
+    assert wrong_id.status_code == 404
@@ -67,3 +67,26 @@ def test_get_artwork_returns_signed_get_url(client, artist_jwt, clear_test_db):
     assert "image_url" in data
     assert data["image_url"].startswith("https://mock-s3.amazonaws.com/test-bucket/artworks/")
     # Note: The global mock doesn't include expires parameter in URL
+
+
+def test_artist_cannot_finalize_another_artists_upload(client, app, monkeypatch, clear_test_db):
+    """Finalizing deletes the source object, so only the artist it was issued to may do it."""
+    from tests.utils.local_s3 import LocalS3
+    s3 = LocalS3()
+    monkeypatch.setattr("app.user.services.s3_service.boto3.client", lambda *_a, **_kw: s3)
+    artist_a = f"Bearer {TokenManager.generate_access_token('a@example.com', 'artist', app.config['SECRET_KEY'])}"
+    artist_b = f"Bearer {TokenManager.generate_access_token('b@example.com', 'artist', app.config['SECRET_KEY'])}"
+
+    key = client.get("/api/artist/works/upload-url?filename=a.jpg",
+                     headers={"Authorization": artist_a}).get_json()["key"]
+    s3.objects[("test-bucket", key)] = {"Body": b"artist a's image"}
+
+    stolen = post_json(client, "/api/artist/works/upload-complete", {"key": key}, jwt=artist_b)
+    assert stolen.status_code == 400
+    assert ("test-bucket", key) in s3.objects
+
+    first = post_json(client, "/api/artist/works/upload-complete", {"key": key}, jwt=artist_a)
+    again = post_json(client, "/api/artist/works/upload-complete", {"key": key}, jwt=artist_a)
+    assert first.status_code == again.status_code == 200
+    assert again.get_json()["key"] == first.get_json()["key"]
+    assert ("test-bucket", key) not in s3.objects
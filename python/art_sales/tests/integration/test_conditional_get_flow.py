@@ -0,0 +1,97 @@
+# tests/integration/test_conditional_get_flow.py
+import json
+import pytest
+from app.shared.utilities.token_manager import TokenManager
+
+
+@pytest.fixture
+def artist_header(app):
+    token = TokenManager.generate_access_token("artist@example.com", "artist", app.config["SECRET_KEY"])
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def buyer_header(app):
+    token = TokenManager.generate_access_token("buyer@example.com", "buyer", app.config["SECRET_KEY"])
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_artwork(client, artist_header, title="Dawn"):
+    resp = client.post("/api/artist/works", data=json.dumps({"title": title, "price": 120.0}),
+                       headers={**artist_header, "Content-Type": "application/json"})
+    assert resp.status_code == 201
+    return resp.get_json()["artwork_id"]
+
+
+def test_view_artwork_revalidates_until_updated(client, artist_header):
+    artwork_id = _create_artwork(client, artist_header)
+
+    first = client.get(f"/api/buyer/artworks/{artwork_id}")
+    assert first.status_code == 200
+    assert first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+
+    repeat = client.get(f"/api/buyer/artworks/{artwork_id}", headers={"If-None-Match": first.headers["ETag"]})
+    assert repeat.status_code == 304
+    assert repeat.data == b""
+
+    client.put(f"/api/artist/works/{artwork_id}", data=json.dumps({"price": 150.0}),
+               headers={**artist_header, "Content-Type": "application/json"})
+
+    changed = client.get(f"/api/buyer/artworks/{artwork_id}", headers={"If-None-Match": first.headers["ETag"]})
+    assert changed.status_code == 200
+    assert changed.get_json()["artwork"]["price"] == 150.0
+    assert changed.get_json()["artwork"]["version"] == 2
+    assert changed.headers["ETag"] != first.headers["ETag"]
+
+
+def test_if_modified_since_on_view(client, artist_header):
+    artwork_id = _create_artwork(client, artist_header)
+    first = client.get(f"/api/buyer/artworks/{artwork_id}")
+
+    repeat = client.get(f"/api/buyer/artworks/{artwork_id}",
+                        headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert repeat.status_code == 304
+
+    old = client.get(f"/api/buyer/artworks/{artwork_id}",
+                     headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+    assert old.status_code == 200
+
+
+def test_artist_works_etag_tracks_membership(client, artist_header):
+    _create_artwork(client, artist_header, "One")
+    first = client.get("/api/artist/works", headers=artist_header)
+    etag = first.headers["ETag"]
+
+    assert client.get("/api/artist/works", headers={**artist_header, "If-None-Match": etag}).status_code == 304
+
+    _create_artwork(client, artist_header, "Two")
+    after = client.get("/api/artist/works", headers={**artist_header, "If-None-Match": etag})
+    assert after.status_code == 200
+    assert len(after.get_json()["artworks"]) == 2
+
+
+def test_search_returns_304_for_unchanged_page(client, artist_header, buyer_header):
+    _create_artwork(client, artist_header)
+    first = client.get("/api/buyer/search?min_price=100&max_price=300", headers=buyer_header)
+    assert first.status_code == 200
+
+    repeat = client.get("/api/buyer/search?min_price=100&max_price=300",
+                        headers={**buyer_header, "If-None-Match": first.headers["ETag"]})
+    assert repeat.status_code == 304
+
+
+def test_artist_works_ignores_if_modified_since_after_delete(client, artist_header):
+    _create_artwork(client, artist_header, "Old")
+    newest = _create_artwork(client, artist_header, "New")
+    first = client.get("/api/artist/works", headers=artist_header)
+    assert "Last-Modified" not in first.headers
+
+    # Deleting the older work leaves the page's newest updated_at unchanged
+    older = [w["artwork_id"] for w in first.get_json()["artworks"] if w["artwork_id"] != newest][0]
+    client.delete(f"/api/artist/works/{older}", headers=artist_header)
+
+    after = client.get("/api/artist/works",
+                       headers={**artist_header, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert after.status_code == 200
+    assert len(after.get_json()["artworks"]) == 1
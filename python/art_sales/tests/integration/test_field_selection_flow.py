@@ -0,0 +1,70 @@
+# tests/integration/test_field_selection_flow.py
+import json
+import pytest
+from app.shared.utilities.token_manager import TokenManager
+
+
+@pytest.fixture
+def artist_header(app):
+    token = TokenManager.generate_access_token("artist@example.com", "artist", app.config["SECRET_KEY"])
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def buyer_header(app):
+    token = TokenManager.generate_access_token("buyer@example.com", "buyer", app.config["SECRET_KEY"])
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def artwork_id(client, artist_header):
+    resp = client.post("/api/artist/works",
+                       data=json.dumps({"title": "Dawn", "price": 120.0, "description": "long " * 100,
+                                        "s3_key": "artworks/dawn.jpg"}),
+                       headers={**artist_header, "Content-Type": "application/json"})
+    return resp.get_json()["artwork_id"]
+
+
+def test_works_list_returns_only_requested_fields(client, artist_header, artwork_id):
+    resp = client.get("/api/artist/works?fields=artwork_id,title,price,image_url", headers=artist_header)
+    assert resp.status_code == 200
+    art = resp.get_json()["artworks"][0]
+    assert set(art) == {"artwork_id", "title", "price", "image_url"}
+
+
+def test_selection_changes_etag(client, artist_header, artwork_id):
+    full = client.get("/api/artist/works", headers=artist_header)
+    slim = client.get("/api/artist/works?fields=artwork_id,title",
+                      headers={**artist_header, "If-None-Match": full.headers["ETag"]})
+    assert slim.status_code == 200
+    assert slim.headers["ETag"] != full.headers["ETag"]
+
+
+def test_detail_and_search_accept_fields(client, buyer_header, artwork_id):
+    detail = client.get(f"/api/buyer/artworks/{artwork_id}?fields=title,description")
+    assert detail.get_json()["artwork"] == {"title": "Dawn", "description": "long " * 100}
+
+    search = client.get("/api/buyer/search?fields=artwork_id,price", headers=buyer_header)
+    assert search.get_json()["results"] == [{"artwork_id": artwork_id, "price": 120.0}]
+
+
+def test_unselected_image_urls_are_not_signed(client, artist_header, buyer_header, artwork_id, monkeypatch):
+    from app.user.services.s3_service import S3Service
+
+    signed = []
+    monkeypatch.setattr(S3Service, "generate_get_url", lambda self, key, expires_in=3600: signed.append(key) or key)
+
+    for resp in (client.get("/api/artist/works?fields=title,price", headers=artist_header),
+                 client.get("/api/buyer/search?fields=title,price", headers=buyer_header),
+                 client.get(f"/api/buyer/artworks/{artwork_id}?fields=title,price")):
+        assert resp.status_code == 200
+    assert signed == []
+
+    client.get("/api/buyer/search?fields=title,image_url", headers=buyer_header)
+    assert signed
+
+
+def test_unknown_fields_are_rejected(client, artist_header, buyer_header, artwork_id):
+    assert client.get("/api/artist/works?fields=title,shipping", headers=artist_header).status_code == 400
+    assert client.get("/api/buyer/search?fields=cart_id", headers=buyer_header).status_code == 400
+    assert client.get("/api/buyer/orders?fields=password", headers=buyer_header).status_code == 400
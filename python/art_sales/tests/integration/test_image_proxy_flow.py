@@ -0,0 +1,92 @@
+# tests/integration/test_image_proxy_flow.py
+import hashlib
+import pytest
+from tests.utils.local_s3 import LocalS3
+
+IMAGE = bytes(range(256)) * 1024  # 256 KB, several proxy chunks
+DIGEST = hashlib.sha256(IMAGE).hexdigest()
+HASH_KEY = f"artworks/sha256/{DIGEST}.jpg"
+
+
+@pytest.fixture()
+def local_s3(monkeypatch):
+    fake = LocalS3()
+    monkeypatch.setattr("app.user.services.s3_service.boto3.client", lambda *_a, **_kw: fake)
+    for key in (HASH_KEY, "artworks/20250101_plain.jpg", "derived/thumbnail/artworks/20250101_plain.jpg.webp"):
+        fake.objects[("test-bucket", key)] = {"Body": IMAGE, "ContentType": "image/jpeg"}
+    return fake
+
+
+def test_streams_full_object_with_immutable_caching(client, local_s3):
+    resp = client.get(f"/api/images/{HASH_KEY}")
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    assert resp.data == IMAGE
+    assert resp.headers["Content-Length"] == str(len(IMAGE))
+    assert resp.headers["ETag"] == f'"{DIGEST}"'
+    assert "immutable" in resp.headers["Cache-Control"]
+    assert resp.headers["Accept-Ranges"] == "bytes"
+
+
+def test_if_none_match_on_immutable_key_skips_s3(client, local_s3):
+    resp = client.get(f"/api/images/{HASH_KEY}", headers={"If-None-Match": f'"{DIGEST}"'})
+    assert resp.status_code == 304
+    assert resp.data == b""
+    assert local_s3.get_calls == []
+
+
+def test_range_request_returns_partial_content(client, local_s3):
+    resp = client.get(f"/api/images/{HASH_KEY}", headers={"Range": "bytes=100-199"})
+    assert resp.status_code == 206
+    assert resp.data == IMAGE[100:200]
+    assert resp.headers["Content-Range"] == f"bytes 100-199/{len(IMAGE)}"
+
+    stale = client.get(f"/api/images/{HASH_KEY}", headers={"Range": "bytes=100-199", "If-Range": '"other"'})
+    assert stale.status_code == 200
+    assert stale.data == IMAGE
+
+    beyond = client.get(f"/api/images/{HASH_KEY}", headers={"Range": f"bytes={len(IMAGE)}-"})
+    assert beyond.status_code == 416
+
+
+def test_mutable_key_revalidates_against_s3(client, local_s3):
+    first = client.get("/api/images/artworks/20250101_plain.jpg")
+    assert first.status_code == 200
+    assert "immutable" not in first.headers["Cache-Control"]
+
+    again = client.get("/api/images/artworks/20250101_plain.jpg",
+                       headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+def test_if_none_match_star_or_several_tags_answers_with_the_objects_etag(client, local_s3):
+    etag = client.get("/api/images/artworks/20250101_plain.jpg").headers["ETag"]
+
+    star = client.get("/api/images/artworks/20250101_plain.jpg", headers={"If-None-Match": "*"})
+    several = client.get("/api/images/artworks/20250101_plain.jpg",
+                         headers={"If-None-Match": f'"stale", {etag}, "other"'})
+
+    assert star.status_code == 304
+    assert star.headers["ETag"] == etag
+    assert several.status_code == 304
+    assert several.headers["ETag"] == etag
+
+
+def test_derivative_is_validated_against_its_stored_bytes(client, local_s3):
+    key = "derived/thumbnail/artworks/20250101_plain.jpg.webp"
+    first = client.get(f"/api/images/{key}")
+    assert first.status_code == 200
+    assert "immutable" in first.headers["Cache-Control"]
+    assert client.get(f"/api/images/{key}", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    # Re-rendered under the same key: the old ETag no longer matches
+    local_s3.objects[("test-bucket", key)] = {"Body": IMAGE[::-1], "ContentType": "image/webp"}
+    rerendered = client.get(f"/api/images/{key}", headers={"If-None-Match": first.headers["ETag"]})
+    assert rerendered.status_code == 200
+    assert rerendered.headers["ETag"] != first.headers["ETag"]
+
+
+def test_rejects_keys_outside_image_prefixes(client, local_s3):
+    assert client.get("/api/images/private/secrets.txt").status_code == 404
+    assert client.get("/api/images/artworks/missing.jpg").status_code == 404
@@ -0,0 +1,158 @@
+import pytest
+from datetime import datetime, timedelta, UTC
+from app.shared.jobs.outbox import OutboxDispatcher, OutboxRepository
+from app.shared.utilities import transactions
+
+
+@pytest.fixture
+def ctx(app):
+    with app.app_context():
+        yield
+
+
+def make_dispatcher(**kwargs):
+    kwargs.setdefault("batch_size", 10)
+    kwargs.setdefault("backoff_base", 0)
+    return OutboxDispatcher(**kwargs)
+
+
+def test_drain_runs_handler_and_marks_rows_done(ctx):
+    seen = []
+    dispatcher = make_dispatcher()
+    dispatcher.register("email", seen.append)
+    OutboxRepository.add("email", {"to": "a@example.com"})
+    OutboxRepository.add("email", {"to": "b@example.com"})
+
+    assert dispatcher.drain() == 2
+    assert [p["to"] for p in seen] == ["a@example.com", "b@example.com"]
+    assert OutboxRepository.count("done") == 2
+    assert dispatcher.drain() == 0
+
+
+def test_claimed_row_is_invisible_to_other_dispatchers(ctx):
+    OutboxRepository.add("email", {"to": "a@example.com"})
+
+    first = OutboxRepository.claim("worker-1", lease_seconds=60)
+    second = OutboxRepository.claim("worker-2", lease_seconds=60)
+
+    assert first is not None and first["attempts"] == 1
+    assert second is None
+
+
+def test_expired_lease_is_reclaimed(ctx):
+    OutboxRepository.add("email", {"to": "a@example.com"})
+    row = OutboxRepository.claim("dead-worker", lease_seconds=60)
+    OutboxRepository._col().update_one(
+        {"_id": row["_id"]}, {"$set": {"lease_until": datetime.now(UTC) - timedelta(seconds=1)}})
+
+    again = OutboxRepository.claim("worker-2", lease_seconds=60)
+
+    assert again["_id"] == row["_id"]
+    assert again["owner"] == "worker-2"
+    assert again["attempts"] == 2
+    # The dead worker can no longer complete a row it lost
+    OutboxRepository.complete(row["_id"], "dead-worker")
+    assert OutboxRepository.count("done") == 0
+
+
+def test_failing_handler_is_retried_then_marked_failed(ctx):
+    calls = []
+
+    def flaky(payload):
+        calls.append(payload)
+        raise RuntimeError("smtp down")
+
+    dispatcher = make_dispatcher(max_attempts=3)
+    dispatcher.register("email", flaky)
+    OutboxRepository.add("email", {"to": "a@example.com"})
+
+    for _ in range(5):
+        dispatcher.run_once()
+
+    assert len(calls) == 3
+    assert OutboxRepository.count("failed") == 1
+    row = OutboxRepository._col().find_one({})
+    assert "smtp down" in row["last_error"]
+
+
+def test_failed_attempt_backs_off(ctx):
+    dispatcher = make_dispatcher(backoff_base=60)
+    dispatcher.register("email", lambda payload: 1 / 0)
+    OutboxRepository.add("email", {"to": "a@example.com"})
+
+    assert dispatcher.run_once() == 1
+    assert dispatcher.run_once() == 0  # not due again for a minute
+    assert OutboxRepository.count("pending") == 1
+
+
+def test_unknown_topic_is_not_lost(ctx):
+    dispatcher = make_dispatcher(max_attempts=1)
+    OutboxRepository.add("mystery", {})
+
+    dispatcher.run_once()
+
+    assert OutboxRepository.count("failed") == 1
+
+
+def test_run_in_transaction_falls_back_without_transaction_support(ctx, monkeypatch):
+    monkeypatch.setattr(transactions, "_supported", None)
+    sessions = []
+
+    result = transactions.run_in_transaction(lambda session: sessions.append(session) or "ok")
+
+    assert result == "ok"
+    assert sessions[-1] is None
+    with pytest.raises(ValueError):
+        transactions.run_in_transaction(lambda session: (_ for _ in ()).throw(ValueError("business rule")))
+
+
+def test_failed_digest_does_not_collide_with_a_newer_pending_one(ctx):
+    OutboxRepository.ensure_indexes()
+    due = datetime.now(UTC) - timedelta(seconds=1)
+    OutboxRepository.add_to_digest("email", "artist_sale:a@example.com", {"to": "a@example.com"},
+                                   "ref_1", [{"title": "Dawn"}], due)
+    sent = []
+
+    def deliver(payload):
+        if not sent:
+            # A payment lands while this digest is being sent, then the send fails
+            sent.append(None)
+            OutboxRepository.add_to_digest("email", "artist_sale:a@example.com", {"to": "a@example.com"},
+                                           "ref_2", [{"title": "Dusk"}], due)
+            raise ConnectionError("smtp down")
+        sent.append(payload["references"])
+
+    dispatcher = make_dispatcher()
+    dispatcher.register("email", deliver)
+    dispatcher.drain()
+
+    # Neither sale was lost: the retried digest and the new one both went out
+    assert sorted(sent[1:]) == [["ref_1"], ["ref_2"]]
+    assert OutboxRepository.count("done") == 2
+
+
+def test_add_with_dedupe_key_queues_once(ctx):
+    OutboxRepository.ensure_indexes()
+
+    first = OutboxRepository.add("email", {"to": "a@example.com"}, dedupe_key="order_confirmation:ref_1")
+    again = OutboxRepository.add("email", {"to": "a@example.com"}, dedupe_key="order_confirmation:ref_1")
+
+    assert first is not None and again is None
+    assert OutboxRepository.count("pending") == 1
+
+
+def test_digest_skips_a_reference_it_already_holds(ctx):
+    due = datetime.now(UTC) + timedelta(minutes=5)
+    OutboxRepository.add_to_digest("email", "artist_sale:a@example.com", {"to": "a@example.com"},
+                                   "ref_1", [{"title": "Dawn"}], due)
+    OutboxRepository.add_to_digest("email", "artist_sale:a@example.com", {"to": "a@example.com"},
+                                   "ref_1", [{"title": "Dawn"}], due)
+    row = OutboxRepository._col().find_one({"digest_of": "artist_sale:a@example.com"})
+    assert row["payload"]["items"] == [{"title": "Dawn"}]
+
+    # Still skipped once the digest has been claimed for sending
+    OutboxRepository._col().update_one({"_id": row["_id"]}, {"$set": {"available_at": datetime.now(UTC)}})
+    OutboxRepository.claim("worker-1", lease_seconds=60)
+    OutboxRepository.add_to_digest("email", "artist_sale:a@example.com", {"to": "a@example.com"},
+                                   "ref_1", [{"title": "Dawn"}], due)
+    assert OutboxRepository._col().count_documents({}) == 1
@@ -78,3 +78,15 @@ def test_ttl_and_unique_indexes_exist(app):
         email_index = next((idx for idx in indexes.values() if idx["key"][0][0] == "email"), None)
         assert email_index is not None, "Unique index on email missing"
         assert email_index.get("unique", False) is True
+
+
+def test_create_if_absent_keeps_existing_code(app):
+    """
+    Should insert on first call and return the stored record on later calls.
+    """
+    with app.app_context():
+        first = VerificationRepository.create_if_absent(Verification(email="dave@example.com", code="444444"))
+        second = VerificationRepository.create_if_absent(Verification(email="dave@example.com", code="555555"))
+
+        assert first["code"] == "444444"
+        assert second["code"] == "444444"
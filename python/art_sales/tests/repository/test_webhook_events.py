@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta, UTC
+
+import pytest
+
+from app.shared.jobs.webhook_events import LeaseLostError, WebhookEventRepository, WebhookProcessor
+
+
+@pytest.fixture
+def ctx(app):
+    with app.app_context():
+        yield
+
+
+def make_processor(**kwargs):
+    kwargs.setdefault("shards", 2)
+    kwargs.setdefault("backoff_base", 0)
+    return WebhookProcessor(**kwargs)
+
+
+def test_enqueue_rejects_repeat_deliveries(ctx):
+    assert WebhookEventRepository.enqueue("paystack.wallet", "charge.success", "ref_1", {}, shards=4) is not None
+    assert WebhookEventRepository.enqueue("paystack.wallet", "charge.success", "ref_1", {}, shards=4) is None
+    # The key includes source and event
+    assert WebhookEventRepository.enqueue("paystack.checkout", "charge.success", "ref_1", {}, shards=4) is not None
+    assert WebhookEventRepository.enqueue("paystack.wallet", "refund.processed", "ref_1", {}, shards=4) is not None
+
+
+def test_shard_is_stable_per_reference(ctx):
+    shards = {WebhookEventRepository.shard_for("ref_42", 8) for _ in range(5)}
+    assert len(shards) == 1
+    assert WebhookEventRepository.enqueue("s", "a", "ref_42", {}, shards=8) == shards.pop()
+
+
+def test_process_pending_runs_handlers_and_marks_events_done(ctx):
+    seen = []
+    processor = make_processor()
+    processor.register("paystack.wallet", "charge.success", lambda data, done: seen.append(data["n"]))
+    for n in range(4):
+        WebhookEventRepository.enqueue("paystack.wallet", "charge.success", f"ref_{n}", {"n": n}, shards=2)
+
+    assert processor.process_pending() == 4
+    assert sorted(seen) == [0, 1, 2, 3]
+    assert WebhookEventRepository.lag() == {"pending": 0, "processing": 0, "failed": 0,
+                                            "oldest_pending_seconds": 0.0}
+    assert processor.process_pending() == 0
+
+
+def test_events_for_one_reference_run_in_arrival_order(ctx):
+    seen = []
+    failures = {"charge.success": 1}
+
+    def handler(data, done):
+        if failures.get(data["event"]):
+            failures[data["event"]] -= 1
+            raise RuntimeError("transient")
+        seen.append(data["event"])
+
+    processor = make_processor()
+    for event in ("charge.success", "refund.processed"):
+        processor.register("paystack.checkout", event, handler)
+        WebhookEventRepository.enqueue("paystack.checkout", event, "ref_1", {"event": event}, shards=2)
+
+    processor.process_pending()
+
+    # The refund waited for the charge's retry instead of overtaking it
+    assert seen == ["charge.success", "refund.processed"]
+
+
+def test_later_event_is_deferred_while_an_earlier_one_is_backing_off(ctx):
+    processor = make_processor(backoff_base=60)
+    processor.register("paystack.checkout", "charge.success", lambda data, done: 1 / 0)
+    processor.register("paystack.checkout", "refund.processed", lambda data, done: None)
+    WebhookEventRepository.enqueue("paystack.checkout", "charge.success", "ref_1", {}, shards=2)
+    WebhookEventRepository.enqueue("paystack.checkout", "refund.processed", "ref_1", {}, shards=2)
+
+    processor.process_pending()
+
+    charge = WebhookEventRepository.find("paystack.checkout", "charge.success", "ref_1")
+    refund = WebhookEventRepository.find("paystack.checkout", "refund.processed", "ref_1")
+    assert charge["status"] == "pending" and charge["attempts"] == 1
+    assert refund["status"] == "pending" and refund["attempts"] == 0
+
+
+def test_failing_event_ends_up_failed_after_max_attempts(ctx):
+    processor = make_processor(max_attempts=2)
+    processor.register("paystack.wallet", "charge.success", lambda data, done: 1 / 0)
+    WebhookEventRepository.enqueue("paystack.wallet", "charge.success", "ref_bad", {}, shards=2)
+
+    processor.process_pending()
+
+    event = WebhookEventRepository.find("paystack.wallet", "charge.success", "ref_bad")
+    assert event["status"] == "failed" and event["attempts"] == 2
+    assert "ZeroDivisionError" in event["last_error"]
+    assert WebhookEventRepository.lag()["failed"] == 1
+
+
+def test_abandoned_lease_is_taken_over_and_the_old_worker_cannot_finish(ctx):
+    shard = WebhookEventRepository.enqueue("paystack.wallet", "charge.success", "ref_1", {}, shards=2)
+    stale = WebhookEventRepository.claim("worker-1", shard, lease_seconds=60)
+    assert WebhookEventRepository.claim("worker-2", shard, lease_seconds=60) is None
+
+    WebhookEventRepository._col().update_one(
+        {"_id": stale["_id"]}, {"$set": {"lease_until": datetime.now(UTC) - timedelta(seconds=1)}})
+    fresh = WebhookEventRepository.claim("worker-2", shard, lease_seconds=60)
+
+    assert fresh["attempts"] == 2
+    assert WebhookEventRepository.complete(stale) is False
+    with pytest.raises(LeaseLostError):
+        WebhookProcessor._mark_done(stale, None)
+    assert WebhookEventRepository.complete(fresh) is True
+
+
+def test_lag_reports_age_of_oldest_pending_event(ctx):
+    WebhookEventRepository.enqueue("paystack.wallet", "charge.success", "ref_old", {}, shards=2)
+    WebhookEventRepository._col().update_one(
+        {"reference": "ref_old"}, {"$set": {"received_at": datetime.now(UTC) - timedelta(seconds=30)}})
+    WebhookEventRepository.enqueue("paystack.wallet", "charge.success", "ref_new", {}, shards=2)
+
+    lag = WebhookEventRepository.lag()
+
+    assert lag["pending"] == 2
+    assert 30 <= lag["oldest_pending_seconds"] < 40
@@ -0,0 +1,126 @@
+# tests/unit/test_async_paystack_service.py
+import asyncio
+import time
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from app.shared.exceptions.custom_errors import ValidationError
+from app.wallet.services import async_paystack_service
+from app.wallet.services.async_paystack_service import AsyncPaystackService
+from tests.utils.local_paystack import LocalPaystack
+
+
+@pytest.fixture
+def paystack_server():
+    server = LocalPaystack().start()
+    yield server
+    server.stop()
+
+
+def options(server, **kwargs):
+    kwargs.setdefault("max_concurrency", 4)
+    kwargs.setdefault("backoff_factor", 0)
+    kwargs.setdefault("secret_key", server.secret_key)
+    return dict(base_url=server.url, **kwargs)
+
+
+def seed(server, references):
+    for reference in references:
+        server.service.initialize_transaction("buyer@example.com", 5000, reference=reference)
+
+
+def run(coro_fn, server, **kwargs):
+    async def main():
+        async with AsyncPaystackService(**options(server, **kwargs)) as paystack:
+            return await coro_fn(paystack)
+    return asyncio.run(main())
+
+
+def test_verify_many_runs_concurrently_within_the_limit(paystack_server):
+    references = [f"ref_{i}" for i in range(12)]
+    seed(paystack_server, references)
+    paystack_server.latency = 0.1
+
+    start = time.perf_counter()
+    results = run(lambda paystack: paystack.verify_many(references), paystack_server)
+    elapsed = time.perf_counter() - start
+
+    assert list(results) == references
+    assert all(r["data"]["status"] == "success" for r in results.values())
+    assert paystack_server.peak_in_flight == 4
+    # 12 calls at 100 ms each, four at a time: about three round trips, not twelve
+    assert elapsed < 0.8
+    assert paystack_server.connections <= 4
+
+
+def test_verify_many_isolates_failures(paystack_server):
+    seed(paystack_server, ["ref_ok"])
+
+    results = run(lambda paystack: paystack.verify_many(["ref_ok", "ref_missing", "ref_ok"]), paystack_server)
+
+    assert list(results) == ["ref_ok", "ref_missing"]
+    assert results["ref_ok"]["status"] is True
+    assert results["ref_missing"]["status"] is False
+    assert "400" in results["ref_missing"]["message"]
+
+
+def test_transfer_many_keeps_input_order(paystack_server):
+    recipient = paystack_server.service.create_transfer_recipient("Ada", "0123456789", "057")["data"]
+    transfers = [{"amount": 1000 * (i + 1), "recipient_code": recipient["recipient_code"],
+                  "reference": f"trf_{i}"} for i in range(6)]
+    transfers.append({"amount": 500, "recipient_code": "RCP_unknown", "reference": "trf_bad"})
+
+    results = run(lambda paystack: paystack.transfer_many(transfers), paystack_server)
+
+    assert [r["data"]["reference"] for r in results[:6]] == [f"trf_{i}" for i in range(6)]
+    assert [r["data"]["amount"] for r in results[:6]] == [1000 * (i + 1) for i in range(6)]
+    assert results[6]["status"] is False
+
+
+def test_get_retries_server_errors_but_post_does_not(paystack_server):
+    seed(paystack_server, ["ref_retry"])
+    paystack_server.fail_next(503, times=2)
+
+    result = run(lambda paystack: paystack.verify_transaction("ref_retry"), paystack_server, max_retries=2)
+    assert result["data"]["reference"] == "ref_retry"
+
+    paystack_server.requests.clear()
+    paystack_server.fail_next(503)
+    with pytest.raises(ValidationError, match="503"):
+        run(lambda paystack: paystack.initialize_transaction("buyer@example.com", 5000, reference="ref_post"),
+            paystack_server, max_retries=2)
+    assert paystack_server.requests == [("POST", "/transaction/initialize")]
+
+
+def test_blocking_helpers_for_sync_callers(paystack_server):
+    seed(paystack_server, ["ref_a", "ref_b"])
+
+    results = async_paystack_service.verify_many(["ref_a", "ref_b"], **options(paystack_server))
+
+    assert {ref: r["data"]["status"] for ref, r in results.items()} == {"ref_a": "success", "ref_b": "success"}
+
+
+def test_missing_secret_key_is_reported_per_reference(paystack_server):
+    results = async_paystack_service.verify_many(["ref_a"], **options(paystack_server, secret_key=""))
+
+    assert results == {"ref_a": {"status": False, "message": "Paystack secret key not configured"}}
+
+
+def test_non_json_reply_fails_only_that_reference():
+    def reply(request):
+        if request.url.path.endswith("/ref_html"):
+            return httpx.Response(200, text="<html>502 Bad Gateway</html>")
+        return httpx.Response(200, json={"status": True, "data": {"status": "success"}})
+
+    async def main():
+        async with AsyncPaystackService(secret_key="sk_test", base_url="http://paystack.test",
+                                        transport=httpx.MockTransport(reply)) as paystack:
+            return await paystack.verify_many(["ref_ok", "ref_html"])
+
+    results = asyncio.run(main())
+
+    assert results["ref_ok"]["status"] is True
+    assert results["ref_html"]["status"] is False
+    assert "invalid JSON" in results["ref_html"]["message"]
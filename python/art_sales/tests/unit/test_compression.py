@@ -0,0 +1,74 @@
+import gzip
+import json
+
+import pytest
+from flask import Flask, Response, jsonify
+
+from app.shared.utilities.compression import init_compression, available_codecs
+
+PAGE = {"results": [{"title": f"Artwork {i}", "description": "oil on canvas " * 20} for i in range(50)]}
+
+
+@pytest.fixture()
+def client():
+    app = Flask(__name__)
+    app.config.update(COMPRESS_MIN_SIZE=1024, COMPRESS_ALGORITHMS="gzip")
+    init_compression(app)
+
+    @app.route("/page")
+    def page():
+        resp = jsonify(PAGE)
+        resp.set_etag("v1")
+        return resp
+
+    @app.route("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route("/stream")
+    def stream():
+        return Response((json.dumps(row) + "\n" for row in PAGE["results"]), mimetype="text/plain")
+
+    @app.route("/image")
+    def image():
+        return Response(b"\xff" * 4096, mimetype="image/jpeg")
+
+    return app.test_client()
+
+
+def test_large_json_is_gzipped_with_weak_etag(client):
+    resp = client.get("/page", headers={"Accept-Encoding": "gzip, deflate"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert resp.headers["ETag"] == 'W/"v1"'
+    assert json.loads(gzip.decompress(resp.data)) == PAGE
+    assert int(resp.headers["Content-Length"]) == len(resp.data) < len(json.dumps(PAGE))
+
+
+def test_identity_when_client_does_not_accept_encoding(client):
+    resp = client.get("/page")
+    assert "Content-Encoding" not in resp.headers
+    assert resp.get_json() == PAGE
+    assert resp.headers["ETag"] == '"v1"'
+
+
+def test_small_and_binary_responses_are_not_compressed(client):
+    assert "Content-Encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    image = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in image.headers
+    assert "Vary" not in image.headers
+
+
+def test_streamed_response_is_compressed_incrementally(client):
+    resp = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert resp.is_streamed
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in resp.headers
+    lines = gzip.decompress(resp.data).decode().splitlines()
+    assert [json.loads(line) for line in lines] == PAGE["results"]
+
+
+def test_unavailable_codecs_are_skipped():
+    codecs = available_codecs({"COMPRESS_ALGORITHMS": "br,zstd,gzip"})
+    assert "gzip" in codecs
+    assert list(codecs)[-1] == "gzip"
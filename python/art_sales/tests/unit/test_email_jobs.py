@@ -0,0 +1,167 @@
+# tests/unit/test_email_jobs.py
+import pytest
+
+from app.shared.jobs import email_jobs
+from app.shared.utilities import redis_client
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    """Point the shared pool at an in-process fake Redis."""
+    server = fakeredis.FakeServer()
+    pool = fakeredis.FakeRedis(server=server).connection_pool
+    monkeypatch.setattr(redis_client, "_pool", pool)
+    monkeypatch.setattr(email_jobs, "_queues", {})
+    return pool
+
+
+def test_queues_are_cached_and_share_the_pool(fake_pool):
+    first = email_jobs.get_queue()
+    second = email_jobs.get_queue()
+
+    assert first is second
+    assert first.connection.connection_pool is fake_pool
+
+
+def test_queue_is_rebuilt_when_pool_changes(fake_pool, monkeypatch):
+    stale = email_jobs.get_queue()
+    monkeypatch.setattr(redis_client, "_pool", fakeredis.FakeRedis().connection_pool)
+
+    assert email_jobs.get_queue() is not stale
+
+
+def test_enqueue_many_uses_one_pipeline(fake_pool, monkeypatch):
+    calls = {"pipelines": 0}
+    queue = email_jobs.get_queue()
+    real_pipeline = queue.connection.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        calls["pipelines"] += 1
+        return real_pipeline(*args, **kwargs)
+
+    monkeypatch.setattr(queue.connection, "pipeline", counting_pipeline)
+    jobs = email_jobs.enqueue_many(
+        ("app.shared.jobs.email_jobs.send_verification_email", (f"user{i}@example.com", "link"), None)
+        for i in range(25))
+
+    assert len(jobs) == 25
+    assert queue.count == 25
+    assert calls["pipelines"] == 1
+    assert jobs[3].args == ("user3@example.com", "link")
+
+
+def test_enqueue_many_with_no_jobs_is_a_no_op(fake_pool):
+    assert email_jobs.enqueue_many([]) == []
+
+
+class RecordingMailer:
+    def __init__(self, fail_times: int = 0):
+        self.sent = []
+        self.fail_times = fail_times
+
+    def _record(self, entry):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionError("SMTP unavailable")
+        self.sent.append(entry)
+
+    def send_verification_email(self, recipient_email, verification_link):
+        self._record(("verification", recipient_email, verification_link))
+
+    def send_email(self, recipient_email, subject, body):
+        self._record((subject, recipient_email, body))
+
+
+def run_worker(pool):
+    from rq import SimpleWorker
+    queue = email_jobs.get_queue()
+    SimpleWorker([queue], connection=queue.connection).work(burst=True)
+
+
+def test_job_paths_resolve_to_this_module():
+    import importlib
+    for path in (email_jobs.VERIFICATION_JOB, email_jobs.ORDER_CONFIRMATION_JOB, email_jobs.ARTIST_SALE_JOB):
+        module, _, func = path.rpartition(".")
+        assert callable(getattr(importlib.import_module(module), func))
+
+
+def test_worker_sends_all_email_kinds_and_records_metrics(fake_pool, monkeypatch):
+    mailer = RecordingMailer()
+    monkeypatch.setattr(email_jobs, "_mailer", mailer)
+
+    email_jobs.enqueue_email_job("new@example.com", "https://example.com/verify")
+    email_jobs.enqueue_order_confirmation("buyer@example.com", "order_1")
+    email_jobs.enqueue_artist_sale("artist@example.com", "order_1")
+    run_worker(fake_pool)
+
+    assert [entry[:2] for entry in mailer.sent] == [
+        ("verification", "new@example.com"),
+        ("Order Confirmed", "buyer@example.com"),
+        ("New sale", "artist@example.com"),
+    ]
+    metrics = email_jobs.get_metrics()
+    assert metrics["send_verification_email"]["succeeded"] == 1
+    assert metrics["send_artist_sale_email"]["succeeded"] == 1
+
+
+def test_retry_policy_backs_off_exponentially(monkeypatch):
+    monkeypatch.setattr(email_jobs, "EMAIL_RETRY_MAX", 4)
+    monkeypatch.setattr(email_jobs, "EMAIL_RETRY_BASE_SECONDS", 10)
+
+    retry = email_jobs.retry_policy()
+
+    assert retry.max == 4
+    assert retry.intervals == [10, 20, 40, 80]
+
+
+def test_failed_job_is_retried_then_succeeds(fake_pool, monkeypatch):
+    monkeypatch.setattr(email_jobs, "EMAIL_RETRY_MAX", 3)
+    monkeypatch.setattr(email_jobs, "EMAIL_RETRY_BASE_SECONDS", 0)
+    mailer = RecordingMailer(fail_times=2)
+    monkeypatch.setattr(email_jobs, "_mailer", mailer)
+
+    email_jobs.enqueue_order_confirmation("buyer@example.com", "order_2")
+    run_worker(fake_pool)
+
+    assert len(mailer.sent) == 1
+    counters = email_jobs.get_metrics()["send_order_confirmation_email"]
+    assert counters["failed"] == 2
+    assert counters["retried"] == 2
+    assert counters["succeeded"] == 1
+    assert email_jobs.get_queue(email_jobs.DEAD_LETTER_QUEUE).count == 0
+
+
+def test_exhausted_job_is_dead_lettered_and_can_be_requeued(fake_pool, monkeypatch):
+    monkeypatch.setattr(email_jobs, "EMAIL_RETRY_MAX", 2)
+    monkeypatch.setattr(email_jobs, "EMAIL_RETRY_BASE_SECONDS", 0)
+    mailer = RecordingMailer(fail_times=3)
+    monkeypatch.setattr(email_jobs, "_mailer", mailer)
+
+    email_jobs.enqueue_artist_sale("artist@example.com", "order_3")
+    run_worker(fake_pool)
+
+    dead = email_jobs.get_queue(email_jobs.DEAD_LETTER_QUEUE)
+    assert dead.count == 1
+    dead_job = dead.get_jobs()[0]
+    assert dead_job.args == ("artist@example.com", "order_3")
+    assert "SMTP unavailable" in dead_job.meta["error"]
+    assert email_jobs.get_metrics()["send_artist_sale_email"]["dead_lettered"] == 1
+
+    assert email_jobs.requeue_dead_letters() == 1
+    run_worker(fake_pool)
+    assert mailer.sent == [("New sale", "artist@example.com", "A new order has been placed. Reference: order_3")]
+    assert dead.count == 0
+
+
+def test_notifier_enqueues_jobs_in_queue_mode(fake_pool):
+    from app.shared.jobs.notifications import NotificationDispatcher
+
+    notifier = NotificationDispatcher(use_queue=True)
+    notifier.deliver("order_confirmation", "buyer@example.com", "order_4")
+    notifier.deliver("artist_sale", "artist1@example.com", "order_4")
+
+    jobs = email_jobs.get_queue().get_jobs()
+    assert [job.func_name for job in jobs] == [email_jobs.ORDER_CONFIRMATION_JOB, email_jobs.ARTIST_SALE_JOB]
+    assert jobs[1].args == ("artist1@example.com", "order_4")
@@ -0,0 +1,136 @@
+import threading
+from unittest.mock import patch
+from app.user.services.image_cache_service import ImageCacheService
+from app.user.services.image_cache_tiers import InMemoryImageCacheTier, RedisImageCacheTier
+
+
+class FakeRedis:
+    """Minimal dict-backed stand-in for the redis client calls the tier uses."""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    def get(self, key):
+        value = self.store.get(key)
+        return value.encode("utf-8") if value is not None else None
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.ttls[key] = ex
+
+
+class TestImageCacheService:
+    """Test cases for the sharded ImageCacheService."""
+
+    def test_set_then_get_returns_url(self):
+        cache = ImageCacheService(shards=4)
+        cache.set("artworks/a.jpg", "https://signed/a", expires_in=3600)
+        assert cache.get("artworks/a.jpg") == "https://signed/a"
+
+    def test_miss_returns_none(self):
+        cache = ImageCacheService(shards=4)
+        assert cache.get("artworks/missing.jpg") is None
+
+    def test_entry_inside_expiry_buffer_is_evicted(self):
+        cache = ImageCacheService(shards=4)
+        with patch("app.user.services.image_cache_service.time.time", return_value=1000.0):
+            cache.set("artworks/a.jpg", "https://signed/a", expires_in=90)
+        # 40 seconds later only 50 seconds remain, which is inside the 60 second buffer
+        with patch("app.user.services.image_cache_service.time.time", return_value=1040.0):
+            assert cache.get("artworks/a.jpg") is None
+        assert len(cache) == 0
+
+    def test_keys_are_spread_over_shards(self):
+        cache = ImageCacheService(shards=8)
+        for i in range(200):
+            cache.set(f"artworks/{i}.jpg", f"https://signed/{i}")
+        used = [s for s in cache._shards if s.entries]
+        assert len(used) > 1
+        assert len(cache) == 200
+
+    def test_clear_empties_every_shard(self):
+        cache = ImageCacheService(shards=4)
+        for i in range(20):
+            cache.set(f"artworks/{i}.jpg", f"https://signed/{i}")
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_concurrent_readers_and_writers(self):
+        cache = ImageCacheService(shards=4)
+        keys = [f"artworks/{i}.jpg" for i in range(50)]
+        errors = []
+
+        def worker(offset):
+            try:
+                for n in range(500):
+                    key = keys[(n + offset) % len(keys)]
+                    if n % 10 == 0:
+                        cache.set(key, f"https://signed/{key}")
+                    url = cache.get(key)
+                    assert url is None or url == f"https://signed/{key}"
+            except AssertionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not errors
+
+
+class TestTwoTierImageCache:
+    """L1 bound and shared L2 behaviour."""
+
+    def test_l1_is_bounded(self):
+        cache = ImageCacheService(shards=1, max_entries=3)
+        for i in range(5):
+            cache.set(f"artworks/{i}.jpg", f"https://signed/{i}")
+        assert len(cache) == 3
+        # oldest entries were evicted first
+        assert cache.get("artworks/0.jpg") is None
+        assert cache.get("artworks/4.jpg") == "https://signed/4"
+
+    def test_workers_share_l2(self):
+        shared = InMemoryImageCacheTier()
+        worker_a = ImageCacheService(l2=shared)
+        worker_b = ImageCacheService(l2=shared)
+
+        worker_a.set("artworks/a.jpg", "https://signed/a", expires_in=3600)
+
+        assert worker_b.get("artworks/a.jpg") == "https://signed/a"
+        # the hit was promoted into worker B's L1
+        assert len(worker_b) == 1
+
+    def test_l2_hit_keeps_original_expiry(self):
+        shared = InMemoryImageCacheTier()
+        with patch("time.time", return_value=1000.0):
+            ImageCacheService(l2=shared).set("artworks/a.jpg", "https://signed/a", expires_in=120)
+        # a fresh worker 70 seconds later must not serve a URL with only 50 seconds left
+        with patch("time.time", return_value=1070.0):
+            assert ImageCacheService(l2=shared).get("artworks/a.jpg") is None
+
+    def test_l2_failure_falls_back_to_miss(self):
+        class BrokenTier:
+            def get(self, key):
+                raise ConnectionError("redis down")
+
+            def set(self, key, url, expiration_time):
+                raise ConnectionError("redis down")
+
+        cache = ImageCacheService(l2=BrokenTier())
+        cache.set("artworks/a.jpg", "https://signed/a")
+        assert cache.get("artworks/a.jpg") == "https://signed/a"
+        assert cache.get("artworks/b.jpg") is None
+
+    def test_redis_tier_ttl_matches_presign_expiry(self):
+        redis = FakeRedis()
+        tier = RedisImageCacheTier(redis)
+        cache = ImageCacheService(l2=tier)
+
+        cache.set("artworks/a.jpg", "https://signed/a?x=1|2", expires_in=3600)
+
+        key = RedisImageCacheTier.KEY_PREFIX + "artworks/a.jpg"
+        assert 3590 <= redis.ttls[key] <= 3600
+        assert ImageCacheService(l2=tier).get("artworks/a.jpg") == "https://signed/a?x=1|2"
@@ -0,0 +1,68 @@
+import io
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.user.services.s3_service import S3Service
+from app.user.services.image_derivative_service import (
+    ImageDerivativeService,
+    DERIVATIVE_SIZES,
+    derivative_key,
+    listing_image_key,
+)
+from tests.utils.local_s3 import LocalS3
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _jpeg(width, height) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 80, 40)).save(out, format="JPEG")
+    return out.getvalue()
+
+
+@pytest.fixture()
+def local_s3():
+    s3 = S3Service()
+    s3.s3_client = LocalS3()
+    return s3
+
+
+def test_process_stores_and_records_every_size(local_s3):
+    local_s3.s3_client.objects[(local_s3.bucket, "artworks/big.jpg")] = {"Body": _jpeg(4000, 2000)}
+    repo = MagicMock(name="ArtworkRepositoryMock")
+    service = ImageDerivativeService(s3_service=local_s3, artwork_repo=repo, max_workers=1)
+
+    keys = service.process("507f1f77bcf86cd799439011", "artworks/big.jpg")
+
+    assert set(keys) == set(DERIVATIVE_SIZES)
+    repo.set_derivatives.assert_called_once_with("507f1f77bcf86cd799439011", keys, s3_key="artworks/big.jpg")
+    for name, edge in DERIVATIVE_SIZES.items():
+        stored = local_s3.s3_client.objects[(local_s3.bucket, keys[name])]
+        assert stored["ContentType"] == "image/webp"
+        with Image.open(io.BytesIO(stored["Body"])) as img:
+            assert img.format == "WEBP"
+            assert max(img.size) == edge
+            assert img.size[0] == 2 * img.size[1]  # aspect ratio preserved
+
+
+def test_small_originals_are_not_upscaled(local_s3):
+    local_s3.s3_client.objects[(local_s3.bucket, "artworks/small.jpg")] = {"Body": _jpeg(200, 100)}
+    service = ImageDerivativeService(s3_service=local_s3, artwork_repo=MagicMock(), max_workers=1, fmt="jpeg")
+
+    keys = service.process("507f1f77bcf86cd799439011", "artworks/small.jpg")
+
+    stored = local_s3.s3_client.objects[(local_s3.bucket, keys["large"])]
+    assert keys["large"] == "derived/large/artworks/small.jpg.jpg"
+    with Image.open(io.BytesIO(stored["Body"])) as img:
+        assert img.size == (200, 100)
+
+
+def test_listing_prefers_thumbnail():
+    doc = {"s3_key": "artworks/a.jpg", "derivatives": {"thumbnail": derivative_key("artworks/a.jpg", "thumbnail")}}
+    assert listing_image_key(doc) == "derived/thumbnail/artworks/a.jpg.webp"
+    assert listing_image_key({"s3_key": "artworks/a.jpg", "derivatives": {}}) == "artworks/a.jpg"
+
+
+def test_derivative_keys_keep_the_original_extension():
+    assert derivative_key("artworks/x.jpg", "thumbnail") != derivative_key("artworks/x.png", "thumbnail")
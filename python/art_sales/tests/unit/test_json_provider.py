@@ -0,0 +1,66 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.shared.utilities import json_provider
+from app.shared.utilities.json_provider import FastJSONProvider
+from app.wallet.domain.models import TransactionType, TransactionStatus
+
+DOC = {
+    "_id": ObjectId("507f1f77bcf86cd799439011"),
+    "created_at": datetime(2026, 10, 19, 13, 5, 0),
+    "amount": Decimal128("1250.50"),
+    "fee": Decimal("2.5"),
+    "type": TransactionType.DEPOSIT,
+    "status": TransactionStatus.COMPLETED,
+    "tags": ["oil", "canvas"],
+}
+
+
+def _provider(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+    return FastJSONProvider(app)
+
+
+def test_encodes_mongo_and_enum_types():
+    out = json.loads(_provider().dumps(DOC))
+    assert out["_id"] == "507f1f77bcf86cd799439011"
+    assert out["amount"] == "1250.50"
+    assert out["fee"] == "2.5"
+    assert out["type"] == TransactionType.DEPOSIT.value
+    assert out["status"] == TransactionStatus.COMPLETED.value
+
+
+def test_default_output_matches_flask_provider():
+    plain = {k: v for k, v in DOC.items() if k in ("created_at", "tags")}
+    plain["z"], plain["a"] = 1, 2
+    app = Flask(__name__)
+    assert _provider().dumps(plain).replace(" ", "") == DefaultJSONProvider(app).dumps(plain).replace(" ", "")
+
+
+def test_iso_datetimes_are_utc():
+    out = json.loads(_provider(JSON_DATETIME_FORMAT="iso").dumps(DOC))
+    assert out["created_at"] == "2026-10-19T13:05:00+00:00"
+
+
+def test_response_and_loads_round_trip():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    with app.app_context():
+        resp = app.json.response({"artwork": DOC})
+    assert resp.mimetype == "application/json"
+    assert app.json.loads(resp.get_data())["artwork"]["_id"] == "507f1f77bcf86cd799439011"
+
+
+def test_falls_back_to_stdlib_without_orjson(monkeypatch):
+    monkeypatch.setattr(json_provider, "orjson", None)
+    out = json.loads(_provider().dumps(DOC))
+    assert out["_id"] == "507f1f77bcf86cd799439011"
+    assert out["created_at"] == "Mon, 19 Oct 2026 13:05:00 GMT"
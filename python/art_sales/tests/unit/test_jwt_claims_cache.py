@@ -0,0 +1,73 @@
+import time
+from unittest.mock import patch
+
+import jwt
+import pytest
+from flask import Flask, g, jsonify
+
+from app.shared.utilities import jwt_utils
+from app.shared.utilities.jwt_utils import ClaimsCache, claims_cache, token_required
+from app.shared.utilities.token_manager import TokenManager
+
+
+@pytest.fixture()
+def client():
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = "unit-secret"
+
+    @app.route("/me")
+    @token_required
+    def me():
+        return jsonify(g.user)
+
+    claims_cache.clear()
+    yield app.test_client()
+    claims_cache.clear()
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_repeat_requests_skip_signature_verification(client):
+    token = TokenManager.generate_access_token("artist@example.com", "artist", "unit-secret")
+    with patch.object(jwt_utils.jwt, "decode", wraps=jwt.decode) as decode:
+        for _ in range(5):
+            resp = client.get("/me", headers=_bearer(token))
+            assert resp.get_json() == {"user_id": "artist@example.com", "role": "artist"}
+    assert decode.call_count == 1
+
+
+def test_cached_entry_is_dropped_at_exp(client):
+    exp = int(time.time()) + 60
+    token = jwt.encode({"user_id": "u", "role": "buyer", "exp": exp}, "unit-secret")
+    assert client.get("/me", headers=_bearer(token)).status_code == 200
+
+    # Past exp the cache must not answer; the token goes back through jwt.decode
+    with patch("app.shared.utilities.jwt_utils.time.time", return_value=exp + 1), \
+            patch.object(jwt_utils.jwt, "decode", side_effect=jwt.ExpiredSignatureError) as decode:
+        resp = client.get("/me", headers=_bearer(token))
+    assert decode.call_count == 1
+    assert resp.status_code == 401
+    assert resp.get_json()["message"] == "Token expired"
+
+
+def test_invalid_tokens_are_not_cached(client):
+    forged = jwt.encode({"user_id": "u", "role": "artist", "exp": int(time.time()) + 60}, "other-secret")
+    assert client.get("/me", headers=_bearer(forged)).status_code == 401
+    assert len(claims_cache) == 0
+
+
+def test_cache_is_bounded_lru():
+    cache = ClaimsCache(max_size=2)
+    exp = time.time() + 60
+    for name in ("a", "b"):
+        cache.put(name.encode(), {"user_id": name}, exp)
+    cache.get(b"a")  # a becomes most recent
+    cache.put(b"c", {"user_id": "c"}, exp)
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == {"user_id": "a"}
+
+
+def test_key_depends_on_secret():
+    assert ClaimsCache.key("token", "s1") != ClaimsCache.key("token", "s2")
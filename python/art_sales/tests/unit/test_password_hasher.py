@@ -0,0 +1,98 @@
+# tests/unit/test_password_hasher.py
+import threading
+from unittest.mock import MagicMock
+
+import bcrypt
+import pytest
+
+from app.auth.domain.user_login_request import UserLoginRequest
+from app.shared.exceptions.custom_errors import TooManyRequestsError
+from app.shared.utilities.password_hasher import PasswordHasher
+
+
+@pytest.mark.parametrize("executor", ["inline", "thread", "process"])
+def test_hash_and_verify_round_trip(executor):
+    hasher = PasswordHasher(rounds=4, max_workers=2, executor=executor)
+    try:
+        hashed = hasher.hash_password("StrongPass123")
+        assert hashed.startswith("$2b$04$")
+        assert hasher.verify_password("StrongPass123", hashed) is True
+        assert hasher.verify_password("wrong", hashed) is False
+    finally:
+        hasher.shutdown()
+
+
+def test_rejects_when_all_slots_are_busy():
+    hasher = PasswordHasher(rounds=4, max_workers=1, max_concurrent=1,
+                            executor="inline", acquire_timeout=0.01)
+    hasher._slots.acquire()  # another request is hashing
+    try:
+        with pytest.raises(TooManyRequestsError):
+            hasher.hash_password("StrongPass123")
+    finally:
+        hasher._slots.release()
+    assert hasher.verify_password("StrongPass123", hasher.hash_password("StrongPass123"))
+
+
+def test_concurrency_never_exceeds_limit(monkeypatch):
+    hasher = PasswordHasher(rounds=4, max_workers=8, max_concurrent=2,
+                            executor="thread", acquire_timeout=5)
+    running, peak, lock = [0], [0], threading.Lock()
+    real_pool = hasher._pool
+
+    def tracking_pool():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            return real_pool()
+        finally:
+            with lock:
+                running[0] -= 1
+
+    monkeypatch.setattr(hasher, "_pool", tracking_pool)
+    threads = [threading.Thread(target=hasher.hash_password, args=("pw",)) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    hasher.shutdown()
+    assert peak[0] <= 2
+
+
+def test_needs_rehash_compares_cost():
+    hasher = PasswordHasher(rounds=5, executor="inline")
+    assert hasher.needs_rehash(bcrypt.hashpw(b"pw", bcrypt.gensalt(rounds=4)).decode()) is True
+    assert hasher.needs_rehash(hasher.hash_password("pw")) is False
+    assert hasher.needs_rehash("not-a-bcrypt-hash") is False
+
+
+def test_login_upgrades_hash_with_old_cost(auth_service, mock_dependencies):
+    old_hash = bcrypt.hashpw(b"StrongPass123", bcrypt.gensalt(rounds=4)).decode()
+    auth_service.password_hasher = PasswordHasher(rounds=5, executor="inline")
+    mock_dependencies["repo"].find_by_email.return_value = {
+        "_id": "64b000000000000000000001", "email": "alice@example.com",
+        "password": old_hash, "role": "buyer"}
+    auth_service._generate_token = MagicMock(return_value="jwt-token")
+
+    response = auth_service.login_user(UserLoginRequest("alice@example.com", "StrongPass123"))
+
+    assert response.success is True
+    user_id, update = mock_dependencies["repo"].update_user.call_args.args
+    assert user_id == "64b000000000000000000001"
+    assert update["password"].startswith("$2b$05$")
+    assert bcrypt.checkpw(b"StrongPass123", update["password"].encode())
+
+
+def test_login_succeeds_when_rehash_fails(auth_service, mock_dependencies):
+    old_hash = bcrypt.hashpw(b"StrongPass123", bcrypt.gensalt(rounds=4)).decode()
+    auth_service.password_hasher = PasswordHasher(rounds=5, executor="inline")
+    mock_dependencies["repo"].find_by_email.return_value = {
+        "_id": "64b000000000000000000001", "email": "alice@example.com",
+        "password": old_hash, "role": "buyer"}
+    mock_dependencies["repo"].update_user.side_effect = RuntimeError("db down")
+    auth_service._generate_token = MagicMock(return_value="jwt-token")
+
+    response = auth_service.login_user(UserLoginRequest("alice@example.com", "StrongPass123"))
+
+    assert response.success is True
@@ -0,0 +1,83 @@
+# tests/unit/test_paystack_service.py
+import pytest
+import requests
+
+from app.shared.exceptions.custom_errors import ValidationError
+from app.wallet.services.paystack_service import PaystackService, build_session
+from tests.utils.local_paystack import LocalPaystack
+
+# Captured before the autouse mock_paystack fixture swaps them out
+_SESSION_GET = requests.Session.get
+_SESSION_POST = requests.Session.post
+
+
+@pytest.fixture
+def paystack_server(monkeypatch):
+    monkeypatch.setattr(requests.Session, "get", _SESSION_GET)
+    monkeypatch.setattr(requests.Session, "post", _SESSION_POST)
+    server = LocalPaystack().start()
+    yield server
+    server.stop()
+
+
+def make_service(server, **kwargs):
+    session = build_session(pool_maxsize=4, max_retries=kwargs.pop("max_retries", 2), backoff_factor=0)
+    return PaystackService(secret_key=server.secret_key, base_url=server.url, session=session, **kwargs)
+
+
+def test_calls_reuse_one_keep_alive_connection(paystack_server):
+    service = make_service(paystack_server)
+
+    for i in range(5):
+        service.initialize_transaction("buyer@example.com", 5000, reference=f"ref_{i}")
+        assert service.verify_transaction(f"ref_{i}")["data"]["status"] == "success"
+
+    assert len(paystack_server.requests) == 10
+    assert paystack_server.connections == 1
+
+
+def test_verify_retries_transient_server_errors(paystack_server):
+    service = make_service(paystack_server)
+    service.initialize_transaction("buyer@example.com", 5000, reference="ref_retry")
+    paystack_server.fail_next(503, times=2)
+
+    result = service.verify_transaction("ref_retry")
+
+    assert result["data"]["reference"] == "ref_retry"
+    assert paystack_server.requests.count(("GET", "/transaction/verify/ref_retry")) == 3
+
+
+def test_verify_gives_up_after_max_retries(paystack_server):
+    service = make_service(paystack_server, max_retries=1)
+    paystack_server.fail_next(502, times=5)
+
+    with pytest.raises(ValidationError, match="502"):
+        service.verify_transaction("ref_down")
+
+    assert len(paystack_server.requests) == 2
+
+
+def test_posts_are_not_retried_on_server_errors(paystack_server):
+    service = make_service(paystack_server)
+    paystack_server.fail_next(503)
+
+    with pytest.raises(ValidationError, match="503"):
+        service.initialize_transaction("buyer@example.com", 5000, reference="ref_once")
+
+    # A second attempt could double-charge or collide on the reference
+    assert paystack_server.requests == [("POST", "/transaction/initialize")]
+
+
+def test_slow_response_times_out(paystack_server):
+    paystack_server.latency = 0.5
+    service = make_service(paystack_server, max_retries=0, timeout=(1, 0.1))
+
+    with pytest.raises(ValidationError, match="verify"):
+        service.verify_transaction("ref_slow")
+
+
+def test_api_errors_surface_as_validation_errors(paystack_server):
+    service = make_service(paystack_server)
+
+    with pytest.raises(ValidationError, match="400"):
+        service.verify_transaction("unknown_ref")
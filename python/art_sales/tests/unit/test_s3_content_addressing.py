@@ -0,0 +1,133 @@
+import hashlib
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.shared.exceptions.custom_errors import ValidationError
+from app.user.dtos.requests.artwork_request import ArtworkRequest
+from app.user.services.artist_service import ArtistService
+from app.user.services.s3_service import S3Service
+from tests.utils.local_s3 import LocalS3
+
+
+@pytest.fixture()
+def local_s3():
+    s3 = S3Service()
+    s3.s3_client = LocalS3()
+    return s3
+
+
+def _upload(s3, key, body):
+    s3.s3_client.objects[(s3.bucket, key)] = {"Body": body}
+
+
+def test_finalize_moves_upload_to_hash_key(local_s3):
+    _upload(local_s3, "artworks/20250101_a.JPG", b"pixels")
+
+    result = local_s3.finalize_upload("artworks/20250101_a.JPG")
+
+    digest = hashlib.sha256(b"pixels").hexdigest()
+    assert result == {"key": f"artworks/sha256/{digest}.jpg", "sha256": digest, "deduplicated": False}
+    assert local_s3.object_exists(result["key"])
+    assert not local_s3.object_exists("artworks/20250101_a.JPG")
+
+
+def test_identical_upload_reuses_existing_object(local_s3):
+    _upload(local_s3, "artworks/first.jpg", b"same bytes")
+    first = local_s3.finalize_upload("artworks/first.jpg")
+    _upload(local_s3, "artworks/second.jpg", b"same bytes")
+
+    second = local_s3.finalize_upload("artworks/second.jpg")
+
+    assert second["key"] == first["key"]
+    assert second["deduplicated"] is True
+    assert list(local_s3.s3_client.objects) == [(local_s3.bucket, first["key"])]
+
+
+def test_finalize_is_idempotent_for_hash_keys(local_s3):
+    _upload(local_s3, "artworks/a.png", b"x")
+    key = local_s3.finalize_upload("artworks/a.png")["key"]
+    assert local_s3.finalize_upload(key)["key"] == key
+
+
+def test_create_artwork_reuses_derivatives_of_identical_image(app, local_s3, monkeypatch):
+    monkeypatch.setitem(app.config, "CONTENT_ADDRESSED_UPLOADS", True)
+    monkeypatch.setitem(app.config, "IMAGE_DERIVATIVES_ENABLED", True)
+    schedule = MagicMock()
+    monkeypatch.setattr("app.user.services.artist_service.image_derivatives.schedule", schedule)
+    _upload(local_s3, "artworks/relist.jpg", b"original")
+    repo = MagicMock(name="ArtworkRepositoryMock")
+    repo.create.return_value = "507f1f77bcf86cd799439011"
+    repo.find_derivatives_by_s3_key.return_value = {"thumbnail": "derived/thumbnail/x.webp"}
+    repo.is_s3_key_referenced.return_value = False
+    uploads = MagicMock(name="UploadRepositoryMock")
+    uploads.find.return_value = {"key": "artworks/relist.jpg", "artist_id": "artist-1"}
+    service = ArtistService(artwork_repo=repo, s3_service=local_s3, upload_repo=uploads)
+
+    with app.app_context():
+        service.create_artwork("artist-1", ArtworkRequest(title="Relist", description="d",
+                                                         price=10, s3_key="artworks/relist.jpg"))
+
+    stored = repo.create.call_args[0][0]
+    assert stored["s3_key"].startswith("artworks/sha256/")
+    assert stored["derivatives"] == {"thumbnail": "derived/thumbnail/x.webp"}
+    schedule.assert_not_called()
+
+
+def test_changing_the_image_replaces_stale_derivatives(app, monkeypatch):
+    monkeypatch.setitem(app.config, "IMAGE_DERIVATIVES_ENABLED", True)
+    schedule = MagicMock()
+    monkeypatch.setattr("app.user.services.artist_service.image_derivatives.schedule", schedule)
+    repo = MagicMock(name="ArtworkRepositoryMock")
+    repo.find_derivatives_by_s3_key.return_value = None
+    service = ArtistService(artwork_repo=repo)
+
+    with app.app_context():
+        service.update_artwork("artist-1", "507f1f77bcf86cd799439011", {"s3_key": "artworks/new.png"})
+
+    repo.update.assert_called_once_with("artist-1", "507f1f77bcf86cd799439011",
+                                        {"s3_key": "artworks/new.png", "derivatives": {}})
+    assert schedule.call_args[0][1:] == ("507f1f77bcf86cd799439011", "artworks/new.png")
+
+
+def _service(uploads, referenced=False, s3=None):
+    repo = MagicMock(name="ArtworkRepositoryMock")
+    repo.is_s3_key_referenced.return_value = referenced
+    return ArtistService(artwork_repo=repo, s3_service=s3, upload_repo=uploads)
+
+
+def test_finalize_rejects_key_issued_to_another_artist(local_s3):
+    _upload(local_s3, "artworks/a.jpg", b"artist a")
+    uploads = MagicMock(name="UploadRepositoryMock")
+    uploads.find.return_value = None
+
+    with pytest.raises(ValidationError):
+        _service(uploads, s3=local_s3).finalize_upload("artist-b", "artworks/a.jpg")
+
+    uploads.find.assert_called_once_with("artist-b", "artworks/a.jpg")
+    assert local_s3.object_exists("artworks/a.jpg")
+
+
+def test_finalize_rejects_key_already_used_by_an_artwork(local_s3):
+    _upload(local_s3, "artworks/live.jpg", b"live")
+    uploads = MagicMock(name="UploadRepositoryMock")
+    uploads.find.return_value = {"key": "artworks/live.jpg", "artist_id": "artist-a"}
+
+    with pytest.raises(ValidationError):
+        _service(uploads, referenced=True, s3=local_s3).finalize_upload("artist-a", "artworks/live.jpg")
+
+    assert local_s3.object_exists("artworks/live.jpg")
+
+
+def test_finalize_repeat_returns_recorded_result(local_s3):
+    _upload(local_s3, "artworks/once.jpg", b"once")
+    uploads = MagicMock(name="UploadRepositoryMock")
+    uploads.find.return_value = {"key": "artworks/once.jpg", "artist_id": "artist-a"}
+    service = _service(uploads, s3=local_s3)
+
+    first = service.finalize_upload("artist-a", "artworks/once.jpg")
+    uploads.mark_finalized.assert_called_once_with("artist-a", "artworks/once.jpg", first)
+    assert not local_s3.object_exists("artworks/once.jpg")
+
+    uploads.find.return_value = {"key": "artworks/once.jpg", "artist_id": "artist-a", "result": first}
+    assert service.finalize_upload("artist-a", "artworks/once.jpg") == first
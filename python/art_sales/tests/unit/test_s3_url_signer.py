@@ -0,0 +1,73 @@
+from datetime import datetime
+from unittest.mock import patch
+from urllib.parse import urlsplit, parse_qs
+
+import boto3
+import pytest
+
+from app.user.services.image_cache_service import image_cache
+from app.user.services.s3_service import S3Service
+from app.user.services.s3_url_signer import presign_get_url
+
+
+@pytest.fixture(autouse=True)
+def empty_image_cache():
+    image_cache.clear()
+    yield
+    image_cache.clear()
+
+
+@pytest.fixture()
+def windowed_s3(monkeypatch):
+    monkeypatch.setenv("AWS_S3_PRESIGN_WINDOW", "3600")
+    monkeypatch.setenv("AWS_S3_BUCKET", "my-bucket")
+    monkeypatch.setenv("AWS_S3_REGION", "eu-west-2")
+    return S3Service
+
+
+def test_signature_matches_botocore():
+    """Our signer must produce the same SigV4 signature botocore would for the same instant."""
+    signed_at = datetime(2026, 10, 19, 13, 0, 0)
+    key = "artworks/20250101_a b+c~ü.jpg"
+    # A plain Session client bypasses the global boto3.client mock in conftest
+    client = boto3.session.Session().client(
+        "s3", region_name="eu-west-2",
+        aws_access_key_id="AKIDEXAMPLE", aws_secret_access_key="secret",
+    )
+    with patch("botocore.auth.get_current_datetime", return_value=signed_at):
+        expected = client.generate_presigned_url(
+            "get_object", Params={"Bucket": "my-bucket", "Key": key}, ExpiresIn=7200
+        )
+
+    ours = presign_get_url("my-bucket", key, "eu-west-2", "AKIDEXAMPLE", "secret",
+                           signed_at, 7200, host=urlsplit(expected).netloc)
+
+    assert urlsplit(ours).path == urlsplit(expected).path
+    assert parse_qs(urlsplit(ours).query) == parse_qs(urlsplit(expected).query)
+
+
+def test_same_window_gives_identical_urls(windowed_s3):
+    with patch("app.user.services.s3_service.time.time", return_value=1_800_000_100.0):
+        first = windowed_s3().generate_get_url("artworks/a.jpg")
+    image_cache.clear()  # simulate a different worker
+    with patch("app.user.services.s3_service.time.time", return_value=1_800_003_500.0):
+        second = windowed_s3().generate_get_url("artworks/a.jpg")
+    assert first == second
+
+
+def test_next_window_gives_new_url(windowed_s3):
+    with patch("app.user.services.s3_service.time.time", return_value=1_800_000_100.0):
+        first = windowed_s3().generate_get_url("artworks/a.jpg")
+    image_cache.clear()
+    with patch("app.user.services.s3_service.time.time", return_value=1_800_003_700.0):
+        second = windowed_s3().generate_get_url("artworks/a.jpg")
+    assert first != second
+
+
+def test_expiry_counts_from_window_start(windowed_s3):
+    with patch("app.user.services.s3_service.time.time", return_value=1_800_000_100.0):
+        url = windowed_s3().generate_get_url("artworks/a.jpg", expires_in=3600)
+    query = parse_qs(urlsplit(url).query)
+    # 1_800_000_100 falls in the window starting at 1_800_000_000 (08:00:00 UTC)
+    assert query["X-Amz-Date"] == ["20270115T080000Z"]
+    assert query["X-Amz-Expires"] == ["7200"]
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.shared.exceptions.custom_errors import ValidationError
+from app.shared.utilities.serializer import Field, Serializer
+from app.user.dtos.responses.shapes import ARTWORK_CARD, ARTWORK_DETAIL, ORDER_ROW
+
+ARTWORK = {
+    "_id": ObjectId("507f1f77bcf86cd799439011"),
+    "artist_id": "artist@example.com",
+    "title": "Dawn",
+    "description": "Oil on panel",
+    "price": 120.0,
+    "medium": None,
+    "is_original": True,
+    "variants": {"print": {"price": 20}},
+    "s3_key": "artworks/dawn.jpg",
+    "derivatives": {"thumbnail": "derived/thumbnail/artworks/dawn.webp"},
+    "created_at": datetime(2026, 1, 1),
+    "updated_at": datetime(2026, 1, 2),
+    "version": 2,
+}
+
+
+def test_projection_comes_from_fields():
+    shape = Serializer("t", [
+        Field("id", source="_id", transform=str),
+        Field("title"),
+        Field("url", compute=lambda doc, ctx: None, requires=("s3_key",)),
+    ])
+    assert shape.projection == {"_id": 1, "title": 1, "s3_key": 1}
+    assert Serializer("t", [Field("title")]).projection == {"title": 1, "_id": 0}
+
+
+def test_missing_fields_are_omitted_but_nulls_kept():
+    out = ARTWORK_CARD.dump({"_id": ARTWORK["_id"], "title": "Dawn", "medium": None})
+    assert out == {"artwork_id": "507f1f77bcf86cd799439011", "title": "Dawn", "medium": None}
+
+
+def test_card_uses_thumbnail_and_drops_internal_fields():
+    out = ARTWORK_CARD.dump(ARTWORK, lambda key: f"https://signed/{key}")
+    assert out["image_url"] == "https://signed/derived/thumbnail/artworks/dawn.webp"
+    assert "_id" not in out and "derivatives" not in out and "description" not in out
+
+
+def test_detail_signs_original_and_thumbnail():
+    out = ARTWORK_DETAIL.dump(ARTWORK, lambda key: f"https://signed/{key}")
+    assert out["image_url"] == "https://signed/artworks/dawn.jpg"
+    assert out["thumbnail_url"] == "https://signed/derived/thumbnail/artworks/dawn.webp"
+    assert out["version"] == 2
+
+
+def test_list_shapes_keep_the_public_list_fields():
+    # Cards deliberately drop the detail-only fields; order rows keep everything but cart_id
+    assert ARTWORK_CARD.field_names == ("artwork_id", "artist_id", "title", "price", "medium", "is_original",
+                                        "s3_key", "image_url", "updated_at")
+    assert ORDER_ROW.field_names == ("order_id", "buyer_id", "artist_id", "artwork_id", "title", "quantity",
+                                     "price", "status", "reference", "shipping", "created_at")
+
+
+def test_order_row_hides_cart_id():
+    order = {"_id": ObjectId(), "buyer_id": "b", "status": "processing", "cart_id": "c1"}
+    assert ORDER_ROW.dump_many([order])[0] == {"order_id": str(order["_id"]), "buyer_id": "b",
+                                               "status": "processing"}
+    assert "cart_id" not in ORDER_ROW.projection
+
+
+def test_select_builds_cached_subset_with_narrow_projection():
+    subset = ARTWORK_CARD.select("price, artwork_id,title")
+    assert subset is ARTWORK_CARD.select("artwork_id,title,price")
+    assert subset.projection == {"_id": 1, "title": 1, "price": 1}
+    assert subset.dump(ARTWORK) == {"artwork_id": "507f1f77bcf86cd799439011", "title": "Dawn", "price": 120.0}
+    assert ARTWORK_CARD.select(None) is ARTWORK_CARD
+
+
+def test_select_rejects_fields_outside_the_shape():
+    with pytest.raises(ValidationError):
+        ARTWORK_CARD.select("title,description")
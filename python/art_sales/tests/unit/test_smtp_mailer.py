@@ -0,0 +1,85 @@
+# tests/unit/test_smtp_mailer.py
+import socket
+import threading
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+
+from app.shared.utilities.email_service import SMTPMailer
+from tests.utils.local_smtp import LocalSMTP
+
+
+@pytest.fixture
+def smtp_server():
+    server = LocalSMTP().start()
+    yield server
+    server.stop()
+
+
+def make_mailer(server, **kwargs):
+    kwargs.setdefault("pool_size", 2)
+    return SMTPMailer(smtp_host="127.0.0.1", smtp_port=server.port, from_addr="noreply@artsales.com",
+                      starttls=False, smtp_factory=server.factory, **kwargs)
+
+
+def test_sequential_sends_reuse_one_session(smtp_server):
+    mailer = make_mailer(smtp_server)
+    for i in range(5):
+        mailer.send_email(f"user{i}@example.com", "Hello", "Body")
+    mailer.close()
+
+    assert len(smtp_server.handler.messages) == 5
+    assert smtp_server.connections == 1
+
+
+def test_send_batch_uses_one_session_and_reports_refused(smtp_server):
+    smtp_server.handler.refuse.add("bad@example.com")
+    mailer = make_mailer(smtp_server)
+
+    refused = mailer.send_batch([
+        ("a@example.com", "Sale", "You sold a piece"),
+        ("bad@example.com", "Sale", "You sold a piece"),
+        ("b@example.com", "Sale", "You sold a piece"),
+    ])
+    mailer.close()
+
+    assert refused == ["bad@example.com"]
+    assert [m["to"] for m in smtp_server.handler.messages] == [["a@example.com"], ["b@example.com"]]
+    assert smtp_server.connections == 1
+
+
+def test_reconnects_once_when_session_dropped(smtp_server):
+    mailer = make_mailer(smtp_server)
+    mailer.send_email("a@example.com", "One", "Body")
+    # The connection dies while the session sits idle in the pool
+    mailer._idle[0][0].sock.shutdown(socket.SHUT_RDWR)
+
+    mailer.send_email("b@example.com", "Two", "Body")
+    mailer.close()
+
+    assert len(smtp_server.handler.messages) == 2
+    assert smtp_server.connections == 2
+
+
+def test_idle_sessions_are_closed_lazily(smtp_server):
+    mailer = make_mailer(smtp_server, idle_timeout=0)
+    mailer.send_email("a@example.com", "One", "Body")
+    mailer.send_email("b@example.com", "Two", "Body")
+    mailer.close()
+
+    assert smtp_server.connections == 2
+
+
+def test_concurrent_senders_never_exceed_pool_size(smtp_server):
+    mailer = make_mailer(smtp_server, pool_size=2)
+    threads = [threading.Thread(target=mailer.send_email, args=(f"u{i}@example.com", "Hi", "Body"))
+               for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    mailer.close()
+
+    assert len(smtp_server.handler.messages) == 10
+    assert smtp_server.connections <= 2
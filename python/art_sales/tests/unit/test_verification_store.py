@@ -0,0 +1,80 @@
+# tests/unit/test_verification_store.py
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.auth.domain.user_signup_request import UserSignupRequest
+from app.auth.domain.verification_model import Verification
+from app.auth.persistence.verification_repository import VerificationRepository
+from app.auth.persistence.verification_store import (
+    InMemoryVerificationStore,
+    RedisVerificationStore,
+    create_verification_store,
+)
+from app.auth.services.verification_service import VerificationService
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    if request.param == "memory":
+        return InMemoryVerificationStore(ttl_seconds=300)
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisVerificationStore(fakeredis.FakeRedis(), ttl_seconds=300)
+
+
+def test_save_find_delete(store):
+    store.save(Verification(email="alice@example.com", code="123456"))
+
+    found = store.find_by_email("alice@example.com")
+    assert found["email"] == "alice@example.com"
+    assert found["code"] == "123456"
+
+    store.delete_by_email("alice@example.com")
+    assert store.find_by_email("alice@example.com") is None
+
+
+def test_create_if_absent_returns_existing_code(store):
+    first = store.create_if_absent(Verification(email="bob@example.com", code="111111"))
+    second = store.create_if_absent(Verification(email="bob@example.com", code="222222"))
+
+    assert first["code"] == "111111"
+    assert second["code"] == "111111"
+    assert Verification.from_dict(second).created_at == Verification.from_dict(first).created_at
+
+
+def test_memory_store_expires_entries(monkeypatch):
+    store = InMemoryVerificationStore(ttl_seconds=300)
+    now = [1000.0]
+    monkeypatch.setattr("app.auth.persistence.verification_store.time.time", lambda: now[0])
+    store.save(Verification(email="carol@example.com", code="333333"))
+
+    now[0] += 301
+    assert store.find_by_email("carol@example.com") is None
+    assert store.create_if_absent(Verification(email="carol@example.com", code="444444"))["code"] == "444444"
+
+
+def test_redis_store_uses_native_ttl():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    store = RedisVerificationStore(client, ttl_seconds=120)
+
+    store.create_if_absent(Verification(email="dave@example.com", code="555555"))
+
+    assert 0 < client.ttl("verification:dave@example.com") <= 120
+
+
+def test_factory_selects_store_from_config():
+    assert isinstance(create_verification_store({"VERIFICATION_STORE": "memory"}), InMemoryVerificationStore)
+    assert isinstance(create_verification_store({}), VerificationRepository)
+
+
+def test_service_reuses_code_for_repeat_signup():
+    store = InMemoryVerificationStore()
+    service = VerificationService(store, MagicMock())
+    req = UserSignupRequest(name="Eve", email="eve@example.com", password="StrongPass123", role="buyer")
+
+    first = service.create_verification_for(req)
+    second = service.create_verification_for(req)
+
+    assert first.code == second.code
+    assert service.validate_code("eve@example.com", first.code) is True
@@ -54,6 +54,7 @@ class TestWalletService:
         mock_repository = Mock(spec=WalletRepository)
         wallet = Wallet(user_id="user123", balance=50.0)
         mock_repository.find_by_user_id.return_value = wallet
+        mock_repository.find_deposit_by_reference.return_value = None
         mock_repository.update.return_value = True
         mock_repository.create_transaction.return_value = "txn123"
         
@@ -67,6 +68,22 @@ class TestWalletService:
         assert updated_wallet.balance == 75.0
         mock_repository.update.assert_called_once()
         mock_repository.create_transaction.assert_called_once()
+        mock_repository.set_transaction_status.assert_called_once_with("txn123", TransactionStatus.COMPLETED,
+                                                                       session=None)
+    
+    def test_deposit_with_a_known_reference_is_not_credited_again(self):
+        """Test that a repeated deposit reference leaves the balance alone."""
+        mock_repository = Mock(spec=WalletRepository)
+        wallet = Wallet(user_id="user123", balance=50.0)
+        mock_repository.find_by_user_id.return_value = wallet
+        mock_repository.find_deposit_by_reference.return_value = Mock()
+        
+        service = WalletService(mock_repository)
+        updated_wallet = service.deposit("user123", 25.0, "test_ref")
+        
+        assert updated_wallet.balance == 50.0
+        mock_repository.create_transaction.assert_not_called()
+        mock_repository.update.assert_not_called()
     
     def test_deposit_invalid_amount(self):
         """Test depositing invalid amount."""
@@ -0,0 +1,137 @@
+# tests/utils/local_paystack.py
+"""An HTTP/1.1 stand-in for the Paystack API, backed by MockPaystackService."""
+import hashlib
+import hmac
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.shared.exceptions.custom_errors import ValidationError
+from app.wallet.services.mock_paystack_service import MockPaystackService
+
+_VERIFY = re.compile(r"^/transaction/verify/([^/]+)$")
+
+
+def webhook_headers(body: bytes, secret: str) -> dict:
+    """Headers Paystack sends with a webhook: x-paystack-signature is HMAC-SHA512 of the raw body."""
+    signature = hmac.new(secret.encode("utf-8"), body, hashlib.sha512).hexdigest()
+    return {"Content-Type": "application/json", "x-paystack-signature": signature}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def setup(self):
+        super().setup()
+        with self.server.owner.lock:
+            self.server.owner.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method: str) -> None:
+        owner = self.server.owner
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        with owner.lock:
+            owner.requests.append((method, self.path))
+            status = owner.failures.pop(0) if owner.failures else None
+            owner.in_flight += 1
+            owner.peak_in_flight = max(owner.peak_in_flight, owner.in_flight)
+        try:
+            if owner.latency:
+                time.sleep(owner.latency)
+            self._answer(method, body, status)
+        finally:
+            with owner.lock:
+                owner.in_flight -= 1
+
+    def _answer(self, method: str, body: dict, status) -> None:
+        owner = self.server.owner
+        if status:
+            return self._reply(status, {"status": False, "message": "Injected failure"})
+        if self.headers.get("Authorization") != f"Bearer {owner.secret_key}":
+            return self._reply(401, {"status": False, "message": "Invalid key"})
+        try:
+            result = owner.route(method, self.path, body)
+        except ValidationError as e:
+            return self._reply(400, {"status": False, "message": str(e)})
+        if result is None:
+            return self._reply(404, {"status": False, "message": "Not found"})
+        self._reply(200, result)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+class LocalPaystack:
+    """
+    Serve MockPaystackService over HTTP on localhost. Counts TCP connections and
+    the peak number of requests in flight, and records requests; `latency`
+    delays every answer and `fail_next` queues error statuses to return before
+    handling normally.
+    """
+
+    def __init__(self, secret_key: str = "sk_test_local", service: MockPaystackService = None,
+                 latency: float = 0.0):
+        self.secret_key = secret_key
+        self.service = service or MockPaystackService()
+        self.latency = latency
+        self.connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = []
+        self.failures = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.block_on_close = False
+        self.server.owner = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self) -> "LocalPaystack":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fail_next(self, status: int, times: int = 1) -> None:
+        with self.lock:
+            self.failures.extend([status] * times)
+
+    def route(self, method: str, path: str, body: dict):
+        service = self.service
+        if method == "GET":
+            match = _VERIFY.match(path)
+            return service.verify_transaction(match.group(1)) if match else None
+        if path == "/transaction/initialize":
+            return service.initialize_transaction(body["email"], body["amount"], body.get("reference"),
+                                                  body.get("callback_url"), body.get("metadata"))
+        if path == "/transferrecipient":
+            return service.create_transfer_recipient(body["name"], body["account_number"],
+                                                     body["bank_code"], body.get("currency", "NGN"))
+        if path == "/transfer":
+            return service.initiate_transfer(body["amount"], body["recipient"], body.get("reason"),
+                                             body.get("reference"))
+        return None
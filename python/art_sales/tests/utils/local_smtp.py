@@ -0,0 +1,51 @@
+# tests/utils/local_smtp.py
+"""A throwaway aiosmtpd server that records messages and connections."""
+import smtplib
+import socket
+
+from aiosmtpd.controller import Controller
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.refuse = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.refuse:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append({"peer": session.peer, "to": list(envelope.rcpt_tos),
+                              "data": envelope.content.decode("utf-8", "replace")})
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class LocalSMTP:
+    """Start/stop a recording SMTP server on localhost; counts client connections."""
+
+    def __init__(self):
+        self.handler = RecordingHandler()
+        self.port = free_port()
+        self.controller = Controller(self.handler, hostname="127.0.0.1", port=self.port)
+        self.connections = 0
+
+    def start(self) -> "LocalSMTP":
+        self.controller.start()
+        return self
+
+    def stop(self) -> None:
+        self.controller.stop()
+
+    def factory(self, host, port, timeout=None):
+        """smtp_factory for SMTPMailer that counts how many sessions are opened."""
+        self.connections += 1
+        return smtplib.SMTP(host, port, timeout=timeout)